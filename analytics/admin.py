@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import PrimaryGiftRollup, GiftScoreBucket
+
+@admin.register(PrimaryGiftRollup)
+class PrimaryGiftRollupAdmin(admin.ModelAdmin):
+    list_display = ('day', 'counselor', 'primary_gift', 'profiles')
+    list_filter = ('primary_gift', 'day')
+    date_hierarchy = 'day'
+
+@admin.register(GiftScoreBucket)
+class GiftScoreBucketAdmin(admin.ModelAdmin):
+    list_display = ('day', 'counselor', 'gift', 'bucket', 'profiles')
+    list_filter = ('gift', 'day')
+    date_hierarchy = 'day'
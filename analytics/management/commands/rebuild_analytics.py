@@ -0,0 +1,15 @@
+import time
+from django.core.management.base import BaseCommand
+from analytics import rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the cohort analytics rollups from every gift profile'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {counts['primary_gift_rollups']} primary gift rollups and "
+            f"{counts['gift_score_buckets']} score buckets in {time.monotonic() - started:.2f}s"
+        ))
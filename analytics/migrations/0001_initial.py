@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('counselors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_profile_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GiftScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('gift', models.CharField(max_length=100)),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('profiles', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('counselor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='counselors.counselor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'counselor', 'gift', 'bucket'), name='unique_gift_score_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PrimaryGiftRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('primary_gift', models.CharField(max_length=100)),
+                ('profiles', models.PositiveIntegerField(default=0)),
+                ('counselor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='counselors.counselor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'counselor', 'primary_gift'), name='unique_primary_gift_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+from counselors.models import Counselor
+
+
+class PrimaryGiftRollup(models.Model):
+    """Gift profiles completed per day, counselor and primary gift"""
+    day = models.DateField()
+    # Null for users without a counselor
+    counselor = models.ForeignKey(Counselor, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    primary_gift = models.CharField(max_length=100)
+    profiles = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'counselor', 'primary_gift'], name='unique_primary_gift_rollup'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.primary_gift}: {self.profiles}"
+
+
+class GiftScoreBucket(models.Model):
+    """Profiles per day and counselor whose score for a gift fell in one histogram bucket"""
+    day = models.DateField()
+    counselor = models.ForeignKey(Counselor, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    gift = models.CharField(max_length=100)
+    # Scores are shares of 1, split into analytics.rollups.HISTOGRAM_BUCKETS equal buckets
+    bucket = models.PositiveSmallIntegerField()
+    profiles = models.PositiveIntegerField(default=0)
+    # Sum of the scores counted, for means
+    score_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'counselor', 'gift', 'bucket'], name='unique_gift_score_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.gift}[{self.bucket}]: {self.profiles}"
+
+
+class RollupState(models.Model):
+    """The single row recording how far the rollups have counted gift profiles"""
+    last_profile_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Rollups up to gift profile {self.last_profile_id}"
@@ -0,0 +1,208 @@
+"""
+Rollups of gift profiles for cohort analytics.
+
+Reports never read ``GiftProfile`` rows or unpack their score vectors;
+they aggregate two small tables instead:
+
+- ``PrimaryGiftRollup``: profiles per day x counselor x primary gift;
+- ``GiftScoreBucket``: per day x counselor x gift, how many profiles scored
+  within each of ``HISTOGRAM_BUCKETS`` equal slices of 0-1, and the sum of
+  those scores for means.
+
+``catch_up()`` adds the profiles created since it last ran, by id, and
+moves the ``RollupState`` watermark in the same transaction, so a retried
+or duplicated ``analytics.update_rollups`` task never counts a profile
+twice. Submissions enqueue that task. Profiles that are deleted, or users
+who move between counselors, are only reconciled by ``rebuild()``
+(``manage.py rebuild_analytics``), which recounts every profile.
+
+A profile counts for the counselor who ran its assessment session, else
+for the counselor the user was first registered with, else for none.
+"""
+
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+from scoring.calculator import GIFT_ORDER, unpack_scores
+from assessments.models import GiftProfile
+from counselors.models import CounselorUserRelation
+from .models import GiftScoreBucket, PrimaryGiftRollup, RollupState
+
+HISTOGRAM_BUCKETS = 20
+# Profiles counted per transaction
+BATCH_SIZE = 2000
+
+INTERVALS = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+GROUPS = {'counselor': 'counselor_id', 'institution': 'counselor__institution'}
+
+
+def bucket(score):
+    return min(max(int(score * HISTOGRAM_BUCKETS), 0), HISTOGRAM_BUCKETS - 1)
+
+
+def _first_counselors(user_ids=None):
+    relations = CounselorUserRelation.objects.order_by('-created_at', '-id')
+    if user_ids is not None:
+        relations = relations.filter(user_id__in=user_ids)
+    # Later rows are overwritten by earlier ones
+    return dict(relations.values_list('user_id', 'counselor_id'))
+
+
+def _merge(model, key_fields, totals):
+    """Add {key: {field: amount}} to the rows with those keys, creating missing ones"""
+    if not totals:
+        return
+    existing = {
+        tuple(getattr(row, field) for field in key_fields): row
+        for row in model.objects.filter(day__in={key[0] for key in totals})
+    }
+    changed, created = [], []
+    for key, amounts in totals.items():
+        row = existing.get(key)
+        if row is None:
+            created.append(model(**dict(zip(key_fields, key)), **amounts))
+        else:
+            for field, amount in amounts.items():
+                setattr(row, field, getattr(row, field) + amount)
+            changed.append(row)
+    fields = list(next(iter(totals.values())))
+    model.objects.bulk_update(changed, fields, batch_size=1000)
+    model.objects.bulk_create(created, batch_size=1000)
+
+
+def _count(profiles):
+    """Add (timestamp, user id, session counselor id, primary gift, packed scores) rows"""
+    counselors = _first_counselors({user_id for _, user_id, session, _, _ in profiles if session is None})
+    primary = defaultdict(lambda: {'profiles': 0})
+    buckets = defaultdict(lambda: {'profiles': 0, 'score_sum': 0.0})
+    for timestamp, user_id, counselor_id, primary_gift, score_vector in profiles:
+        counselor_id = counselor_id or counselors.get(user_id)
+        day = timezone.localdate(timestamp)
+        primary[day, counselor_id, primary_gift]['profiles'] += 1
+        for gift, score in unpack_scores(score_vector).items():
+            totals = buckets[day, counselor_id, gift, bucket(score)]
+            totals['profiles'] += 1
+            totals['score_sum'] += score
+    _merge(PrimaryGiftRollup, ('day', 'counselor_id', 'primary_gift'), primary)
+    _merge(GiftScoreBucket, ('day', 'counselor_id', 'gift', 'bucket'), buckets)
+
+
+def _locked_state():
+    # Writing first takes SQLite's write lock before the watermark is read;
+    # elsewhere select_for_update keeps concurrent catch-ups apart
+    if not RollupState.objects.filter(pk=1).update(updated_at=timezone.now()):
+        RollupState.objects.get_or_create(pk=1)
+    return RollupState.objects.select_for_update().get(pk=1)
+
+
+def catch_up(batch_size=BATCH_SIZE):
+    """Count the gift profiles created since the last call; returns how many"""
+    counted = 0
+    while True:
+        with transaction.atomic():
+            state = _locked_state()
+            rows = list(GiftProfile.objects.filter(id__gt=state.last_profile_id).order_by('id').values_list(
+                'id', 'timestamp', 'user_id', 'assessment__counselor_id', 'primary_gift', 'score_vector'
+            )[:batch_size])
+            if not rows:
+                return counted
+            _count([row[1:] for row in rows])
+            state.last_profile_id = rows[-1][0]
+            state.save(update_fields=['last_profile_id', 'updated_at'])
+        counted += len(rows)
+
+
+def rebuild():
+    """Recount every gift profile into empty rollup tables; returns the row counts"""
+    with transaction.atomic():
+        state = _locked_state()
+        PrimaryGiftRollup.objects.all().delete()
+        GiftScoreBucket.objects.all().delete()
+        state.last_profile_id = 0
+        state.save(update_fields=['last_profile_id', 'updated_at'])
+        catch_up()
+        return {
+            'primary_gift_rollups': PrimaryGiftRollup.objects.count(),
+            'gift_score_buckets': GiftScoreBucket.objects.count(),
+        }
+
+
+def _filtered(queryset, start=None, end=None, counselor_ids=None, institution=None):
+    if start:
+        queryset = queryset.filter(day__gte=start)
+    if end:
+        queryset = queryset.filter(day__lte=end)
+    if counselor_ids is not None:
+        queryset = queryset.filter(counselor_id__in=counselor_ids)
+    if institution:
+        queryset = queryset.filter(counselor__institution=institution)
+    return queryset
+
+
+def _summary():
+    return {'profiles': 0, 'primary_gifts': dict.fromkeys(GIFT_ORDER, 0), 'mean_scores': {}}
+
+
+def distribution(group_by=None, **filters):
+    """
+    Primary gift counts and mean scores per gift.
+
+    One summary for the whole selection, or a list of them per counselor
+    or institution with `group_by`.
+    """
+    group = GROUPS[group_by] if group_by else None
+    keys = [group] if group else []
+    summaries = defaultdict(_summary)
+
+    for row in _filtered(PrimaryGiftRollup.objects, **filters).values(*keys, 'primary_gift').annotate(
+        total=Sum('profiles')
+    ):
+        summary = summaries[row[group] if group else None]
+        summary['profiles'] += row['total']
+        summary['primary_gifts'][row['primary_gift']] = (
+            summary['primary_gifts'].get(row['primary_gift'], 0) + row['total']
+        )
+    for row in _filtered(GiftScoreBucket.objects, **filters).values(*keys, 'gift').annotate(
+        total=Sum('profiles'), score_total=Sum('score_sum')
+    ):
+        summary = summaries[row[group] if group else None]
+        summary['mean_scores'][row['gift']] = round(row['score_total'] / row['total'], 4)
+
+    if not group:
+        return summaries[None]
+    return [dict(summary, **{group_by: key}) for key, summary in sorted(
+        summaries.items(), key=lambda item: (item[0] is None, str(item[0]))
+    )]
+
+
+def trend(interval='week', **filters):
+    """Primary gift counts per day, week or month, oldest first"""
+    truncate = INTERVALS[interval]
+    rows = _filtered(PrimaryGiftRollup.objects, **filters)
+    if truncate:
+        rows = rows.annotate(period=truncate('day'))
+    else:
+        rows = rows.annotate(period=F('day'))
+    periods = defaultdict(lambda: {'profiles': 0, 'primary_gifts': dict.fromkeys(GIFT_ORDER, 0)})
+    for row in rows.values('period', 'primary_gift').annotate(total=Sum('profiles')).order_by('period'):
+        period = periods[row['period']]
+        period['profiles'] += row['total']
+        period['primary_gifts'][row['primary_gift']] = period['primary_gifts'].get(row['primary_gift'], 0) + row['total']
+    return [dict(counts, period=period) for period, counts in sorted(periods.items())]
+
+
+def histogram(gifts=None, **filters):
+    """Per gift, how many profiles scored in each bucket of 0-1"""
+    rows = _filtered(GiftScoreBucket.objects, **filters)
+    if gifts:
+        rows = rows.filter(gift__in=gifts)
+    result = {}
+    for row in rows.values('gift', 'bucket').annotate(total=Sum('profiles')).order_by('gift', 'bucket'):
+        counts = result.setdefault(row['gift'], [0] * HISTOGRAM_BUCKETS)
+        counts[row['bucket']] += row['total']
+    return {
+        'bucket_width': 1 / HISTOGRAM_BUCKETS,
+        'gifts': result,
+    }
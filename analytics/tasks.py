@@ -0,0 +1,14 @@
+from core.tasks import task
+from . import rollups
+
+
+@task('analytics.update_rollups')
+def update_rollups():
+    """Count gift profiles created since the last update in the rollups"""
+    rollups.catch_up()
+
+
+@task('analytics.rebuild_rollups')
+def rebuild_rollups():
+    """Recount every gift profile, e.g. after profiles were re-scored"""
+    rollups.rebuild()
@@ -0,0 +1,114 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from analytics import rollups
+from analytics.models import GiftScoreBucket, PrimaryGiftRollup
+from scoring.calculator import GIFT_ORDER
+from assessments.models import Assessment
+from assessments.services import save_submission
+from core.models import Task
+from counselors.models import Counselor, CounselorUserRelation
+
+User = get_user_model()
+
+
+def results(primary, share=0.4):
+    rest = round((1 - share) / (len(GIFT_ORDER) - 1), 4)
+    return {
+        'scores': {gift: share if gift == primary else rest for gift in GIFT_ORDER},
+        'primary_gift': primary,
+        'secondary_gifts': [],
+    }
+
+
+class CohortRollupTests(TestCase):
+    def setUp(self):
+        self.counselors = []
+        for name, institution in (('alice', 'North High'), ('bob', 'South High')):
+            user = User.objects.create_user(username=name, email=f'{name}@example.com', password='pw')
+            self.counselors.append(Counselor.objects.create(
+                user=user, professional_title='Counselor', institution=institution,
+                qualification='MA', phone_number='555'
+            ))
+        self.students = []
+        for i, (counselor, gift) in enumerate((
+            (0, 'TEACHING'), (0, 'TEACHING'), (0, 'GIVING'), (1, 'SERVICE'), (None, 'TEACHING'),
+        )):
+            student = User.objects.create_user(username=f'student{i}', email=f's{i}@example.com', password='pw')
+            if counselor is not None:
+                CounselorUserRelation.objects.create(counselor=self.counselors[counselor], user=student)
+            save_submission(student, results(gift))
+            self.students.append(student)
+        rollups.catch_up()
+
+    def table(self, model, *fields):
+        return sorted(model.objects.values_list(*fields), key=str)
+
+    def test_profiles_are_rolled_up_as_they_are_created(self):
+        today = timezone.localdate()
+        alice, bob = self.counselors
+        self.assertEqual(self.table(PrimaryGiftRollup, 'day', 'counselor_id', 'primary_gift', 'profiles'), sorted([
+            (today, alice.id, 'TEACHING', 2), (today, alice.id, 'GIVING', 1),
+            (today, bob.id, 'SERVICE', 1), (today, None, 'TEACHING', 1),
+        ], key=str))
+        teaching = GiftScoreBucket.objects.get(counselor=alice, gift='TEACHING', bucket=rollups.bucket(0.4))
+        self.assertEqual(teaching.profiles, 2)
+        self.assertAlmostEqual(teaching.score_sum, 0.8, places=5)
+
+    def test_session_counselor_takes_precedence(self):
+        _, bob = self.counselors
+        session = Assessment.objects.create(user=self.students[0])
+        save_submission(self.students[0], results('COMPASSION'), assessment=session, counselor=bob)
+        rollups.catch_up()
+        self.assertTrue(PrimaryGiftRollup.objects.filter(counselor=bob, primary_gift='COMPASSION').exists())
+
+    def test_each_profile_is_counted_once(self):
+        self.assertEqual(rollups.catch_up(), 0)
+        save_submission(self.students[4], results('GIVING'))
+        self.assertTrue(Task.objects.filter(name='analytics.update_rollups').exists())
+        self.assertEqual(rollups.catch_up(), 1)
+        self.assertEqual(rollups.catch_up(), 0)
+        self.assertEqual(rollups.distribution()['profiles'], 6)
+
+    def test_rebuild_matches_the_incremental_rollups(self):
+        fields = {
+            PrimaryGiftRollup: ('day', 'counselor_id', 'primary_gift', 'profiles'),
+            GiftScoreBucket: ('day', 'counselor_id', 'gift', 'bucket', 'profiles'),
+        }
+        before = {model: self.table(model, *names) for model, names in fields.items()}
+        out = StringIO()
+        call_command('rebuild_analytics', stdout=out)
+        self.assertIn('Rebuilt 4 primary gift rollups', out.getvalue())
+        for model, names in fields.items():
+            self.assertEqual(self.table(model, *names), before[model])
+
+    def test_distribution_by_institution(self):
+        groups = rollups.distribution('institution')
+        self.assertEqual([group['institution'] for group in groups], ['North High', 'South High', None])
+        north = groups[0]
+        self.assertEqual(north['profiles'], 3)
+        self.assertEqual(north['primary_gifts']['TEACHING'], 2)
+        self.assertAlmostEqual(north['mean_scores']['TEACHING'], (0.4 + 0.4 + 0.1) / 3, places=3)
+
+    def test_counselors_only_see_their_students(self):
+        client = APIClient()
+        client.force_authenticate(self.counselors[1].user)
+        response = client.get('/api/analytics/cohorts/distribution/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['profiles'], 1)
+        self.assertEqual(response.json()['primary_gifts']['SERVICE'], 1)
+
+        trend = client.get('/api/analytics/cohorts/trend/', {'interval': 'day'}).json()
+        self.assertEqual([period['profiles'] for period in trend], [1])
+
+        histogram = client.get('/api/analytics/cohorts/histogram/', {'gift': 'service'}).json()
+        self.assertEqual(list(histogram['gifts']), ['SERVICE'])
+        self.assertEqual(sum(histogram['gifts']['SERVICE']), 1)
+
+    def test_students_cannot_view_analytics(self):
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        self.assertEqual(client.get('/api/analytics/cohorts/distribution/').status_code, 403)
@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import CohortAnalyticsViewSet
+
+router = DefaultRouter()
+router.register(r'cohorts', CohortAnalyticsViewSet, basename='cohort-analytics')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,94 @@
+from datetime import date
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.replica import replica_reads
+from . import rollups
+
+
+class CohortAnalyticsViewSet(viewsets.ViewSet):
+    """
+    Gift distributions and trends answered from the rollup tables.
+
+    Staff see every cohort and may filter by `counselor` and `institution`;
+    counselors see their own students. All actions accept `start` and `end`
+    dates (YYYY-MM-DD).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _filters(self, request):
+        """Query filters for the user, or an error response"""
+        params = request.query_params
+        filters = {}
+        try:
+            for name in ('start', 'end'):
+                if params.get(name):
+                    filters[name] = date.fromisoformat(params[name])
+        except ValueError:
+            return None, Response(
+                {'error': 'start and end must be dates (YYYY-MM-DD)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.user.is_staff:
+            if params.get('counselor'):
+                if not params['counselor'].isdigit():
+                    return None, Response(
+                        {'error': 'counselor must be a counselor id'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                filters['counselor_ids'] = [int(params['counselor'])]
+            if params.get('institution'):
+                filters['institution'] = params['institution']
+        elif hasattr(request.user, 'counselor_profile'):
+            filters['counselor_ids'] = [request.user.counselor_profile.id]
+        else:
+            return None, Response(
+                {'error': 'Only counselors and staff can view cohort analytics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return filters, None
+
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def distribution(self, request):
+        """Primary gift counts and mean scores; `group_by` counselor or institution"""
+        filters, error = self._filters(request)
+        if error:
+            return error
+        group_by = request.query_params.get('group_by')
+        if group_by and group_by not in rollups.GROUPS:
+            return Response(
+                {'error': 'group_by must be counselor or institution'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(rollups.distribution(group_by, **filters))
+
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def trend(self, request):
+        """Primary gift counts per `interval` (day, week or month)"""
+        filters, error = self._filters(request)
+        if error:
+            return error
+        interval = request.query_params.get('interval', 'week')
+        if interval not in rollups.INTERVALS:
+            return Response(
+                {'error': 'interval must be day, week or month'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(rollups.trend(interval, **filters))
+
+    @action(detail=False, methods=['get'])
+    @replica_reads
+    def histogram(self, request):
+        """Score histograms per gift; `gift` narrows them, repeatable or comma-separated"""
+        filters, error = self._filters(request)
+        if error:
+            return error
+        gifts = {
+            value.strip().upper()
+            for param in request.query_params.getlist('gift')
+            for value in param.split(',') if value.strip()
+        }
+        return Response(rollups.histogram(gifts, **filters))
@@ -0,0 +1,145 @@
+"""
+Adaptive assessments: ask the most informative question next and stop once
+the gift assignment is settled.
+
+The assignment depends only on how the gifts rank by their share of the
+maximum possible score, and on whether the third gift reaches the
+threshold factor times the first (see ``calibration``). For the questions
+still unanswered, each answer is modelled as independent with the mean
+and variance of the user's answers so far, shrunk towards a uniform 1-5
+answer. That gives every gift an expected final share and its variance.
+
+Four comparisons decide the assignment: first vs second (the primary),
+second vs third and third vs fourth (the secondary gifts), and third vs
+the threshold. The forecast is stable once every one of them is at least
+``Z_SCORE`` standard deviations from flipping, after ``MIN_ANSWERS``
+answers. The next question is the unanswered one whose weights best
+separate the least settled comparison.
+"""
+
+import math
+from scoring.calculator import GIFT_ORDER, IncrementalScorer, MAX_ANSWER
+from .calibration import BASELINE_FACTOR
+
+# About 95% confidence that no comparison flips
+Z_SCORE = 1.96
+# Two answers per gift on average before stopping early
+MIN_ANSWERS = 2 * len(GIFT_ORDER)
+# Prior for the remaining answers: uniform over 1-5, worth this many answers
+PRIOR_MEAN = 3.0
+PRIOR_VARIANCE = 2.0
+PRIOR_WEIGHT = 5
+
+
+class Forecast:
+    """Expected final shares of an assessment in progress, and how settled they are"""
+
+    def __init__(self, catalog, answers, score_state=b'', threshold_factor=BASELINE_FACTOR):
+        self.catalog = catalog
+        self.factor = threshold_factor
+        weights = catalog.compiled.weights
+        values = bytes(answers)
+        self.answered = len(values) - values.count(0)
+        self.remaining = [
+            position for position in range(len(catalog.ids))
+            if position >= len(values) or not values[position]
+        ]
+
+        scorer = IncrementalScorer.from_bytes(score_state)
+        size = len(GIFT_ORDER)
+        given = [(position, value) for position, value in enumerate(values) if value]
+        overall = (sum(value for _, value in given) + PRIOR_MEAN * PRIOR_WEIGHT) / (len(given) + PRIOR_WEIGHT)
+
+        # Each gift's mean answer per unit of weight so far, shrunk towards
+        # the overall mean; the prior counts as PRIOR_WEIGHT units of weight
+        answered_weights = [maximum / MAX_ANSWER for maximum in scorer.maximum]
+        means = [
+            (scorer.raw[i] + overall * PRIOR_WEIGHT) / (answered_weights[i] + PRIOR_WEIGHT)
+            for i in range(size)
+        ]
+        # Spread of the answers around what those means predict
+        spread = 0.0
+        for position, value in given:
+            row = weights[catalog.ids[position]]
+            total = sum(row)
+            predicted = sum(w * m for w, m in zip(row, means)) / total if total else overall
+            spread += (value - predicted) ** 2
+        variance = (spread + PRIOR_VARIANCE * PRIOR_WEIGHT) / (len(given) + PRIOR_WEIGHT)
+
+        open_weights, open_squares = [0.0] * size, [0.0] * size
+        for position in self.remaining:
+            for i, weight in enumerate(weights[catalog.ids[position]]):
+                open_weights[i] += weight
+                open_squares[i] += weight * weight
+
+        # Final maximum per gift, and expected share of it with its variance:
+        # answer noise on the open questions plus the uncertainty of the mean
+        self.maximum = [scorer.maximum[i] + MAX_ANSWER * open_weights[i] for i in range(size)]
+        self.shares, self.variances = [], []
+        for i in range(size):
+            if self.maximum[i] > 0:
+                uncertainty = open_weights[i] ** 2 / (answered_weights[i] + PRIOR_WEIGHT) + open_squares[i]
+                self.shares.append((scorer.raw[i] + means[i] * open_weights[i]) / self.maximum[i])
+                self.variances.append(variance * uncertainty / self.maximum[i] ** 2)
+            else:
+                self.shares.append(0.0)
+                self.variances.append(0.0)
+
+        # Same order and tie-break as identify_gifts
+        self.ranking = sorted(range(size), key=lambda i: (self.shares[i], GIFT_ORDER[i]), reverse=True)
+
+    def _compare(self, a, b, factor=1.0):
+        gap = self.shares[a] - factor * self.shares[b]
+        deviation = math.sqrt(self.variances[a] + factor * factor * self.variances[b])
+        z = gap / deviation if deviation else math.copysign(math.inf, gap)
+        return (abs(z), a, b, factor), z
+
+    def comparisons(self):
+        """(z, gift, other gift, factor) for each comparison deciding the assignment"""
+        first, second, third, fourth = self.ranking[:4]
+        threshold, z = self._compare(third, first, self.factor)
+        result = [self._compare(first, second)[0], self._compare(second, third)[0], threshold]
+        # Which gift ranks third only matters if it may reach the threshold
+        if z > -Z_SCORE:
+            result.append(self._compare(third, fourth)[0])
+        return result
+
+    @property
+    def confidence(self):
+        """Standard deviations separating the least settled comparison from flipping"""
+        return min(z for z, _, _, _ in self.comparisons())
+
+    @property
+    def stable(self):
+        if not self.remaining:
+            return True
+        return self.answered >= MIN_ANSWERS and self.confidence >= Z_SCORE
+
+    def next_position(self):
+        """The unanswered question that best separates the least settled comparison"""
+        if not self.remaining:
+            return None
+        _, a, b, factor = min(self.comparisons(), key=lambda comparison: comparison[0])
+        weights = self.catalog.compiled.weights
+        scale_a = 1 / self.maximum[a] if self.maximum[a] else 0.0
+        scale_b = factor / self.maximum[b] if self.maximum[b] else 0.0
+
+        def separation(position):
+            row = weights[self.catalog.ids[position]]
+            return abs(row[a] * scale_a - row[b] * scale_b)
+
+        # max keeps the first of equally good questions, in question order
+        return max(self.remaining, key=separation)
+
+    def summary(self):
+        return {
+            'answered': self.answered,
+            'total': len(self.catalog.ids),
+            'stable': self.stable,
+            'confidence': None if math.isinf(self.confidence) else round(self.confidence, 2),
+            'leading_gifts': [GIFT_ORDER[i] for i in self.ranking[:3]],
+        }
+
+
+def forecast(progress, catalog):
+    return Forecast(catalog, progress.answers, progress.score_state)
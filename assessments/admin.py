@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Question, Assessment, GiftProfile, AssessmentResult
+from .models import Question, Assessment, GiftProfile, AssessmentResult, QuestionnaireVersion
 
 @admin.register(Assessment)
 class AssessmentAdmin(admin.ModelAdmin):
@@ -13,6 +13,13 @@ class QuestionAdmin(admin.ModelAdmin):
     list_filter = ('category', 'assessment', 'created_at')
     search_fields = ('text', 'category')
 
+@admin.register(QuestionnaireVersion)
+class QuestionnaireVersionAdmin(admin.ModelAdmin):
+    list_display = ('fingerprint', 'created_at')
+    search_fields = ('fingerprint',)
+    # Snapshots are immutable; assessments are pinned to them
+    readonly_fields = ('fingerprint', 'questions', 'created_at')
+
 @admin.register(GiftProfile)
 class GiftProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'primary_gift', 'timestamp')
@@ -0,0 +1,207 @@
+"""
+ASGI-native assessment submission.
+
+The sync ``submit`` action holds a gunicorn worker for the whole round trip
+to the FastAPI scoring service. These views await that call on the pooled
+async client instead, so one ASGI worker keeps many submissions in flight.
+ORM work runs in a small dedicated thread pool, bounding how many database
+connections the async worker can open at once.
+
+They are plain Django async views rather than DRF actions (DRF dispatches
+synchronously) and authenticate the same way as the API: token or session,
+with CSRF enforced for session requests.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authentication import CSRFCheck
+from rest_framework.authtoken.models import Token
+from core.services import FastAPIClient
+from .catalog import catalog_for
+from .models import Assessment
+from .services import format_scoring_payload, save_submission
+
+logger = logging.getLogger(__name__)
+
+orm_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_ORM_WORKERS', 4),
+    thread_name_prefix='assessment-orm',
+)
+
+
+def _in_orm_thread(func, *args, **kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_orm(func, *args, **kwargs):
+    """Run blocking ORM code on the bounded executor"""
+    return await sync_to_async(
+        _in_orm_thread, thread_sensitive=False, executor=orm_executor
+    )(func, *args, **kwargs)
+
+
+def _token_user(key):
+    token = Token.objects.select_related('user').filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def _csrf_failure(request):
+    check = CSRFCheck(lambda req: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+async def authenticate(request):
+    """Return (user, error_response) using token or session authentication"""
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Token '):
+        user = await run_orm(_token_user, header[len('Token '):].strip())
+        if user is None:
+            return None, JsonResponse({'error': 'Invalid token'}, status=401)
+        return user, None
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return None, JsonResponse({'error': 'Authentication required'}, status=401)
+    if _csrf_failure(request):
+        return None, JsonResponse({'error': 'CSRF Failed'}, status=403)
+    return user, None
+
+
+def _load_answers(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _counselor_profile(user):
+    return getattr(user, 'counselor_profile', None)
+
+
+def _visible_assessment(user, pk):
+    # Same visibility rules as AssessmentViewSet.get_queryset
+    queryset = Assessment.objects.select_related('user')
+    counselor = _counselor_profile(user)
+    if counselor is not None:
+        queryset = queryset.filter(
+            Q(counselor=counselor) |
+            Q(user__in=counselor.counseled_users.values('user'))
+        )
+    else:
+        queryset = queryset.filter(user=user)
+    return queryset.filter(pk=pk).first()
+
+
+def _scoring_payload(user_id, answers, assessment=None):
+    catalog = catalog_for(assessment) if assessment is not None else None
+    return format_scoring_payload(user_id, answers, catalog)
+
+
+async def _score(user_id, answers, assessment=None):
+    # Reads the question catalog, which may need reloading from the database
+    payload = await run_orm(_scoring_payload, user_id, answers, assessment)
+    return await FastAPIClient().calculate_gifts(payload)
+
+
+@csrf_exempt
+@require_POST
+async def submit_async(request):
+    """Async equivalent of the `submit` action: score answers into a new assessment"""
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    data = _load_answers(request)
+    if data is None:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    if await run_orm(Assessment.has_reached_limit, user):
+        return JsonResponse(
+            {'error': "You have reached the maximum limit of 3 assessments"}, status=400
+        )
+
+    answers = data.get('answers', [])
+    if not answers:
+        return JsonResponse({'error': "No answers provided"}, status=400)
+
+    try:
+        results = await _score(user.id, answers)
+    except (KeyError, TypeError) as e:
+        return JsonResponse({'error': f"Invalid answer format: {str(e)}"}, status=400)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        await run_orm(save_submission, user, results, answers=answers)
+    except Exception as e:
+        logger.error(f"Saving async submission failed for user {user.id}: {str(e)}")
+        return JsonResponse({'error': f"Submission failed: {str(e)}"}, status=500)
+
+    return JsonResponse(results)
+
+
+@csrf_exempt
+@require_POST
+async def submit_assessment(request, pk):
+    """Score answers for an existing assessment, on behalf of a user or by their counselor"""
+    user, error = await authenticate(request)
+    if error:
+        return error
+
+    assessment = await run_orm(_visible_assessment, user, pk)
+    if assessment is None:
+        return JsonResponse({'detail': 'No Assessment matches the given query.'}, status=404)
+
+    counselor = await run_orm(_counselor_profile, user)
+    if counselor is None and await run_orm(Assessment.has_reached_limit, assessment.user):
+        return JsonResponse(
+            {'error': "You have reached the maximum limit of 3 assessments"}, status=400
+        )
+
+    data = _load_answers(request)
+    if data is None:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+    answers = data.get('answers', [])
+    if not answers:
+        return JsonResponse({'error': 'No answers provided'}, status=400)
+
+    try:
+        results = await _score(assessment.user_id, answers, assessment)
+    except (KeyError, TypeError) as e:
+        return JsonResponse({'error': f"Invalid answer format: {str(e)}"}, status=400)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        await run_orm(
+            save_submission, assessment.user, results,
+            assessment=assessment,
+            counselor=counselor,
+            counselor_notes=data.get('counselor_notes', ''),
+            answers=answers,
+        )
+    except Exception as e:
+        logger.error(f"Saving async submission failed for assessment {assessment.id}: {str(e)}")
+        return JsonResponse({'error': f"Submission failed: {str(e)}"}, status=500)
+
+    return JsonResponse({
+        'message': 'Assessment completed successfully',
+        'assessment_id': assessment.id,
+        'results': results
+    })
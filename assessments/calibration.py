@@ -0,0 +1,126 @@
+"""
+Threshold calibration for secondary gift assignment.
+
+``GiftCalculator.identify_gifts`` takes the highest score as the primary
+gift and the next two as secondary gifts when they reach
+``threshold_factor`` times the highest score, always keeping the second
+highest. The primary gift and the first secondary gift therefore never
+depend on the factor; it only decides whether the third highest gift is
+added, which happens exactly when ``third / highest >= factor``.
+
+``simulate`` uses that to evaluate a whole grid of factors in one pass:
+each profile is ranked once, its third/highest ratio is kept per gift,
+and once those lists are sorted every factor is answered by bisecting
+them, instead of calling ``identify_gifts`` per profile and factor.
+Ratios decide ties at the threshold as ``identify_gifts`` does up to float
+rounding of the last bit.
+"""
+
+import random
+from bisect import bisect_left
+from collections import Counter
+from scoring.calculator import GIFT_ORDER, IncrementalScorer, MAX_ANSWER, unpack_scores
+from .models import GiftProfile, Question
+
+DEFAULT_FACTORS = (0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0)
+# The factor the results views use today
+BASELINE_FACTOR = 0.80
+CHUNK_SIZE = 5000
+
+
+def rank(scores):
+    """Gifts by descending score, ties broken as identify_gifts does"""
+    return sorted(scores, key=lambda gift: (scores[gift], gift), reverse=True)
+
+
+def assign(scores, threshold_factor=BASELINE_FACTOR):
+    """identify_gifts on a gift -> score mapping, as (primary, [secondary]) gift keys"""
+    ranked = rank(scores)
+    secondary = ranked[1:2]
+    top = scores[ranked[0]]
+    if len(ranked) > 2 and scores[ranked[2]] >= top * threshold_factor:
+        secondary.append(ranked[2])
+    return ranked[0], secondary
+
+
+class ThresholdSimulation:
+    """Ranked score vectors, reduced to what the threshold factor can change"""
+
+    def __init__(self):
+        self.profiles = 0
+        self.primary = Counter()
+        self.first_secondary = Counter()
+        # Per gift, third/highest ratios of the profiles where it ranks third;
+        # sorted before reporting
+        self.third_ratios = {gift: [] for gift in GIFT_ORDER}
+
+    def add(self, scores):
+        ranked = rank(scores)
+        top = scores[ranked[0]]
+        self.profiles += 1
+        self.primary[ranked[0]] += 1
+        self.first_secondary[ranked[1]] += 1
+        self.third_ratios[ranked[2]].append(scores[ranked[2]] / top if top > 0 else 1.0)
+
+    def _with_third(self, gift, factor):
+        ratios = self.third_ratios[gift]
+        return len(ratios) - bisect_left(ratios, factor)
+
+    def report(self, factors=DEFAULT_FACTORS, baseline=BASELINE_FACTOR):
+        """
+        Secondary gift assignments for each factor.
+
+        Each row gives how many profiles get two secondary gifts, how many
+        get each gift as a secondary one, and how many profiles' secondary
+        gifts differ from those under `baseline`.
+        """
+        for ratios in self.third_ratios.values():
+            ratios.sort()
+        baseline_counts = {gift: self._with_third(gift, baseline) for gift in GIFT_ORDER}
+        rows = []
+        for factor in sorted(factors):
+            with_third = {gift: self._with_third(gift, factor) for gift in GIFT_ORDER}
+            rows.append({
+                'factor': factor,
+                'two_secondary': sum(with_third.values()),
+                'secondary_gifts': {
+                    gift: self.first_secondary[gift] + with_third[gift] for gift in GIFT_ORDER
+                },
+                # Raising the factor only drops third gifts, so the profiles
+                # that change are those whose ratio lies between the two
+                'changed': sum(abs(with_third[gift] - baseline_counts[gift]) for gift in GIFT_ORDER),
+            })
+        return {
+            'profiles': self.profiles,
+            'baseline': baseline,
+            'primary_gifts': {gift: self.primary[gift] for gift in GIFT_ORDER},
+            'factors': rows,
+        }
+
+
+def stored_scores(chunk_size=CHUNK_SIZE):
+    """The scores of every stored gift profile"""
+    vectors = GiftProfile.objects.order_by().values_list('score_vector', flat=True)
+    for score_vector in vectors.iterator(chunk_size=chunk_size):
+        yield unpack_scores(score_vector)
+
+
+def synthetic_scores(count, seed=None):
+    """Scores of `count` questionnaires answered uniformly at random"""
+    correlations = list(Question.objects.order_by('id').values_list('gift_correlation', flat=True))
+    if not correlations:
+        raise ValueError('No questions are loaded to answer')
+    generator = random.Random(seed)
+    for _ in range(count):
+        scorer = IncrementalScorer()
+        for correlation in correlations:
+            scorer.add(generator.randint(1, MAX_ANSWER), correlation)
+        yield scorer.scores()
+
+
+def simulate(scores, factors=DEFAULT_FACTORS, baseline=BASELINE_FACTOR):
+    """Run the factor grid over an iterable of gift -> score mappings"""
+    simulation = ThresholdSimulation()
+    for profile_scores in scores:
+        simulation.add(profile_scores)
+    return simulation.report(factors, baseline)
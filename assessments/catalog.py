@@ -0,0 +1,143 @@
+"""
+Process-wide catalog of the assessment questions.
+
+The question set only changes when ``load_questions`` runs or someone edits
+questions in the admin, yet listing, validating and scoring answers all
+need it. Each process loads it once and keeps the serialized list as
+pre-encoded JSON with a content hash for ETags. Changes bump a version
+stamp in the shared cache (see ``invalidate``), and every process reloads
+its copy the next time it sees a new stamp.
+
+Assessments are pinned to the questionnaire version they were started
+with: an immutable ``QuestionnaireVersion`` snapshot identified by the
+catalog fingerprint. ``catalog_for`` returns the catalog of an
+assessment's version, so answers keep scoring against the questions that
+were shown even after the stored questions change; each process keeps the
+most recently used older versions, compiled, in an LRU.
+"""
+
+import hashlib
+import json
+import threading
+from functools import cached_property
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from core.cache import CacheNamespace
+from scoring.calculator import CompiledQuestionnaire, LRUCache
+
+catalog_versions = CacheNamespace('question-catalog', timeout=None, beta=0)
+
+# Catalogs of older questionnaire versions kept per process, by fingerprint
+VERSION_CACHE_SIZE = 8
+_versions = LRUCache(VERSION_CACHE_SIZE)
+
+_lock = threading.Lock()
+_current = None
+
+
+class QuestionCatalog:
+    """An immutable snapshot of the questions, in id order"""
+
+    def __init__(self, questions, stamp):
+        self.stamp = stamp
+        self.questions = tuple(questions)
+        self.ids = [question['id'] for question in self.questions]
+        self.correlations = [question['gift_correlation'] for question in self.questions]
+        self.index = {question_id: position for position, question_id in enumerate(self.ids)}
+        self.body = JSONRenderer().render(self.questions)
+        self.content_hash = hashlib.sha256(self.body).hexdigest()
+        self.etag = f'"{self.content_hash[:32]}"'
+        # Positions and weights only; text edits keep saved progress valid
+        self.fingerprint = hashlib.sha1(
+            json.dumps([self.ids, self.correlations], sort_keys=True).encode()
+        ).hexdigest()[:16]
+        # Whether this process saved the QuestionnaireVersion snapshot yet
+        self.snapshot_saved = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    def correlation(self, question_id):
+        return self.correlations[self.index[question_id]]
+
+    @cached_property
+    def compiled(self):
+        """The correlations compiled for scoring, on first use"""
+        return CompiledQuestionnaire(self.fingerprint, dict(zip(self.ids, self.correlations)))
+
+
+def _load(stamp):
+    from .models import Question
+    from .serializers import QuestionSerializer
+    questions = QuestionSerializer(Question.objects.order_by('id'), many=True).data
+    return QuestionCatalog(questions, stamp)
+
+
+def get_catalog():
+    """The current catalog, reloaded if the questions changed since it was built"""
+    global _current
+    stamp = catalog_versions.generation()
+    catalog = _current
+    if catalog is not None and catalog.stamp == stamp:
+        return catalog
+    with _lock:
+        if _current is None or _current.stamp != stamp:
+            _current = _load(stamp)
+        return _current
+
+
+def _bump():
+    global _current
+    catalog_versions.invalidate()
+    _current = None
+
+
+def invalidate():
+    """
+    Mark the catalog stale in every process.
+
+    Bumped again once the current transaction commits, so a process that
+    reloaded in between does not keep the uncommitted state's snapshot.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def current_version():
+    """Fingerprint of the current questions, snapshotted as a version to pin assessments to"""
+    from .models import QuestionnaireVersion
+    catalog = get_catalog()
+    if not catalog.snapshot_saved:
+        QuestionnaireVersion.objects.get_or_create(
+            fingerprint=catalog.fingerprint,
+            defaults={'questions': [dict(question) for question in catalog.questions]}
+        )
+        # Only trusted once committed: a rolled back snapshot is saved again
+        transaction.on_commit(lambda: setattr(catalog, 'snapshot_saved', True))
+    return catalog.fingerprint
+
+
+def get_version(fingerprint):
+    """
+    The catalog of questionnaire version `fingerprint`.
+
+    Blank or unknown fingerprints, from assessments created before
+    versions, get the current catalog.
+    """
+    from .models import QuestionnaireVersion
+    current = get_catalog()
+    if not fingerprint or fingerprint == current.fingerprint:
+        return current
+    catalog = _versions.get(fingerprint)
+    if catalog is None:
+        version = QuestionnaireVersion.objects.filter(fingerprint=fingerprint).first()
+        if version is None:
+            return current
+        catalog = QuestionCatalog(version.questions, fingerprint)
+        _versions.put(fingerprint, catalog)
+    return catalog
+
+
+def catalog_for(assessment):
+    """The catalog of the questionnaire version `assessment` is pinned to"""
+    return get_version(assessment.questionnaire_version)
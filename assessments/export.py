@@ -0,0 +1,259 @@
+"""
+Snapshot export of assessment data for offline analysis.
+
+Streams three tables out of the database in chunks and writes each to a
+columnar file, so memory stays bounded however many rows there are:
+
+- ``assessments``: one row per assessment, without the results JSON;
+- ``gift_profiles``: one row per profile, the seven scores flattened into
+  float32 ``score_<gift>`` columns;
+- ``answers``: one row per stored answer of the exported assessments,
+  read from their latest gift profile's packed answers (or, for
+  profiles from before those were stored, from ``results_data``).
+
+Parquet or Arrow IPC files need pyarrow; without it (or with
+``format='csv'``) plain CSV is written instead. Exports are incremental:
+``export-watermark.json`` in the output directory records how far the
+last run got (assessments by ``updated_at``, profiles by id) and the next
+run writes only what changed since. Assessments updated after their
+first export appear again in a later file, so consumers keep the latest
+row per id.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from django.utils import timezone
+from scoring.calculator import GIFT_ORDER, unpack_scores
+from .models import Assessment, GiftProfile
+from .services import stored_answers
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ('parquet', 'arrow', 'csv')
+EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow', 'csv': 'csv'}
+WATERMARK_FILE = 'export-watermark.json'
+CHUNK_SIZE = 5000
+
+ASSESSMENT_COLUMNS = [
+    ('id', 'int64'),
+    ('user_id', 'int64'),
+    ('counselor_id', 'int64'),
+    ('title', 'string'),
+    ('completion_status', 'bool'),
+    ('is_counselor_session', 'bool'),
+    ('session_date', 'timestamp'),
+    ('created_at', 'timestamp'),
+    ('updated_at', 'timestamp'),
+]
+PROFILE_COLUMNS = [
+    ('id', 'int64'),
+    ('user_id', 'int64'),
+    ('assessment_id', 'int64'),
+    ('primary_gift', 'string'),
+    # Comma-separated, most prominent first
+    ('secondary_gifts', 'string'),
+    *((f'score_{gift.lower()}', 'float32') for gift in GIFT_ORDER),
+    ('descriptions_version', 'int64'),
+    ('timestamp', 'timestamp'),
+]
+ANSWER_COLUMNS = [
+    ('assessment_id', 'int64'),
+    ('question_id', 'int64'),
+    ('answer', 'int64'),
+]
+
+
+def default_format():
+    return 'parquet' if pyarrow is not None else 'csv'
+
+
+class CsvTableWriter:
+    """Rows to a CSV file with a header; timestamps as ISO 8601"""
+
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write(self, rows):
+        self.writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowTableWriter:
+    """Rows to a Parquet or Arrow IPC file, one record batch per chunk"""
+
+    def __init__(self, path, columns, file_format):
+        types = {
+            'int64': pyarrow.int64(),
+            'float32': pyarrow.float32(),
+            'string': pyarrow.string(),
+            'bool': pyarrow.bool_(),
+            'timestamp': pyarrow.timestamp('us', tz='UTC'),
+        }
+        self.schema = pyarrow.schema([(name, types[kind]) for name, kind in columns])
+        if file_format == 'parquet':
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        batch = pyarrow.record_batch(
+            [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema,
+        )
+        if isinstance(self.writer, pyarrow.parquet.ParquetWriter):
+            self.writer.write_table(pyarrow.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path, columns, file_format):
+    if file_format == 'csv':
+        return CsvTableWriter(path, columns)
+    if pyarrow is None:
+        raise ValueError(f"{file_format} export needs pyarrow; install it or use csv")
+    return ArrowTableWriter(path, columns, file_format)
+
+
+def read_watermark(directory):
+    try:
+        with open(os.path.join(directory, WATERMARK_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'assessments_updated_at': None, 'last_profile_id': 0}
+
+
+def _write_watermark(directory, watermark):
+    path = os.path.join(directory, WATERMARK_FILE)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(watermark, f, indent=2)
+    os.replace(f'{path}.tmp', path)
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _answer_rows(chunk):
+    """Answer rows of a chunk of (assessment id, results_data) pairs"""
+    blobs = {}
+    # Ascending ids, so each assessment keeps its latest profile's answers
+    for assessment_id, blob in GiftProfile.objects.filter(
+        assessment_id__in=[assessment_id for assessment_id, _ in chunk]
+    ).order_by('id').values_list('assessment_id', 'answers'):
+        blobs[assessment_id] = blob
+    for assessment_id, results_data in chunk:
+        for question_id, answer in stored_answers(blobs.get(assessment_id), results_data):
+            yield assessment_id, question_id, answer
+
+
+def export(directory, file_format=None, full=False, chunk_size=CHUNK_SIZE):
+    """
+    Write the assessments, profiles and answers changed since the last export.
+
+    Files are written under temporary names and renamed once complete;
+    the watermark only moves after every file is in place, so an
+    interrupted export is simply redone by the next run. Returns
+    {table: rows written}.
+    """
+    file_format = file_format or default_format()
+    os.makedirs(directory, exist_ok=True)
+    watermark = {'assessments_updated_at': None, 'last_profile_id': 0} if full else read_watermark(directory)
+    started = timezone.now()
+    stamp = started.strftime('%Y%m%dT%H%M%S%f')
+
+    paths = {
+        table: os.path.join(directory, f'{table}-{stamp}.{EXTENSIONS[file_format]}')
+        for table in ('assessments', 'gift_profiles', 'answers')
+    }
+    writers = {}
+    counts = dict.fromkeys(paths, 0)
+    try:
+        for table, columns in (
+            ('assessments', ASSESSMENT_COLUMNS),
+            ('gift_profiles', PROFILE_COLUMNS),
+            ('answers', ANSWER_COLUMNS),
+        ):
+            writers[table] = open_writer(f'{paths[table]}.tmp', columns, file_format)
+
+        assessments = Assessment.objects.filter(updated_at__lte=started).order_by('id')
+        if watermark['assessments_updated_at']:
+            assessments = assessments.filter(
+                updated_at__gt=datetime.fromisoformat(watermark['assessments_updated_at'])
+            )
+        rows = assessments.values_list(
+            *(name for name, _ in ASSESSMENT_COLUMNS), 'results_data'
+        ).iterator(chunk_size=chunk_size)
+        answers = []
+        for chunk in _chunks(rows, chunk_size):
+            writers['assessments'].write([row[:-1] for row in chunk])
+            counts['assessments'] += len(chunk)
+            answers.extend(_answer_rows([(row[0], row[-1]) for row in chunk]))
+            if len(answers) >= chunk_size:
+                writers['answers'].write(answers)
+                counts['answers'] += len(answers)
+                answers = []
+        if answers:
+            writers['answers'].write(answers)
+            counts['answers'] += len(answers)
+
+        last_profile_id = watermark['last_profile_id']
+        profiles = GiftProfile.objects.filter(id__gt=last_profile_id, timestamp__lte=started).order_by('id')
+        rows = profiles.values_list(
+            'id', 'user_id', 'assessment_id', 'primary_gift', 'secondary_gifts',
+            'score_vector', 'descriptions_version', 'timestamp'
+        ).iterator(chunk_size=chunk_size)
+        for chunk in _chunks(rows, chunk_size):
+            writers['gift_profiles'].write([
+                (
+                    profile_id, user_id, assessment_id, primary_gift, ','.join(secondary_gifts or []),
+                    *unpack_scores(score_vector).values(), descriptions_version, timestamp,
+                )
+                for profile_id, user_id, assessment_id, primary_gift, secondary_gifts,
+                score_vector, descriptions_version, timestamp in chunk
+            ])
+            counts['gift_profiles'] += len(chunk)
+            last_profile_id = chunk[-1][0]
+    except BaseException:
+        for writer in writers.values():
+            writer.close()
+        for path in paths.values():
+            if os.path.exists(f'{path}.tmp'):
+                os.remove(f'{path}.tmp')
+        raise
+
+    for writer in writers.values():
+        writer.close()
+    for path in paths.values():
+        os.replace(f'{path}.tmp', path)
+    _write_watermark(directory, {
+        'assessments_updated_at': started.isoformat(),
+        'last_profile_id': last_profile_id,
+        'format': file_format,
+        'files': [os.path.basename(path) for path in paths.values()],
+    })
+    return counts
@@ -0,0 +1,53 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from assessments import export
+
+
+class Command(BaseCommand):
+    help = 'Export assessments, gift profiles and answers changed since the last export to columnar files'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        file_format = options['format'] or export.default_format()
+        if options['format'] is None and file_format == 'csv':
+            self.stdout.write(self.style.WARNING('pyarrow is not installed; writing CSV'))
+        try:
+            counts = export.export(
+                options['output'],
+                file_format=file_format,
+                full=options['full'],
+                chunk_size=options['chunk_size'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for table, count in counts.items():
+            self.stdout.write(f'  {table}: {count} rows')
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {file_format} to {options['output']} in {time.monotonic() - started:.2f}s"
+        ))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=os.path.join(settings.BASE_DIR, 'exports'),
+            help='Directory for the export files and watermark (default: exports/)',
+        )
+        parser.add_argument(
+            '--format',
+            choices=export.FORMATS,
+            help='File format (default: parquet when pyarrow is installed, else csv)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Export everything, ignoring the watermark of earlier runs',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=export.CHUNK_SIZE,
+            help='Rows read and written at a time',
+        )
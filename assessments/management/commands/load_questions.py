@@ -1,11 +1,63 @@
-from django.core.management.base import BaseCommand
-from assessments.models import Question
+import json
+from django.core.management.base import BaseCommand, CommandError
+from assessments.services import upsert_questions
 
 class Command(BaseCommand):
     help = 'Load initial motivational gift assessment questions'
 
-    def handle(self, *args, **kwargs):
-        questions = [
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            action='append',
+            dest='files',
+            metavar='PATH',
+            help='Load questions from a JSON file (a list of questions, or {"questions": [...]}) '
+                 'instead of the built-in set; may be repeated'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without writing anything'
+        )
+
+    def handle(self, *args, **options):
+        questions = self.read_files(options['files']) if options['files'] else self.default_questions()
+        try:
+            changes = upsert_questions(questions, dry_run=options['dry_run'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for label, texts in (('Create', changes['created']), ('Update', changes['updated'])):
+            for text in texts:
+                self.stdout.write(f'  {label}: {text[:70]}')
+
+        summary = (
+            f"{len(changes['created'])} created, {len(changes['updated'])} updated, "
+            f"{changes['unchanged']} unchanged"
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'DRY RUN: would load questions: {summary}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully loaded questions: {summary}'))
+
+    def read_files(self, paths):
+        questions = []
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+            if isinstance(data, dict):
+                data = data.get('questions')
+            if not isinstance(data, list):
+                raise CommandError(f'{path} must contain a list of questions')
+            questions.extend(data)
+        return questions
+
+    def default_questions(self):
+        """The built-in motivational gift questionnaire"""
+        return [
             # Gift A - Perception/Prophecy Questions (10 questions)
             {
                 'category': 'Perception',
@@ -440,31 +492,3 @@ class Command(BaseCommand):
                 'gift_correlation': {'COMPASSION': 1.0, 'EXHORTATION': 0.5, 'SERVICE': 0.3}
             }
         ]
-
-        created_count = 0
-        updated_count = 0
-
-        for q in questions:
-            obj, created = Question.objects.get_or_create(
-                text=q['text'],
-                defaults={
-                    'category': q['category'],
-                    'weight': q['weight'],
-                    'gift_correlation': q['gift_correlation']
-                }
-            )
-            if created:
-                created_count += 1
-            else:
-                # Update existing question
-                obj.category = q['category']
-                obj.weight = q['weight']
-                obj.gift_correlation = q['gift_correlation']
-                obj.save()
-                updated_count += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'Successfully loaded questions: {created_count} created, {updated_count} updated'
-            )
-        )
\ No newline at end of file
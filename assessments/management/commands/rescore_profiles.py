@@ -0,0 +1,45 @@
+import time
+from django.core.management.base import BaseCommand
+from assessments import calibration, rescoring
+from assessments.catalog import get_catalog
+
+
+class Command(BaseCommand):
+    help = 'Re-score gift profiles from their stored answers with the current question correlations'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.stdout.write(f'Re-scoring profiles for questionnaire version {get_catalog().fingerprint}')
+        counts = rescoring.rescore(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            threshold_factor=options['threshold_factor'],
+        )
+        if counts['skipped']:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped {counts['skipped']} profiles without answers to the current questions"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-scored {counts['rescored']} profiles ({counts['changed']} changed gifts) "
+            f"in {time.monotonic() - started:.2f}s"
+        ))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes scoring batches (default: 1, in this process)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=rescoring.BATCH_SIZE,
+            help='Profiles scored and written per transaction',
+        )
+        parser.add_argument(
+            '--threshold-factor',
+            type=float,
+            default=calibration.BASELINE_FACTOR,
+            help='Secondary gift threshold factor (default: 0.80, as the scoring service)',
+        )
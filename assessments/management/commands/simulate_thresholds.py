@@ -0,0 +1,65 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from assessments import calibration
+
+
+def factor_list(value):
+    return [float(factor) for factor in value.split(',') if factor.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Simulate secondary gift assignment over stored or synthetic profiles for a grid of threshold factors'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options['synthetic']:
+            scores = calibration.synthetic_scores(options['synthetic'], seed=options['seed'])
+        else:
+            scores = calibration.stored_scores()
+        try:
+            report = calibration.simulate(scores, options['factors'], options['baseline'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        profiles = report['profiles']
+        self.stdout.write(f"{profiles} profiles; changes are against factor {report['baseline']:.2f}")
+        self.stdout.write('Primary gifts: ' + ', '.join(
+            f'{gift} {count}' for gift, count in report['primary_gifts'].items()
+        ))
+        gifts = list(report['primary_gifts'])
+        self.stdout.write(
+            f"{'factor':>7} {'2 sec.':>8} {'changed':>8}  " + ' '.join(f'{gift[:6]:>7}' for gift in gifts)
+        )
+        for row in report['factors']:
+            self.stdout.write(
+                f"{row['factor']:>7.2f} {row['two_secondary']:>8} {row['changed']:>8}  "
+                + ' '.join(f"{row['secondary_gifts'][gift]:>7}" for gift in gifts)
+            )
+        self.stdout.write(self.style.SUCCESS(f'Simulated in {time.monotonic() - started:.2f}s'))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--factors',
+            type=factor_list,
+            default=list(calibration.DEFAULT_FACTORS),
+            help='Comma-separated threshold factors to try (default: 0.50 to 1.00 in steps of 0.05)',
+        )
+        parser.add_argument(
+            '--baseline',
+            type=float,
+            default=calibration.BASELINE_FACTOR,
+            help='Factor to count changed assignments against (default: 0.80)',
+        )
+        parser.add_argument(
+            '--synthetic',
+            type=int,
+            metavar='COUNT',
+            help='Score COUNT randomly answered questionnaires instead of the stored profiles',
+        )
+        parser.add_argument('--seed', type=int, help='Random seed for --synthetic')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
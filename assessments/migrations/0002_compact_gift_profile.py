@@ -0,0 +1,65 @@
+import struct
+from django.db import migrations, models
+
+# Frozen copies of the score vector format at the time of this migration,
+# so later changes to the live code do not change what it writes
+GIFT_ORDER = ('PERCEPTION', 'SERVICE', 'TEACHING', 'EXHORTATION', 'GIVING', 'ADMINISTRATION', 'COMPASSION')
+SCORE_VECTOR = struct.Struct('<7f')
+
+
+def pack_scores(scores):
+    return SCORE_VECTOR.pack(*(float(scores.get(gift, 0.0)) for gift in GIFT_ORDER))
+
+
+def unpack_scores(blob):
+    return {gift: round(value, 4) for gift, value in zip(GIFT_ORDER, SCORE_VECTOR.unpack(bytes(blob)))}
+
+
+def pack_profile_scores(apps, schema_editor):
+    GiftProfile = apps.get_model('assessments', 'GiftProfile')
+    profiles = list(GiftProfile.objects.only('id', 'scores'))
+    for profile in profiles:
+        profile.score_vector = pack_scores(
+            {gift.upper(): value for gift, value in (profile.scores or {}).items()}
+        )
+    GiftProfile.objects.bulk_update(profiles, ['score_vector'], batch_size=500)
+
+
+def unpack_profile_scores(apps, schema_editor):
+    GiftProfile = apps.get_model('assessments', 'GiftProfile')
+    profiles = list(GiftProfile.objects.only('id', 'score_vector'))
+    for profile in profiles:
+        profile.scores = unpack_scores(profile.score_vector)
+    GiftProfile.objects.bulk_update(profiles, ['scores'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assessments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="giftprofile",
+            name="score_vector",
+            field=models.BinaryField(default=b""),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="giftprofile",
+            name="descriptions_version",
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        # Nullable so the column can be restored and refilled on reverse
+        migrations.AlterField(
+            model_name="giftprofile",
+            name="scores",
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(pack_profile_scores, unpack_profile_scores),
+        migrations.RemoveField(
+            model_name="giftprofile",
+            name="scores",
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0002_compact_gift_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssessmentProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answers', models.BinaryField(default=b'')),
+                ('score_state', models.BinaryField(default=b'')),
+                ('layout', models.CharField(max_length=16)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assessment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='assessments.assessment')),
+            ],
+        ),
+    ]
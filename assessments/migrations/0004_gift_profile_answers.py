@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0003_assessment_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='giftprofile',
+            name='answers',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='giftprofile',
+            name='questionnaire_version',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0005_questionnaire_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='adaptive',
+            field=models.BooleanField(default=False),
+        ),
+    ]
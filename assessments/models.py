@@ -3,6 +3,11 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from users.models import User
+from scoring.calculator import DESCRIPTIONS_VERSION, GiftCalculator, pack_scores, unpack_scores
+from .catalog import catalog_for
+
+# Result keys rebuilt from the gift profile, so completed assessments do not store them
+DERIVED_RESULT_KEYS = ('scores', 'primary_gift', 'secondary_gifts', 'descriptions', 'recommended_roles')
 
 class Assessment(models.Model):
     title = models.CharField(max_length=200, default="Default Assessment Title")
@@ -23,6 +28,12 @@ class Assessment(models.Model):
     counselor_notes = models.TextField(blank=True)
     is_counselor_session = models.BooleanField(default=False)
     session_date = models.DateTimeField(null=True, blank=True)
+    # Fingerprint of the QuestionnaireVersion answered (see catalog.catalog_for);
+    # blank for assessments from before versions, which use the current questions
+    questionnaire_version = models.CharField(max_length=16, blank=True, default='')
+    # Questions are asked in the order adaptive.Forecast picks, and the
+    # assessment may be submitted once the gift assignment is settled
+    adaptive = models.BooleanField(default=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -32,7 +43,7 @@ class Assessment(models.Model):
     
     def validate_answers(self, answers):
         """Validate assessment answers"""
-        required_questions = Question.objects.count()
+        required_questions = len(catalog_for(self))
         if len(answers) != required_questions:
             raise ValueError(f"Expected {required_questions} answers, got {len(answers)}")
         
@@ -40,6 +51,30 @@ class Assessment(models.Model):
             if not (1 <= answer['answer'] <= 5):
                 raise ValueError("Answers must be between 1 and 5")
     
+    @property
+    def results(self):
+        """
+        Results in the shape returned at submission.
+
+        Completed assessments store only what cannot be derived; the rest is
+        rebuilt from their gift profile. Rows written before the compact
+        format carry everything in results_data and are returned as is.
+        """
+        data = self.results_data
+        if not self.completion_status or data is None or 'scores' in data:
+            return data
+        # all() so a prefetch of giftprofile_set is used
+        profiles = list(self.giftprofile_set.all())
+        if not profiles:
+            return data
+        profile = max(profiles, key=lambda p: p.pk)
+        return {**profile.to_results(), **data}
+
+    @staticmethod
+    def compact_results(results):
+        """The part of a results payload stored on the assessment itself"""
+        return {k: v for k, v in results.items() if k not in DERIVED_RESULT_KEYS}
+
     def is_complete(self):
         """Check if assessment is complete"""
         return self.completion_status and self.results_data is not None
@@ -59,6 +94,16 @@ class Assessment(models.Model):
         ).count()
         return assessments_count >= 3
 
+class QuestionnaireVersion(models.Model):
+    """An immutable snapshot of the questions and their correlations"""
+    fingerprint = models.CharField(max_length=16, unique=True)
+    # Serialized questions in id order, as the question catalog lists them
+    questions = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Questionnaire {self.fingerprint} ({len(self.questions)} questions)"
+
 class Question(models.Model):
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, null=True, blank=True)
     category = models.CharField(max_length=100)
@@ -76,7 +121,14 @@ class GiftProfile(models.Model):
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE)
     primary_gift = models.CharField(max_length=100)
     secondary_gifts = models.JSONField()
-    scores = models.JSONField()
+    # Scores as float32 in GIFT_ORDER (see scoring.calculator.pack_scores)
+    score_vector = models.BinaryField()
+    descriptions_version = models.PositiveSmallIntegerField(default=DESCRIPTIONS_VERSION)
+    # The answers scored (see scoring.calculator.pack_answers), so the profile
+    # can be re-scored when question correlations change
+    answers = models.BinaryField(default=b'')
+    # Fingerprint of the question set the scores were calculated with
+    questionnaire_version = models.CharField(max_length=16, blank=True, default='')
     timestamp = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -85,6 +137,33 @@ class GiftProfile(models.Model):
     def __str__(self):
         return f"Gift Profile for {self.user.username}"
 
+    @property
+    def scores(self):
+        return unpack_scores(self.score_vector)
+
+    @scores.setter
+    def scores(self, value):
+        self.score_vector = pack_scores(value)
+
+    def to_results(self):
+        """Rebuild the scoring service's result payload"""
+        try:
+            descriptions = GiftCalculator().get_gift_descriptions(self.primary_gift, self.secondary_gifts)
+        except StopIteration:
+            # Gift names that no longer match MOTIVATIONAL_GIFTS
+            descriptions = {}
+        return {
+            'scores': self.scores,
+            'primary_gift': self.primary_gift,
+            'secondary_gifts': self.secondary_gifts,
+            'descriptions': descriptions,
+            'recommended_roles': {
+                'primary_roles': [],
+                'secondary_roles': [],
+                'ministry_areas': []
+            },
+        }
+
 class AssessmentResult(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE)
@@ -98,3 +177,24 @@ class AssessmentResult(models.Model):
         
     def __str__(self):
         return f"{self.user.username}'s results for {self.assessment.title}"
+
+
+class AssessmentProgress(models.Model):
+    """Answers of an assessment in progress (see assessments/progress.py)"""
+    assessment = models.OneToOneField(Assessment, on_delete=models.CASCADE, related_name='progress')
+    # One byte per question in question id order: the answer 1-5, or 0 if unanswered
+    answers = models.BinaryField(default=b'')
+    # IncrementalScorer running vectors
+    score_state = models.BinaryField(default=b'')
+    # Fingerprint of the question set the answer positions refer to
+    layout = models.CharField(max_length=16)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Progress of assessment {self.assessment_id} (version {self.version})"
+
+    @property
+    def answered(self):
+        answers = bytes(self.answers)
+        return len(answers) - answers.count(0)
@@ -0,0 +1,182 @@
+"""
+Progress of assessments that are being answered.
+
+Answers are stored one byte per question (0 = unanswered) in question id
+order, next to the running score vectors of ``IncrementalScorer``, so a save
+writes a few hundred bytes however many questions are answered. Clients
+send only the answers that changed along with the version they last saw;
+a save based on a stale version is rejected, so two sessions cannot
+silently overwrite each other.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from scoring.calculator import GiftCalculator, IncrementalScorer
+from .catalog import catalog_for
+from .models import AssessmentProgress
+
+
+class ProgressConflict(Exception):
+    """The progress changed since the version the client based its update on"""
+
+    def __init__(self, progress):
+        super().__init__(f"Progress is at version {progress.version}")
+        self.progress = progress
+
+
+def _empty(progress, catalog):
+    progress.answers = bytes(len(catalog.ids))
+    progress.score_state = b''
+    progress.layout = catalog.fingerprint
+
+
+def load_progress(assessment, catalog=None):
+    """
+    Progress of an incomplete assessment, created on first use.
+
+    Answers saved in the old results_data format are converted once. If the
+    question set changed since the last save, which only happens to
+    assessments not pinned to a questionnaire version, the positions are
+    meaningless, so the progress starts over under a new version.
+    """
+    if catalog is None:
+        catalog = catalog_for(assessment)
+    try:
+        progress = assessment.progress
+    except AssessmentProgress.DoesNotExist:
+        progress = AssessmentProgress(assessment=assessment)
+        _empty(progress, catalog)
+        legacy = [
+            answer for answer in (assessment.results_data or {}).get('progress') or []
+            if answer.get('question_id') in catalog.index
+        ]
+        try:
+            with transaction.atomic():
+                if legacy:
+                    _apply(progress, catalog, legacy)
+                    assessment.results_data = None
+                    assessment.save(update_fields=['results_data', 'updated_at'])
+                progress.save()
+        except IntegrityError:
+            # Created by a concurrent save
+            progress = AssessmentProgress.objects.get(assessment=assessment)
+        return progress
+
+    if progress.layout != catalog.fingerprint:
+        _empty(progress, catalog)
+        progress.version += 1
+        progress.save()
+    return progress
+
+
+def _apply(progress, catalog, changes):
+    """Fold answer changes into the packed answers and running scores in place"""
+    answers = bytearray(progress.answers)
+    scorer = IncrementalScorer.from_bytes(progress.score_state)
+    for change in changes:
+        position = catalog.index[change['question_id']]
+        value = int(change['answer'] or 0)
+        if not 0 <= value <= 5:
+            raise ValueError("Answers must be between 1 and 5")
+        old = answers[position]
+        if old == value:
+            continue
+        correlation = catalog.correlations[position]
+        if old and value:
+            scorer.replace(old, correlation, value, correlation)
+        elif value:
+            scorer.add(value, correlation)
+        else:
+            scorer.remove(old, correlation)
+        answers[position] = value
+    progress.answers = bytes(answers)
+    progress.score_state = scorer.to_bytes()
+
+
+def save_changes(assessment, changes, version=None):
+    """
+    Apply changed answers ({question_id, answer}; answer 0 or None clears it).
+
+    Raises ProgressConflict when `version` is given and is not the current
+    one, or when another save lands first. Raises KeyError or ValueError for
+    unknown questions or invalid answers.
+    """
+    catalog = catalog_for(assessment)
+    progress = load_progress(assessment, catalog)
+    if version is not None and int(version) != progress.version:
+        raise ProgressConflict(progress)
+
+    based_on = progress.version
+    _apply(progress, catalog, changes)
+    updated = AssessmentProgress.objects.filter(pk=progress.pk, version=based_on).update(
+        answers=progress.answers,
+        score_state=progress.score_state,
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        progress.refresh_from_db()
+        raise ProgressConflict(progress)
+    progress.version = based_on + 1
+    return progress
+
+
+def save_all(assessment, current_answers, version=None):
+    """Replace the whole answer set; questions missing from it are cleared"""
+    answers = {answer['question_id']: answer['answer'] for answer in current_answers}
+    catalog = catalog_for(assessment)
+    changes = [
+        {'question_id': question_id, 'answer': answers.pop(question_id, 0)}
+        for question_id in catalog.ids
+    ]
+    if answers:
+        raise KeyError(next(iter(answers)))
+    return save_changes(assessment, changes, version)
+
+
+def progress_payload(progress, catalog=None):
+    """Saved answers in the submission format, with the version to send back"""
+    if catalog is None:
+        catalog = catalog_for(progress.assessment)
+    return {
+        'version': progress.version,
+        'answered': progress.answered,
+        'answers': [
+            {
+                'question_id': catalog.ids[position],
+                'answer': value,
+                'gift_correlation': catalog.correlations[position]
+            }
+            for position, value in enumerate(bytes(progress.answers))
+            if value
+        ]
+    }
+
+
+def progress_results(progress, provisional=True):
+    """Results for the answers saved so far, from the running scores"""
+    scorer = IncrementalScorer.from_bytes(progress.score_state)
+    calculator = GiftCalculator()
+    scores = scorer.scores()
+    primary_gift, secondary_gifts = calculator.identify_gifts(scores)
+    if provisional:
+        return {
+            'scores': scores,
+            'primary_gift': primary_gift,
+            'secondary_gifts': secondary_gifts,
+            'answered': scorer.answered,
+            'version': progress.version,
+            'provisional': True
+        }
+    return {
+        'scores': scores,
+        'primary_gift': primary_gift,
+        'secondary_gifts': secondary_gifts,
+        'descriptions': calculator.get_gift_descriptions(primary_gift, secondary_gifts),
+        'recommended_roles': {
+            'primary_roles': [],
+            'secondary_roles': [],
+            'ministry_areas': []
+        }
+    }
@@ -0,0 +1,137 @@
+"""
+Re-scoring of stored gift profiles after question correlations change.
+
+Every profile records the answers it was scored from and the fingerprint
+of the question set used (``questionnaire_version``). ``rescore`` walks
+the profiles whose fingerprint differs from the current catalog's in id
+order, scores each batch with the current catalog's compiled matrix,
+optionally in a process pool, and writes the batch back with one
+``bulk_update`` per transaction. A re-scored profile carries the current
+fingerprint, so an interrupted run simply continues where it stopped when
+started again.
+
+Profiles from before answers were stored fall back to the answers kept in
+their assessment's ``results_data``, which are then stored on the profile.
+Answers to questions that no longer exist are ignored; profiles with no
+answers to current questions are left as they are.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from django.db import transaction
+from books import recommendations
+from core.tasks import enqueue
+from scoring.calculator import GIFT_NAMES, pack_answers, pack_scores
+from . import calibration, similarity
+from .catalog import get_catalog
+from .models import GiftProfile
+from .services import stored_answers
+
+BATCH_SIZE = 500
+UPDATE_FIELDS = ['score_vector', 'primary_gift', 'secondary_gifts', 'answers', 'questionnaire_version']
+
+
+def score_batch(compiled, rows, threshold_factor=calibration.BASELINE_FACTOR):
+    """
+    Score (profile id, [(question id, answer)]) rows with a CompiledQuestionnaire.
+
+    Assigns gifts like identify_gifts without touching the database, so
+    batches can run in worker processes. Returns (profile id, scores,
+    primary, secondary) rows, with None scores for profiles with no
+    answers to score.
+    """
+    scored = []
+    for profile_id, answers in rows:
+        scorer = compiled.scorer(answers)
+        if not scorer.answered:
+            scored.append((profile_id, None, None, None))
+            continue
+        scores = scorer.scores()
+        primary, secondary = calibration.assign(scores, threshold_factor)
+        scored.append((profile_id, scores, GIFT_NAMES[primary], [GIFT_NAMES[gift] for gift in secondary]))
+    return scored
+
+
+def _batches(fingerprint, batch_size):
+    """Pending profiles in id order, a batch at a time: {id: (primary, secondary, answers)}"""
+    last_id = 0
+    while True:
+        rows = list(
+            GiftProfile.objects.exclude(questionnaire_version=fingerprint).filter(id__gt=last_id)
+            .order_by('id').values_list(
+                'id', 'primary_gift', 'secondary_gifts', 'answers', 'assessment__results_data'
+            )[:batch_size]
+        )
+        if not rows:
+            return
+        yield {
+            profile_id: (primary, secondary, stored_answers(blob, results_data))
+            for profile_id, primary, secondary, blob, results_data in rows
+        }
+        last_id = rows[-1][0]
+
+
+def _write(batch, scored, fingerprint, counts):
+    profiles, changed = [], []
+    for profile_id, scores, primary, secondary in scored:
+        if scores is None:
+            counts['skipped'] += 1
+            continue
+        old_primary, old_secondary, answers = batch[profile_id]
+        profiles.append(GiftProfile(
+            id=profile_id,
+            score_vector=pack_scores(scores),
+            primary_gift=primary,
+            secondary_gifts=secondary,
+            answers=pack_answers({'question_id': q, 'answer': a} for q, a in answers),
+            questionnaire_version=fingerprint,
+        ))
+        if (primary, secondary) != (old_primary, old_secondary):
+            changed.append(profile_id)
+    with transaction.atomic():
+        GiftProfile.objects.bulk_update(profiles, UPDATE_FIELDS)
+        for profile_id in changed:
+            # Skipped by the task unless it is still the user's latest profile
+            enqueue('assessments.grant_book_access', {'gift_profile_id': profile_id})
+    counts['rescored'] += len(profiles)
+    counts['changed'] += len(changed)
+
+
+def rescore(workers=1, batch_size=BATCH_SIZE, threshold_factor=calibration.BASELINE_FACTOR):
+    """
+    Re-score every profile not scored with the current question set.
+
+    Returns counts of profiles re-scored, of those whose gifts changed and
+    of those skipped for lack of answers.
+    """
+    catalog = get_catalog()
+    fingerprint = catalog.fingerprint
+    counts = {'rescored': 0, 'changed': 0, 'skipped': 0}
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(workers)
+        running = deque()
+        try:
+            for batch in _batches(fingerprint, batch_size):
+                rows = [(profile_id, answers) for profile_id, (_, _, answers) in batch.items()]
+                running.append((batch, executor.submit(score_batch, catalog.compiled, rows, threshold_factor)))
+                # Bounded read-ahead keeps every worker busy without loading everything
+                while len(running) > 2 * workers:
+                    done, future = running.popleft()
+                    _write(done, future.result(), fingerprint, counts)
+            while running:
+                done, future = running.popleft()
+                _write(done, future.result(), fingerprint, counts)
+        finally:
+            executor.shutdown(cancel_futures=True)
+    else:
+        for batch in _batches(fingerprint, batch_size):
+            rows = [(profile_id, answers) for profile_id, (_, _, answers) in batch.items()]
+            _write(batch, score_batch(catalog.compiled, rows, threshold_factor), fingerprint, counts)
+
+    if counts['rescored']:
+        # Bulk updates send no signals
+        similarity.invalidate()
+        recommendations.invalidate()
+        enqueue('analytics.rebuild_rollups')
+    return counts
@@ -21,7 +21,15 @@ class AssessmentSerializer(serializers.ModelSerializer):
         model = Assessment
         fields = ('id', 'user', 'title', 'description', 'timestamp', 'created_at', 'updated_at',
                  'completion_status', 'results_data', 'gift_profile', 'can_retake', 
-                 'counselor_id', 'counselor_notes', 'is_counselor_session', 'session_date')
+                 'counselor_id', 'counselor_notes', 'is_counselor_session', 'session_date',
+                 'questionnaire_version', 'adaptive')
+        read_only_fields = ('questionnaire_version',)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Completed assessments store compact results; expose the full shape
+        data['results_data'] = instance.results
+        return data
 
 class AssessmentProgressSerializer(serializers.Serializer):
     timestamp = serializers.DateTimeField()
@@ -0,0 +1,187 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from core.tasks import enqueue
+from scoring.calculator import pack_answers, unpack_answers
+from . import catalog as question_catalog
+from .catalog import current_version, get_catalog
+from .models import Assessment, GiftProfile, Question
+
+
+def format_scoring_payload(user_id, answers, catalog=None):
+    """
+    Shape submitted answers the way the FastAPI scoring service expects.
+
+    Weights of catalog questions come from the catalog (the current one
+    unless an assessment's is given) rather than the request; answers to
+    questions it does not know keep their own. The version lets the
+    service reuse its compiled copy of the catalog, so it is only sent
+    when every answer belongs to the catalog; other payloads are scored
+    from their own weights, uncached.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    in_catalog = all(answer['question_id'] in catalog.index for answer in answers)
+    return {
+        'user_id': user_id,
+        'questionnaire_version': catalog.fingerprint if in_catalog else None,
+        'answers': [
+            {
+                'question_id': answer['question_id'],
+                'answer': int(answer['answer']),
+                'gift_correlation': {
+                    k.upper(): float(v)
+                    for k, v in (
+                        catalog.correlation(answer['question_id'])
+                        if answer['question_id'] in catalog.index
+                        else answer['gift_correlation']
+                    ).items()
+                }
+            }
+            for answer in answers
+        ]
+    }
+
+
+def stored_answers(blob, results_data):
+    """
+    (question id, answer) pairs a profile was scored from.
+
+    Reads the profile's packed `answers`; profiles from before those were
+    stored fall back to the answers kept in their assessment's results_data.
+    """
+    if blob:
+        return unpack_answers(blob)
+    legacy = results_data.get('answers') if isinstance(results_data, dict) else None
+    answers = []
+    for answer in legacy or []:
+        try:
+            answers.append((int(answer['question_id']), int(answer['answer'])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return answers
+
+
+def save_submission(user, results, assessment=None, counselor=None, counselor_notes='', answers=None):
+    """
+    Store scored results as a completed assessment with its gift profile.
+
+    Creates a new assessment for `user` unless an existing one is given. The
+    assessment, profile and follow-up tasks (book access, analytics rollups,
+    notification) are written in one transaction, one row each; the tasks run
+    after the response. Scores, gifts and descriptions live only on the
+    profile (see Assessment.results), next to the `answers` they were
+    calculated from and the questionnaire version, for re-scoring.
+    """
+    results_data = Assessment.compact_results(results)
+    with transaction.atomic():
+        if assessment is None:
+            assessment = Assessment.objects.create(
+                user=user,
+                completion_status=True,
+                results_data=results_data,
+                questionnaire_version=current_version()
+            )
+        else:
+            if not assessment.questionnaire_version:
+                assessment.questionnaire_version = current_version()
+            if counselor is not None:
+                assessment.counselor_notes = counselor_notes
+                assessment.session_date = timezone.now()
+                assessment.is_counselor_session = True
+                assessment.counselor = counselor
+            assessment.results_data = results_data
+            assessment.completion_status = True
+            assessment.save()
+
+        gift_profile = GiftProfile.objects.create(
+            user=user,
+            assessment=assessment,
+            primary_gift=results['primary_gift'],
+            secondary_gifts=results['secondary_gifts'],
+            scores=results['scores'],
+            answers=pack_answers(answers or []),
+            questionnaire_version=assessment.questionnaire_version
+        )
+
+        # The profile is new, so this task cannot be a duplicate; no key needed
+        enqueue('assessments.grant_book_access', {'gift_profile_id': gift_profile.id})
+        # Counts every profile past the rollup watermark, so duplicates are harmless
+        enqueue('analytics.update_rollups')
+        if settings.ASSESSMENT_COMPLETION_EMAILS:
+            enqueue(
+                'assessments.notify_completion',
+                {'assessment_id': assessment.id},
+                idempotency_key=f'notify-completion:{gift_profile.id}',
+            )
+
+    return assessment, gift_profile
+
+
+QUESTION_FIELDS = ('category', 'weight', 'gift_correlation', 'options')
+
+
+def _question_spec(spec, position):
+    try:
+        question = {
+            'text': spec['text'].strip(),
+            'category': spec['category'],
+            'weight': float(spec.get('weight', 1.0)),
+            'gift_correlation': {k: float(v) for k, v in spec['gift_correlation'].items()},
+        }
+        # Options set by an admin are only replaced by a spec that has its own
+        if 'options' in spec:
+            question['options'] = spec['options']
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise ValueError(f"Question {position + 1} is invalid: {e!r}")
+    if not question['text']:
+        raise ValueError(f"Question {position + 1} has no text")
+    return question
+
+
+def upsert_questions(specs, dry_run=False):
+    """
+    Make the stored questions match `specs`, matched by their text.
+
+    Existing questions are read in one query and compared field by field;
+    only new and changed ones are written, with one bulk insert and one bulk
+    update in a single transaction. Questions not in `specs` are left alone.
+    Returns the texts created and updated and the number unchanged.
+    """
+    wanted = {}
+    for position, spec in enumerate(specs):
+        question = _question_spec(spec, position)
+        if question['text'] in wanted:
+            raise ValueError(f"Duplicate question text: {question['text'][:70]}")
+        wanted[question['text']] = question
+
+    # The whole (small) table in one query; no parameter limits on big sets
+    existing = {}
+    for question in Question.objects.order_by('-id'):
+        # If a text is stored twice, the oldest row is the one kept in sync
+        existing[question.text] = question
+
+    to_create, to_update = [], []
+    for text, fields in wanted.items():
+        question = existing.get(text)
+        if question is None:
+            to_create.append(Question(**fields))
+        else:
+            names = [name for name in QUESTION_FIELDS if name in fields]
+            if any(getattr(question, name) != fields[name] for name in names):
+                for name in names:
+                    setattr(question, name, fields[name])
+                to_update.append(question)
+
+    if not dry_run and (to_create or to_update):
+        with transaction.atomic():
+            Question.objects.bulk_create(to_create, batch_size=500)
+            Question.objects.bulk_update(to_update, QUESTION_FIELDS, batch_size=500)
+            # Bulk writes send no signals
+            question_catalog.invalidate()
+
+    return {
+        'created': [question.text for question in to_create],
+        'updated': [question.text for question in to_update],
+        'unchanged': len(wanted) - len(to_create) - len(to_update),
+    }
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import catalog, similarity
+from .models import GiftProfile, Question
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_catalog(sender, **kwargs):
+    catalog.invalidate()
+
+
+@receiver(post_save, sender=GiftProfile)
+def add_to_similarity_index(sender, created, **kwargs):
+    if created:
+        similarity.profile_added()
+
+
+@receiver(post_delete, sender=GiftProfile)
+def reload_similarity_index(sender, **kwargs):
+    similarity.invalidate()
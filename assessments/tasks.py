@@ -0,0 +1,37 @@
+import logging
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from books.services import BookAccessService
+from core.tasks import task
+from .models import Assessment, GiftProfile
+
+logger = logging.getLogger(__name__)
+
+
+@task('assessments.grant_book_access')
+def grant_book_access(gift_profile_id):
+    """Grant the books for a new gift profile, unless a newer profile superseded it"""
+    gift_profile = GiftProfile.objects.select_related('user').get(pk=gift_profile_id)
+    latest = GiftProfile.objects.filter(user=gift_profile.user).order_by('-timestamp', '-id').first()
+    if latest.pk != gift_profile.pk:
+        logger.info(f"Skipping book access for superseded gift profile {gift_profile_id}")
+        return
+    # Access is revoked and re-granted; a failure must not leave the user with none
+    with transaction.atomic():
+        BookAccessService.grant_gift_based_access(gift_profile.user, gift_profile)
+
+
+@task('assessments.notify_completion')
+def notify_completion(assessment_id):
+    """Email the user that their assessment results are ready"""
+    assessment = Assessment.objects.select_related('user').get(pk=assessment_id)
+    if not assessment.user.email:
+        return
+    send_mail(
+        'Your Pathfinders assessment results are ready',
+        f"Hi {assessment.user.first_name or assessment.user.username},\n\n"
+        f"Your gift assessment is complete. View your results at {settings.FRONTEND_URL}/dashboard.\n",
+        settings.DEFAULT_FROM_EMAIL,
+        [assessment.user.email],
+    )
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from assessments import adaptive
+from assessments.catalog import get_catalog
+from scoring.calculator import GIFT_ORDER, IncrementalScorer
+from assessments.models import Assessment, GiftProfile, Question
+
+User = get_user_model()
+
+# How strongly the simulated user agrees with each gift's questions
+PREFERENCES = {'TEACHING': 5, 'GIVING': 4, 'SERVICE': 3}
+
+
+class AdaptiveAssessmentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', email='s@example.com', password='pw')
+        self.questions = {}
+        for i in range(6):
+            for j, gift in enumerate(GIFT_ORDER):
+                question = Question.objects.create(
+                    category=gift, text=f'{gift} {i}',
+                    gift_correlation={gift: 1.0, GIFT_ORDER[(j + 1) % len(GIFT_ORDER)]: 0.3}
+                )
+                self.questions[question.id] = gift
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def start(self, adaptive_mode=True):
+        response = self.client.post(
+            reverse('assessment-list'), {'user': self.user.id, 'adaptive': adaptive_mode}, format='json'
+        )
+        return Assessment.objects.get(pk=response.json()['id'])
+
+    def answer(self, question_id, version):
+        value = PREFERENCES.get(self.questions[question_id], 1)
+        return self.client.post(reverse('assessment-save-progress'), {
+            'changes': [{'question_id': question_id, 'answer': value}], 'version': version
+        }, format='json').json()['version']
+
+    def test_stops_once_the_gifts_are_settled(self):
+        self.start()
+        self.assertEqual(self.client.post(reverse('assessment-submit'), {}, format='json').status_code, 400)
+
+        version = 0
+        while True:
+            step = self.client.get(reverse('assessment-next-question')).json()
+            if step['question'] is None:
+                break
+            version = self.answer(step['question']['id'], step['version'])
+        self.assertTrue(step['stable'])
+        self.assertEqual(step['leading_gifts'], ['TEACHING', 'GIVING', 'SERVICE'])
+        self.assertLess(step['answered'], len(self.questions) * 2 // 3)
+
+        response = self.client.post(reverse('assessment-submit'), {}, format='json')
+        self.assertEqual(response.status_code, 200)
+        profile = GiftProfile.objects.get(user=self.user)
+        self.assertEqual((profile.primary_gift, profile.secondary_gifts), ('Teaching', ['Giving']))
+        self.assertEqual(len(bytes(profile.answers)), 5 * step['answered'])
+
+    def test_full_assessments_need_every_answer(self):
+        self.start(adaptive_mode=False)
+        self.assertEqual(self.client.get(reverse('assessment-next-question')).status_code, 400)
+        version = 0
+        for question_id in list(self.questions)[:30]:
+            version = self.answer(question_id, version)
+        self.assertEqual(self.client.post(reverse('assessment-submit'), {}, format='json').status_code, 400)
+
+    def test_forecast_of_a_finished_questionnaire(self):
+        catalog = get_catalog()
+        answers = bytes(PREFERENCES.get(self.questions[question_id], 1) for question_id in catalog.ids)
+        scorer = IncrementalScorer()
+        for value, correlation in zip(answers, catalog.correlations):
+            scorer.add(value, correlation)
+        outlook = adaptive.Forecast(catalog, answers, scorer.to_bytes())
+        self.assertTrue(outlook.stable)
+        self.assertIsNone(outlook.next_position())
+        self.assertIsNone(outlook.summary()['confidence'])
@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from assessments.models import Assessment, GiftProfile
+from core.models import Task
+
+User = get_user_model()
+
+RESULTS = {
+    'scores': {'TEACHING': 0.2, 'GIVING': 0.18},
+    'primary_gift': 'Teaching',
+    'secondary_gifts': ['Giving'],
+    'descriptions': {},
+}
+
+ANSWERS = [{'question_id': 1, 'answer': 4, 'gift_correlation': {'teacher': 1.0}}]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AsyncSubmitTests(TransactionTestCase):
+    """The async views write from executor threads, so tests need committed data"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'student{i}', email=f'student{i}@example.com', password='testpass123'
+            )
+            for i in range(3)
+        ]
+        self.tokens = [Token.objects.create(user=user).key for user in self.users]
+        self.client = AsyncClient()
+
+    def post(self, url, token, answers=ANSWERS):
+        return self.client.post(
+            url, {'answers': answers}, content_type='application/json',
+            headers={'Authorization': f'Token {token}'},
+        )
+
+    async def test_submit_creates_assessment_and_profile(self):
+        with patch('core.services.FastAPIClient.calculate_gifts', return_value=RESULTS) as scored:
+            response = await self.post(reverse('assessment-submit-async'), self.tokens[0])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['primary_gift'], 'Teaching')
+        payload = scored.call_args.args[0]
+        self.assertEqual(payload['answers'][0]['gift_correlation'], {'TEACHER': 1.0})
+        profile = await GiftProfile.objects.select_related('assessment').aget(user=self.users[0])
+        self.assertTrue(profile.assessment.completion_status)
+        # Book access is granted by a task, run eagerly after commit here
+        grant = await Task.objects.aget(name='assessments.grant_book_access', payload__gift_profile_id=profile.pk)
+        self.assertEqual(grant.status, Task.DONE)
+
+    async def test_requires_authentication(self):
+        response = await self.client.post(
+            reverse('assessment-submit-async'), {'answers': ANSWERS}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_submissions_are_scored_concurrently(self):
+        in_flight = peak = 0
+
+        async def slow_scoring(data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return RESULTS
+
+        with patch('core.services.FastAPIClient.calculate_gifts', side_effect=slow_scoring):
+            responses = await asyncio.gather(*(
+                self.post(reverse('assessment-submit-async'), token) for token in self.tokens
+            ))
+
+        self.assertEqual([r.status_code for r in responses], [200, 200, 200])
+        self.assertEqual(peak, 3)
+        self.assertEqual(await Assessment.objects.filter(completion_status=True).acount(), 3)
+
+    async def test_submit_existing_assessment(self):
+        assessment = await Assessment.objects.acreate(user=self.users[0])
+        other = await Assessment.objects.acreate(user=self.users[1])
+        url = reverse('assessment-submit-assessment', args=[assessment.pk])
+
+        with patch('core.services.FastAPIClient.calculate_gifts', return_value=RESULTS):
+            response = await self.post(url, self.tokens[0])
+            forbidden = await self.post(
+                reverse('assessment-submit-assessment', args=[other.pk]), self.tokens[0]
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['assessment_id'], assessment.pk)
+        await assessment.arefresh_from_db()
+        self.assertTrue(assessment.completion_status)
+        self.assertEqual(forbidden.status_code, 404)
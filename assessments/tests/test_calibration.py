@@ -0,0 +1,85 @@
+import contextlib
+import random
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from assessments import calibration
+from scoring.calculator import GIFT_ORDER, GiftCalculator
+from assessments.models import Assessment, GiftProfile, Question
+
+User = get_user_model()
+
+
+def random_scores(generator):
+    # Two decimals make ties, including at the threshold, common
+    raw = [generator.randint(1, 20) for _ in GIFT_ORDER]
+    return {gift: round(value / sum(raw), 2) for gift, value in zip(GIFT_ORDER, raw)}
+
+
+class SimulationTests(SimpleTestCase):
+    def test_matches_identify_gifts(self):
+        calculator = GiftCalculator()
+        names = {
+            details['name'].split('(')[0].strip(): gift
+            for gift, details in GiftCalculator.MOTIVATIONAL_GIFTS.items()
+        }
+        generator = random.Random(7)
+        profiles = [random_scores(generator) for _ in range(300)]
+        factors = (0.6, 0.8, 0.95)
+        report = calibration.simulate(profiles, factors)
+
+        for row, factor in zip(report['factors'], factors):
+            expected = dict.fromkeys(GIFT_ORDER, 0)
+            two_secondary = 0
+            for scores in profiles:
+                with contextlib.redirect_stdout(StringIO()):
+                    primary, secondary = calculator.identify_gifts(scores, threshold_factor=factor)
+                secondary = [names[name] for name in secondary]
+                self.assertEqual(calibration.assign(scores, factor), (names[primary], secondary))
+                two_secondary += len(secondary) == 2
+                for gift in secondary:
+                    expected[gift] += 1
+            self.assertEqual(row['secondary_gifts'], expected)
+            self.assertEqual(row['two_secondary'], two_secondary)
+
+    def test_changes_are_counted_against_the_baseline(self):
+        generator = random.Random(3)
+        profiles = [random_scores(generator) for _ in range(200)]
+        report = calibration.simulate(profiles, (0.7, 0.8, 0.9), baseline=0.8)
+        for row in report['factors']:
+            changed = sum(
+                calibration.assign(scores, row['factor']) != calibration.assign(scores, 0.8)
+                for scores in profiles
+            )
+            self.assertEqual(row['changed'], changed)
+        self.assertEqual(sum(report['primary_gifts'].values()), 200)
+
+
+class SimulateThresholdsCommandTests(TestCase):
+    def test_stored_profiles(self):
+        user = User.objects.create_user(username='student', email='s@example.com', password='pw')
+        for third in (0.2, 0.15):
+            rest = round((1 - 0.4 - 0.25 - third) / 4, 4)
+            scores = dict.fromkeys(GIFT_ORDER, rest)
+            scores.update({'TEACHING': 0.4, 'GIVING': 0.25, 'SERVICE': third})
+            GiftProfile.objects.create(
+                user=user, assessment=Assessment.objects.create(user=user), primary_gift='TEACHING',
+                secondary_gifts=[], scores=scores
+            )
+        out = StringIO()
+        call_command('simulate_thresholds', '--factors', '0.35,0.5', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn('2 profiles', lines[0])
+        # At 0.35 both add SERVICE as a third gift, at 0.5 only the first, at 0.8 neither
+        self.assertEqual(lines[3].split()[:3], ['0.35', '2', '2'])
+        self.assertEqual(lines[4].split()[:3], ['0.50', '1', '1'])
+
+    def test_synthetic_answers(self):
+        with self.assertRaises(CommandError):
+            call_command('simulate_thresholds', synthetic=5, stdout=StringIO())
+        for gift in GIFT_ORDER:
+            Question.objects.create(category=gift, text=gift, gift_correlation={gift: 1.0})
+        out = StringIO()
+        call_command('simulate_thresholds', synthetic=50, seed=1, json=True, stdout=out)
+        self.assertIn('"profiles": 50', out.getvalue())
@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from assessments.catalog import get_catalog
+from assessments.models import Assessment, Question
+
+User = get_user_model()
+
+
+class QuestionCatalogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student', email='student@example.com', password='testpass123'
+        )
+        self.question = Question.objects.create(
+            category='Teaching', text='I enjoy research.', gift_correlation={'TEACHING': 1.0}
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_all_is_served_from_the_catalog_with_an_etag(self):
+        url = reverse('question-list-all')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([q['id'] for q in response.json()], [self.question.id])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_question_edits_invalidate_the_catalog(self):
+        before = get_catalog()
+        self.question.gift_correlation = {'TEACHING': 0.5}
+        self.question.save()
+        after = get_catalog()
+        self.assertNotEqual(before.etag, after.etag)
+        self.assertEqual(after.correlation(self.question.id), {'TEACHING': 0.5})
+
+    def test_validation_uses_the_catalog(self):
+        get_catalog()
+        assessment = Assessment(user=self.user)
+        with self.assertNumQueries(0):
+            assessment.validate_answers([{'question_id': self.question.id, 'answer': 3}])
+            with self.assertRaises(ValueError):
+                assessment.validate_answers([])
@@ -0,0 +1,89 @@
+import csv
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import skipIf
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from assessments import export
+from scoring.calculator import GIFT_ORDER
+from assessments.models import Assessment
+from assessments.services import save_submission
+
+User = get_user_model()
+
+
+def results(primary):
+    """Results shaped like the scoring service's GiftResult, which has no answers"""
+    return {
+        'scores': {gift: 0.4 if gift == primary else 0.1 for gift in GIFT_ORDER},
+        'primary_gift': primary,
+        'secondary_gifts': ['TEACHING', 'GIVING'],
+        'descriptions': {'primary': {}, 'secondary': []},
+        'recommended_roles': None,
+    }
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output)
+        self.user = User.objects.create_user(username='student', email='s@example.com', password='pw')
+
+    def run_export(self, **options):
+        call_command('export_assessments', output=self.output, format='csv', stdout=StringIO(), **options)
+        return export.read_watermark(self.output)
+
+    def read(self, watermark, table):
+        name = next(f for f in watermark['files'] if f.startswith(table))
+        with open(os.path.join(self.output, name), newline='') as f:
+            return list(csv.DictReader(f))
+
+    def test_flattens_scores_and_answers(self):
+        answers = [{'question_id': i + 1, 'answer': answer} for i, answer in enumerate([5, 3, 1])]
+        _, profile = save_submission(self.user, results('SERVICE'), answers=answers)
+        watermark = self.run_export()
+
+        [row] = self.read(watermark, 'gift_profiles')
+        self.assertEqual(int(row['id']), profile.id)
+        self.assertEqual(float(row['score_service']), 0.4)
+        self.assertEqual(float(row['score_compassion']), 0.1)
+        self.assertEqual(row['secondary_gifts'], 'TEACHING,GIVING')
+        self.assertEqual(len(self.read(watermark, 'assessments')), 1)
+        self.assertEqual(
+            [(r['question_id'], r['answer']) for r in self.read(watermark, 'answers')],
+            [('1', '5'), ('2', '3'), ('3', '1')]
+        )
+
+    def test_legacy_answers_come_from_results_data(self):
+        assessment = Assessment.objects.create(
+            user=self.user, completion_status=True,
+            results_data={'answers': [{'question_id': 7, 'answer': 4}, {'question_id': 'x', 'answer': 1}]}
+        )
+        watermark = self.run_export()
+        self.assertEqual(
+            [(r['assessment_id'], r['question_id'], r['answer']) for r in self.read(watermark, 'answers')],
+            [(str(assessment.id), '7', '4')]
+        )
+
+    def test_exports_only_what_changed_since_the_watermark(self):
+        save_submission(self.user, results('SERVICE'))
+        first = self.run_export()
+        self.assertEqual(len(self.read(first, 'gift_profiles')), 1)
+
+        _, newer = save_submission(self.user, results('GIVING'))
+        second = self.run_export(chunk_size=1)
+        self.assertEqual([int(r['id']) for r in self.read(second, 'gift_profiles')], [newer.id])
+        self.assertEqual(second['last_profile_id'], newer.id)
+
+        third = self.run_export()
+        self.assertEqual(self.read(third, 'gift_profiles'), [])
+        self.assertEqual(len(self.read(self.run_export(full=True), 'gift_profiles')), 2)
+
+    @skipIf(export.pyarrow is not None, 'pyarrow is installed')
+    def test_columnar_formats_need_pyarrow(self):
+        with self.assertRaises(CommandError):
+            call_command('export_assessments', output=self.output, format='parquet', stdout=StringIO())
+        self.assertEqual(os.listdir(self.output), [])
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from assessments.models import Question
+
+
+def load(*args):
+    out = StringIO()
+    call_command('load_questions', *args, stdout=out)
+    return out.getvalue()
+
+
+class LoadQuestionsTests(TestCase):
+    def write(self, questions):
+        f = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        self.addCleanup(os.remove, f.name)
+        self.addCleanup(f.close)
+        json.dump({'questions': questions}, f)
+        f.flush()
+        return f.name
+
+    def test_builtin_set_loads_once_then_writes_nothing(self):
+        output = load()
+        count = Question.objects.count()
+        self.assertIn(f'{count} created, 0 updated, 0 unchanged', output)
+
+        with self.assertNumQueries(1):
+            output = load()
+        self.assertIn(f'0 created, 0 updated, {count} unchanged', output)
+
+    def test_json_file_creates_and_updates_changed_questions(self):
+        questions = [
+            {'category': 'Teaching', 'text': 'I enjoy research.', 'gift_correlation': {'TEACHING': 1.0}},
+            {'category': 'Giving', 'text': 'I like to give.', 'gift_correlation': {'GIVING': 1.0}},
+        ]
+        load('--file', self.write(questions))
+        questions[1]['gift_correlation'] = {'GIVING': 1.0, 'SERVICE': 0.3}
+        questions.append({'category': 'Service', 'text': 'I like to help.', 'gift_correlation': {'SERVICE': 1}})
+
+        output = load('--file', self.write(questions))
+        self.assertIn('1 created, 1 updated, 1 unchanged', output)
+        self.assertEqual(
+            Question.objects.get(text='I like to give.').gift_correlation,
+            {'GIVING': 1.0, 'SERVICE': 0.3}
+        )
+
+    def test_options_are_kept_unless_the_spec_has_its_own(self):
+        question = {'category': 'Teaching', 'text': 'I enjoy research.', 'gift_correlation': {'TEACHING': 1.0}}
+        path = self.write([question])
+        load('--file', path)
+        Question.objects.update(options=['Never', 'Always'])
+
+        self.assertIn('0 created, 0 updated, 1 unchanged', load('--file', path))
+        self.assertEqual(Question.objects.get().options, ['Never', 'Always'])
+
+        load('--file', self.write([dict(question, options=['No', 'Yes'])]))
+        self.assertEqual(Question.objects.get().options, ['No', 'Yes'])
+
+    def test_dry_run_writes_nothing(self):
+        output = load('--dry-run')
+        self.assertIn('DRY RUN', output)
+        self.assertFalse(Question.objects.exists())
+
+    def test_invalid_questions_are_rejected(self):
+        path = self.write([{'category': 'Teaching', 'text': 'No weights'}])
+        with self.assertRaises(CommandError):
+            load('--file', path)
@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from scoring.calculator import GIFT_ORDER, GiftCalculator
+from assessments.models import Assessment, AssessmentProgress, GiftProfile, Question
+
+User = get_user_model()
+
+
+def answer(question, value):
+    return {'question_id': question.id, 'answer': value, 'gift_correlation': question.gift_correlation}
+
+
+class IncrementalProgressTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student', email='student@example.com', password='testpass123'
+        )
+        self.questions = [
+            Question.objects.create(
+                category=gift, text=f'Question {i}',
+                gift_correlation={gift: 1.0, GIFT_ORDER[(i + 1) % len(GIFT_ORDER)]: 0.5}
+            )
+            for i, gift in enumerate(GIFT_ORDER)
+        ]
+        self.assessment = Assessment.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def save(self, answers):
+        return self.client.post(
+            reverse('assessment-save-progress'), {'current_answers': answers}, format='json'
+        )
+
+    def test_running_scores_match_full_recalculation(self):
+        answers = [answer(q, 1 + i % 5) for i, q in enumerate(self.questions[:4])]
+        self.save(answers)
+        # Change one answer, drop another
+        answers[1] = answer(self.questions[1], 5)
+        del answers[2]
+        response = self.save(answers)
+        self.assertEqual(response.json()['answered'], 3)
+
+        profile = self.client.get(reverse('assessment-provisional-profile')).json()
+        self.assertTrue(profile['provisional'])
+        self.assertEqual(profile['scores'], GiftCalculator().calculate_scores(answers))
+
+    def test_submit_finalizes_saved_progress(self):
+        answers = [answer(q, 1 + i % 5) for i, q in enumerate(self.questions)]
+        self.save(answers[:-1])
+        response = self.client.post(reverse('assessment-submit'), {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.save(answers)
+        response = self.client.post(reverse('assessment-submit'), {}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['scores'], GiftCalculator().calculate_scores(answers))
+        self.assessment.refresh_from_db()
+        self.assertTrue(self.assessment.completion_status)
+        self.assertEqual(GiftProfile.objects.get(assessment=self.assessment).scores, response.json()['scores'])
+
+    def test_changes_apply_against_current_version(self):
+        first = self.save([answer(self.questions[0], 3)]).json()
+        url = reverse('assessment-save-progress')
+        response = self.client.post(url, {
+            'version': first['version'],
+            'changes': [{'question_id': self.questions[1].id, 'answer': 4},
+                        {'question_id': self.questions[0].id, 'answer': None}]
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], first['version'] + 1)
+
+        progress = self.client.get(reverse('assessment-get-progress')).json()
+        self.assertEqual(progress['version'], first['version'] + 1)
+        self.assertEqual(
+            [(a['question_id'], a['answer']) for a in progress['answers']],
+            [(self.questions[1].id, 4)]
+        )
+
+    def test_stale_version_is_rejected_with_current_progress(self):
+        first = self.save([answer(self.questions[0], 3)]).json()
+        self.save([answer(self.questions[0], 5)])
+        response = self.client.post(reverse('assessment-save-progress'), {
+            'version': first['version'],
+            'changes': [{'question_id': self.questions[0].id, 'answer': 1}]
+        }, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['answers'][0]['answer'], 5)
+
+    def test_invalid_answer_is_rejected(self):
+        response = self.client.post(reverse('assessment-save-progress'), {
+            'changes': [{'question_id': self.questions[0].id, 'answer': 9}]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_latest_of_several_incomplete_assessments_is_used(self):
+        latest = Assessment.objects.create(user=self.user)
+        self.save([answer(self.questions[0], 2)])
+        response = self.client.get(reverse('assessment-get-progress'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['answered'], 1)
+        self.assertTrue(AssessmentProgress.objects.filter(assessment=latest).exists())
@@ -0,0 +1,131 @@
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from assessments import catalog, rescoring
+from scoring.calculator import GIFT_ORDER, GiftCalculator, pack_answers
+from assessments.models import Assessment, GiftProfile, Question
+from assessments.services import save_submission
+from core.models import Task
+
+User = get_user_model()
+
+
+class RescoringTests(TestCase):
+    def setUp(self):
+        self.questions = [
+            Question.objects.create(category=gift, text=gift, gift_correlation={gift: 1.0})
+            for gift in GIFT_ORDER
+        ]
+        catalog.invalidate()
+        self.user = User.objects.create_user(username='student', email='s@example.com', password='pw')
+
+    def submit(self, favourite='TEACHING'):
+        answers = [
+            {'question_id': question.id, 'answer': 5 if question.category == favourite else 2}
+            for question in self.questions
+        ]
+        calculator = GiftCalculator()
+        scores = calculator.calculate_scores([
+            dict(answer, gift_correlation=question.gift_correlation)
+            for answer, question in zip(answers, self.questions)
+        ])
+        primary, secondary = calculator.identify_gifts(scores)
+        results = {'scores': scores, 'primary_gift': primary, 'secondary_gifts': secondary}
+        return save_submission(self.user, results, answers=answers)[1]
+
+    def change_correlations(self):
+        # The TEACHING question now measures GIVING
+        Question.objects.filter(category='TEACHING').update(gift_correlation={'GIVING': 1.0})
+        catalog.invalidate()
+
+    def test_submissions_store_answers_and_version(self):
+        profile = self.submit()
+        self.assertEqual(len(bytes(profile.answers)), 5 * len(GIFT_ORDER))
+        self.assertEqual(profile.questionnaire_version, catalog.get_catalog().fingerprint)
+        self.assertEqual(rescoring.rescore()['rescored'], 0)
+
+    def test_profiles_are_rescored_with_current_correlations(self):
+        profile = self.submit()
+        self.change_correlations()
+        self.assertEqual(rescoring.rescore(), {'rescored': 1, 'changed': 1, 'skipped': 0})
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.questionnaire_version, catalog.get_catalog().fingerprint)
+        self.assertEqual(profile.primary_gift, 'Giving')
+        self.assertEqual(min(profile.scores, key=profile.scores.get), 'TEACHING')
+        self.assertTrue(Task.objects.filter(
+            name='assessments.grant_book_access', payload={'gift_profile_id': profile.id}
+        ).exists())
+        self.assertTrue(Task.objects.filter(name='analytics.rebuild_rollups').exists())
+        self.assertEqual(rescoring.rescore()['rescored'], 0)
+
+    def test_matches_the_calculator(self):
+        profile = self.submit('SERVICE')
+        GiftProfile.objects.filter(pk=profile.pk).update(questionnaire_version='')
+        rescoring.rescore()
+        profile.refresh_from_db()
+
+        calculator = GiftCalculator()
+        answers = [
+            {'answer': 5 if question.category == 'SERVICE' else 2, 'gift_correlation': question.gift_correlation}
+            for question in self.questions
+        ]
+        scores = calculator.calculate_scores(answers)
+        primary, secondary = calculator.identify_gifts(scores)
+        self.assertEqual(profile.scores, scores)
+        self.assertEqual((profile.primary_gift, profile.secondary_gifts), (primary, secondary))
+
+    def test_legacy_answers_are_rescored_and_stored(self):
+        answers = [{'question_id': self.questions[0].id, 'answer': 5}, {'question_id': 999, 'answer': 5}]
+        assessment = Assessment.objects.create(user=self.user, completion_status=True, results_data={'answers': answers})
+        profile = GiftProfile.objects.create(
+            user=self.user, assessment=assessment, primary_gift='Teaching', secondary_gifts=[],
+            scores={gift: 0.0 for gift in GIFT_ORDER}
+        )
+        empty = GiftProfile.objects.create(
+            user=self.user, assessment=Assessment.objects.create(user=self.user), primary_gift='Teaching',
+            secondary_gifts=[], scores={gift: 0.0 for gift in GIFT_ORDER}
+        )
+        self.assertEqual(rescoring.rescore(), {'rescored': 1, 'changed': 1, 'skipped': 1})
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.primary_gift, 'Perception')
+        self.assertEqual(bytes(profile.answers), pack_answers(answers))
+        empty.refresh_from_db()
+        self.assertEqual(empty.questionnaire_version, '')
+
+    def test_interrupted_runs_resume(self):
+        profiles = [self.submit() for _ in range(3)]
+        self.change_correlations()
+        write = rescoring._write
+        calls = []
+
+        def interrupted(*args):
+            if calls:
+                raise KeyboardInterrupt
+            calls.append(args)
+            write(*args)
+
+        with mock.patch.object(rescoring, '_write', interrupted), self.assertRaises(KeyboardInterrupt):
+            rescoring.rescore(batch_size=2)
+        self.assertEqual(
+            GiftProfile.objects.filter(questionnaire_version=catalog.get_catalog().fingerprint).count(), 2
+        )
+        self.assertEqual(rescoring.rescore(batch_size=2)['rescored'], 1)
+        self.assertEqual(
+            {profile.primary_gift for profile in GiftProfile.objects.filter(pk__in=[p.pk for p in profiles])},
+            {'Giving'}
+        )
+
+    def test_command_with_worker_processes(self):
+        self.submit()
+        self.submit('COMPASSION')
+        self.submit('COMPASSION')
+        Question.objects.filter(category='TEACHING').update(gift_correlation={'TEACHING': 2.0})
+        catalog.invalidate()
+        out = StringIO()
+        call_command('rescore_profiles', workers=2, batch_size=1, stdout=out)
+        # Scores are shares of each gift's maximum, so doubling a weight changes nothing
+        self.assertIn('Re-scored 3 profiles (0 changed gifts)', out.getvalue())
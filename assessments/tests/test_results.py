@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from assessments.catalog import current_version
+from scoring.calculator import GIFT_ORDER, GiftCalculator, pack_scores, unpack_scores
+from assessments.models import Assessment, GiftProfile
+from assessments.serializers import AssessmentSerializer
+from assessments.services import save_submission
+
+User = get_user_model()
+
+
+class CompactResultsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='student', email='student@example.com', password='testpass123'
+        )
+        calculator = GiftCalculator()
+        answers = [
+            {'question_id': i, 'answer': 1 + i % 5, 'gift_correlation': {gift: 1.0}}
+            for i, gift in enumerate(GIFT_ORDER * 3)
+        ]
+        scores = calculator.calculate_scores(answers)
+        primary, secondary = calculator.identify_gifts(scores)
+        self.results = {
+            'scores': scores,
+            'primary_gift': primary,
+            'secondary_gifts': secondary,
+            'descriptions': calculator.get_gift_descriptions(primary, secondary),
+            'recommended_roles': {'primary_roles': [], 'secondary_roles': [], 'ministry_areas': []},
+        }
+
+    def test_scores_round_trip_through_packed_vector(self):
+        blob = pack_scores(self.results['scores'])
+        self.assertEqual(len(blob), 4 * len(GIFT_ORDER))
+        self.assertEqual(unpack_scores(blob), self.results['scores'])
+
+    def test_submission_stores_compact_rows_and_rehydrates(self):
+        # The questionnaire snapshot is saved once per process
+        with self.captureOnCommitCallbacks(execute=True):
+            current_version()
+        with self.assertNumQueries(6):
+            # savepoint, one insert each for assessment, profile and two tasks, release
+            assessment, profile = save_submission(self.user, self.results)
+
+        stored = Assessment.objects.get(pk=assessment.pk)
+        self.assertEqual(stored.results_data, {})
+        self.assertEqual(stored.results, self.results)
+        self.assertEqual(AssessmentSerializer(stored).data['results_data'], self.results)
+        self.assertEqual(GiftProfile.objects.get(pk=profile.pk).scores, self.results['scores'])
+
+    def test_extra_result_keys_are_kept(self):
+        results = dict(self.results, answers=[{'question_id': 1, 'answer': 3}])
+        assessment, _ = save_submission(self.user, results)
+        stored = Assessment.objects.get(pk=assessment.pk)
+        self.assertEqual(stored.results_data, {'answers': results['answers']})
+        self.assertEqual(stored.results['answers'], results['answers'])
+
+    def test_legacy_results_returned_unchanged(self):
+        assessment = Assessment.objects.create(
+            user=self.user, completion_status=True, results_data=self.results
+        )
+        self.assertEqual(assessment.results, self.results)
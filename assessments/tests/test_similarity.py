@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from assessments import similarity
+from scoring.calculator import GIFT_ORDER
+from assessments.models import Assessment, GiftProfile
+from counselors.models import Counselor, CounselorUserRelation
+
+User = get_user_model()
+
+
+def scores(primary, share=0.4):
+    rest = (1 - share) / (len(GIFT_ORDER) - 1)
+    return {gift: share if gift == primary else rest for gift in GIFT_ORDER}
+
+
+class ProfileTestCase(TestCase):
+    def setUp(self):
+        similarity.index_versions.invalidate()
+
+    def add_profile(self, user, gift_scores):
+        assessment = Assessment.objects.create(user=user, completion_status=True, results_data={})
+        with self.captureOnCommitCallbacks(execute=True):
+            return GiftProfile.objects.create(
+                user=user, assessment=assessment, primary_gift=max(gift_scores, key=gift_scores.get),
+                secondary_gifts=[], scores=gift_scores
+            )
+
+    def user(self, name):
+        return User.objects.create_user(username=name, email=f'{name}@example.com', password='pw')
+
+
+class SimilarityIndexTests(ProfileTestCase):
+    def test_nearest_first_and_scoped(self):
+        me, close, far = self.user('me'), self.user('close'), self.user('far')
+        self.add_profile(me, scores('TEACHING', 0.4))
+        self.add_profile(close, scores('TEACHING', 0.35))
+        self.add_profile(far, scores('GIVING', 0.6))
+
+        index = similarity.get_index()
+        target = index.vector_of(me.id)
+        self.assertEqual(
+            [user_id for _, user_id, _, _ in index.nearest(target, k=5, exclude={me.id})],
+            [close.id, far.id]
+        )
+        self.assertEqual(
+            [user_id for _, user_id, _, _ in index.nearest(target, k=5, user_ids={far.id})],
+            [far.id]
+        )
+
+    def test_new_profiles_are_added_incrementally(self):
+        me = self.user('me')
+        self.add_profile(me, scores('TEACHING'))
+        index = similarity.get_index()
+        self.assertEqual(len(index), 1)
+
+        self.add_profile(self.user('other'), scores('SERVICE'))
+        retaken = self.add_profile(me, scores('GIVING'))
+        with self.assertNumQueries(1):
+            self.assertIs(similarity.get_index(), index)
+        self.assertEqual(len(index), 2)
+        position = index.positions[me.id]
+        self.assertEqual(index.profile_ids[position], retaken.id)
+        self.assertEqual(index.primary_gifts[position], 'GIVING')
+
+    def test_deleting_profiles_reloads_the_index(self):
+        me = self.user('me')
+        self.add_profile(me, scores('TEACHING'))
+        self.assertEqual(len(similarity.get_index()), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            me.delete()
+        self.assertEqual(len(similarity.get_index()), 0)
+
+
+class SimilarStudentsTests(ProfileTestCase):
+    def setUp(self):
+        super().setUp()
+        counselor_user = self.user('counselor')
+        counselor = Counselor.objects.create(
+            user=counselor_user, professional_title='Counselor', institution='School',
+            qualification='MA', phone_number='555'
+        )
+        self.students = [self.user(f'student{i}') for i in range(3)]
+        for student in self.students:
+            CounselorUserRelation.objects.create(counselor=counselor, user=student)
+        self.outsider = self.user('outsider')
+        self.add_profile(self.students[0], scores('TEACHING', 0.4))
+        self.add_profile(self.students[1], scores('GIVING', 0.5))
+        self.add_profile(self.outsider, scores('TEACHING', 0.41))
+        self.client = APIClient()
+        self.client.force_authenticate(counselor_user)
+
+    def get(self, user, **params):
+        return self.client.get(f'/api/counselors/{user.id}/similar-students/', params)
+
+    def test_searches_the_counselors_students(self):
+        response = self.get(self.students[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['user_id'] for r in response.json()], [self.students[1].id])
+
+    def test_global_scope_does_not_identify_other_users(self):
+        results = self.get(self.students[0], scope='all').json()
+        self.assertEqual([r['user_id'] for r in results], [None, self.students[1].id])
+        self.assertEqual(results[0]['primary_gift'], 'TEACHING')
+        self.assertIsNone(results[0]['full_name'])
+
+    def test_only_own_students_with_profiles(self):
+        self.assertEqual(self.get(self.outsider).status_code, 404)
+        self.assertEqual(self.get(self.students[2]).status_code, 404)
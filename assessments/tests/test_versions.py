@@ -0,0 +1,145 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from assessments import catalog
+from scoring.calculator import GIFT_ORDER, CompiledQuestionnaire, GiftCalculator, LRUCache, VersionCache
+from assessments.models import Assessment, Question, QuestionnaireVersion
+from assessments.services import format_scoring_payload, save_submission
+
+User = get_user_model()
+
+
+def answer(question, value):
+    return {'question_id': question.id, 'answer': value, 'gift_correlation': question.gift_correlation}
+
+
+class QuestionnaireVersionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', email='s@example.com', password='pw')
+        self.questions = [
+            Question.objects.create(category=gift, text=gift, gift_correlation={gift: 1.0})
+            for gift in GIFT_ORDER
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse('assessment-list'), {'user': self.user.id}, format='json')
+        self.assessment = Assessment.objects.get(pk=response.json()['id'])
+
+    def change_questions(self):
+        first = self.questions[0]
+        first.gift_correlation = {'GIVING': 1.0}
+        first.save()
+        Question.objects.create(category='SERVICE', text='Added', gift_correlation={'SERVICE': 1.0})
+
+    def test_new_assessments_are_pinned_to_a_snapshot(self):
+        fingerprint = catalog.get_catalog().fingerprint
+        self.assertEqual(self.assessment.questionnaire_version, fingerprint)
+        version = QuestionnaireVersion.objects.get(fingerprint=fingerprint)
+        self.assertEqual([q['id'] for q in version.questions], [q.id for q in self.questions])
+
+    def test_pinned_assessments_keep_their_questions(self):
+        answers = [answer(q, 1 + i % 5) for i, q in enumerate(self.questions)]
+        self.client.post(reverse('assessment-save-progress'), {'current_answers': answers}, format='json')
+        self.change_questions()
+        self.assertNotEqual(catalog.get_catalog().fingerprint, self.assessment.questionnaire_version)
+
+        # Progress stays valid and scores with the pinned correlations
+        progress = self.client.get(reverse('assessment-get-progress')).json()
+        self.assertEqual(progress['answered'], len(self.questions))
+        profile = self.client.get(reverse('assessment-provisional-profile')).json()
+        self.assertEqual(profile['scores'], GiftCalculator().calculate_scores(answers))
+
+        questions = self.client.get(reverse('assessment-get-questions', args=[self.assessment.id])).json()
+        self.assertEqual(len(questions), len(self.questions))
+        self.assertEqual(questions[0]['gift_correlation'], {GIFT_ORDER[0]: 1.0})
+
+        response = self.client.post(reverse('assessment-submit'), {}, format='json')
+        self.assertEqual(response.status_code, 200)
+        profile = self.assessment.giftprofile_set.get()
+        self.assertEqual(profile.questionnaire_version, self.assessment.questionnaire_version)
+
+    def test_old_versions_are_compiled_once_per_process(self):
+        old = self.assessment.questionnaire_version
+        self.change_questions()
+        pinned = catalog.catalog_for(self.assessment)
+        self.assertEqual(pinned.fingerprint, old)
+        self.assertIs(catalog.get_version(old), pinned)
+        self.assertIs(pinned.compiled, pinned.compiled)
+        # Unknown or blank versions fall back to the current questions
+        self.assertIs(catalog.get_version('unknown'), catalog.get_catalog())
+
+    def test_rolled_back_snapshots_are_saved_again(self):
+        self.change_questions()
+        current = catalog.get_catalog()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            catalog.current_version()
+            raise RuntimeError
+        self.assertFalse(current.snapshot_saved)
+        self.assertFalse(QuestionnaireVersion.objects.filter(fingerprint=current.fingerprint).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(catalog.current_version(), current.fingerprint)
+        self.assertTrue(current.snapshot_saved)
+        self.assertTrue(QuestionnaireVersion.objects.filter(fingerprint=current.fingerprint).exists())
+
+    def test_payloads_with_unknown_questions_carry_no_version(self):
+        answers = [answer(q, 3) for q in self.questions]
+        payload = format_scoring_payload(self.user.id, answers)
+        self.assertEqual(payload['questionnaire_version'], catalog.get_catalog().fingerprint)
+
+        unknown = {'question_id': 999, 'answer': 5, 'gift_correlation': {'giving': 1.0}}
+        payload = format_scoring_payload(self.user.id, answers + [unknown])
+        self.assertIsNone(payload['questionnaire_version'])
+        self.assertEqual(payload['answers'][-1]['gift_correlation'], {'GIVING': 1.0})
+
+    def test_submissions_without_an_assessment_are_pinned(self):
+        results = {'scores': dict.fromkeys(GIFT_ORDER, 1 / 7), 'primary_gift': 'Teaching', 'secondary_gifts': []}
+        assessment, profile = save_submission(self.user, results)
+        self.assertEqual(assessment.questionnaire_version, catalog.get_catalog().fingerprint)
+        self.assertEqual(profile.questionnaire_version, assessment.questionnaire_version)
+
+
+class CompiledQuestionnaireTests(SimpleTestCase):
+    correlations = {1: {'TEACHING': 1.0, 'giving': 0.5}, 2: {'SERVICE': 0.8}, 3: {'COMPASSION': 1.0, 'SERVICE': 0.2}}
+
+    def test_scores_match_the_calculator(self):
+        compiled = CompiledQuestionnaire('v1', self.correlations)
+        answers = [(1, 5), (2, 3), (3, 4), (99, 5)]
+        scorer = compiled.scorer(answers)
+        self.assertEqual(scorer.answered, 3)
+        self.assertEqual(scorer.scores(), GiftCalculator().calculate_scores([
+            {'answer': value, 'gift_correlation': self.correlations[question_id]}
+            for question_id, value in answers[:3]
+        ]))
+
+    def test_lru_cache_evicts_the_least_recently_used(self):
+        cache = LRUCache(size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        cache.discard('a')
+        self.assertEqual(len(cache), 1)
+
+    def test_versions_are_compiled_once(self):
+        cache = VersionCache()
+        first_two = {question_id: self.correlations[question_id] for question_id in (1, 2)}
+        compiled = cache.compiled('v1', first_two)
+        self.assertIs(cache.compiled('v1', first_two), compiled)
+        # Questions not seen before are added to the version
+        extended = cache.compiled('v1', {3: self.correlations[3]})
+        self.assertEqual(set(extended.weights), {1, 2, 3})
+        self.assertIs(cache.get('v1'), extended)
+
+    def test_conflicting_weights_are_not_cached(self):
+        cache = VersionCache()
+        compiled = cache.compiled('v1', self.correlations)
+        other = cache.compiled('v1', {1: {'GIVING': 1.0}, 4: {'SERVICE': 1.0}})
+        self.assertIsNot(other, compiled)
+        self.assertEqual(other.weights[1], tuple(1.0 if gift == 'GIVING' else 0.0 for gift in GIFT_ORDER))
+        self.assertIs(cache.get('v1'), compiled)
+        self.assertNotIn(4, compiled)
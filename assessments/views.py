@@ -2,21 +2,31 @@ from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from scoring.calculator import GiftCalculator
 from .models import Question, Assessment, GiftProfile
 from .serializers import (
     QuestionSerializer, 
     AssessmentSerializer, 
     AssessmentProgressSerializer
 )
-from .gift_calculator import GiftCalculator
-from django.utils import timezone
-import asyncio
 from core.services import FastAPIClient
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from books.services import BookAccessService
+from .services import format_scoring_payload, save_submission
+from .adaptive import forecast
+from .catalog import catalog_for, current_version, get_catalog
+from .progress import (
+    ProgressConflict, load_progress, save_changes, save_all, progress_payload, progress_results
+)
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.http import parse_etags
 from django.db.models import Q
 from core.models import Payment
+from core.replica import replica_reads
+import logging
+
+logger = logging.getLogger(__name__)
 
 class QuestionViewSet(viewsets.ModelViewSet):
     serializer_class = QuestionSerializer
@@ -28,10 +38,15 @@ class QuestionViewSet(viewsets.ModelViewSet):
  
     @action(detail=False, methods=['get'])
     def list_all(self, request):
-        """Get all questions for assessment"""
-        questions = self.get_queryset()
-        serializer = self.get_serializer(questions, many=True)
-        return Response(serializer.data)
+        """Get all questions for assessment, pre-encoded from the catalog"""
+        catalog = get_catalog()
+        if catalog.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(catalog.body, content_type='application/json')
+        response['ETag'] = catalog.etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
 @method_decorator(csrf_exempt, name='dispatch')
 class AssessmentViewSet(viewsets.ModelViewSet):
@@ -40,7 +55,8 @@ class AssessmentViewSet(viewsets.ModelViewSet):
     calculator = GiftCalculator()
 
     def get_queryset(self):
-        queryset = Assessment.objects.all()
+        # Gift profiles are needed to rebuild compact results
+        queryset = Assessment.objects.prefetch_related('giftprofile_set')
         
         if hasattr(self.request.user, 'counselor_profile'):
             # Counselors can see assessments they've conducted
@@ -57,12 +73,14 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         if not hasattr(self.request.user, 'counselor_profile') and Assessment.has_reached_limit(self.request.user):
             raise ValueError("You have reached the maximum limit of 3 assessments")
 
+        # Answered and scored with today's questions, whatever changes later
+        version = current_version()
         if hasattr(self.request.user, 'counselor_profile'):
             # For counselors, create assessment for target user
-            serializer.save(counselor=self.request.user.counselor_profile)
+            serializer.save(counselor=self.request.user.counselor_profile, questionnaire_version=version)
         else:
             # For regular users, create assessment for themselves
-            serializer.save(user=self.request.user)
+            serializer.save(user=self.request.user, questionnaire_version=version)
     
     def create(self, request, *args, **kwargs):
         try:
@@ -72,8 +90,10 @@ class AssessmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def get_questions(self, request, pk=None):
-        """Get questions for a specific assessment"""
+        """Get questions for a specific assessment, from its questionnaire version if pinned"""
         assessment = self.get_object()
+        if assessment.questionnaire_version:
+            return HttpResponse(catalog_for(assessment).body, content_type='application/json')
         questions = Question.objects.filter(assessment=assessment)
         serializer = QuestionSerializer(questions, many=True)
         return Response(serializer.data)
@@ -97,57 +117,20 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                 
             answers = request.data.get('answers', [])
             if not answers:
-                return Response(
-                    {'error': "No answers provided"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+                # Finalize from the running scores of saved progress
+                return self._submit_progress(request)
 
             # Format answers for FastAPI
-            formatted_data = {
-                'user_id': request.user.id,
-                'answers': [
-                    {
-                        'question_id': answer['question_id'],
-                        'answer': int(answer['answer']),
-                        'gift_correlation': {
-                            k.upper(): float(v)
-                            for k, v in answer['gift_correlation'].items()
-                        }
-                    }
-                    for answer in answers
-                ]
-            }
+            formatted_data = format_scoring_payload(request.user.id, answers)
 
             # Calculate results using FastAPI client
             client = FastAPIClient()
             try:
                 # Use synchronous request instead of async
                 results = client.calculate_gifts_sync(formatted_data)
-                
-                # Create new assessment
-                assessment = Assessment.objects.create(
-                    user=request.user,
-                    completion_status=True,
-                    results_data=results
-                )
-
-                # Add debug logging before creating gift profile
-                print(f"Debug - Results from FastAPI: {results}")
-                print(f"Debug - Creating gift profile with primary: {results['primary_gift']}, secondary: {results['secondary_gifts']}")
-                
-                gift_profile = GiftProfile.objects.create(
-                    user=request.user,
-                    assessment=assessment,
-                    primary_gift=results['primary_gift'],
-                    secondary_gifts=results['secondary_gifts'],
-                    scores=results['scores']
-                )
 
-                # Add debug logging before granting book access
-                print(f"Debug - About to grant book access for user {request.user.id}")
-                print(f"Debug - Gift Profile ID: {gift_profile.id}")
-                BookAccessService.grant_gift_based_access(request.user, gift_profile)
-                print("Debug - Book access granted")
+                # Book access is granted by a background task after commit
+                save_submission(request.user, results, answers=answers)
 
                 return Response(results, status=status.HTTP_200_OK)
 
@@ -168,42 +151,131 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _incomplete_assessment(self, user):
+        # Latest one; users may have several incomplete assessments
+        return Assessment.objects.filter(user=user, completion_status=False).first()
+
+    def _submit_progress(self, request):
+        assessment = self._incomplete_assessment(request.user)
+        if assessment is None:
+            return Response(
+                {'error': "No answers provided"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            catalog = catalog_for(assessment)
+            progress = load_progress(assessment, catalog)
+            answered, required = progress.answered, len(progress.answers)
+            complete = required and answered >= required
+            if not complete and assessment.adaptive and answered:
+                # Adaptive assessments end once the gifts are settled
+                complete = forecast(progress, catalog).stable
+            if not complete:
+                return Response(
+                    {'error': f"Assessment incomplete: {answered} of {required} questions answered"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            results = progress_results(progress, provisional=False)
+            save_submission(
+                request.user, results,
+                assessment=assessment,
+                answers=progress_payload(progress)['answers'],
+            )
+            progress.delete()
+        return Response(results, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['post'])
     def save_progress(self, request):
-        """Save partial assessment progress"""
-        try:
-            assessment = Assessment.objects.get(
-                user=request.user,
-                completion_status=False
-            )
-            current_answers = request.data.get('current_answers', [])
-            
-            assessment.results_data = {
-                'progress': current_answers,
-                'last_updated': timezone.now().isoformat()
-            }
-            assessment.save()
-            return Response({'status': 'progress saved'})
-        except Assessment.DoesNotExist:
+        """
+        Save partial assessment progress.
+
+        Send only the changed answers as `changes` ([{question_id, answer}],
+        answer null to clear) with the `version` last received; a stale
+        version gets 409 with the current progress. `current_answers`
+        replaces the whole answer set instead.
+        """
+        assessment = self._incomplete_assessment(request.user)
+        if assessment is None:
             return Response(
                 {'error': 'No incomplete assessment found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        version = request.data.get('version')
+        try:
+            if 'changes' in request.data:
+                progress = save_changes(assessment, request.data['changes'], version)
+            else:
+                progress = save_all(assessment, request.data.get('current_answers', []), version)
+        except ProgressConflict as e:
+            return Response(
+                {'error': 'Progress was updated by another session', **progress_payload(e.progress)},
+                status=status.HTTP_409_CONFLICT
+            )
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            return Response(
+                {'error': f"Invalid answer format: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'status': 'progress saved',
+            'version': progress.version,
+            'answered': progress.answered
+        })
+
     @action(detail=False, methods=['get'])
     def get_progress(self, request):
-        """Retrieve partial assessment progress"""
-        try:
-            assessment = Assessment.objects.get(
-                user=request.user,
-                completion_status=False
+        """Retrieve partial assessment progress with its version"""
+        assessment = self._incomplete_assessment(request.user)
+        if assessment is None:
+            return Response({'version': 0, 'answered': 0, 'answers': []})
+        return Response(progress_payload(load_progress(assessment)))
+
+    @action(detail=False, methods=['get'], url_path='next-question')
+    def next_question(self, request):
+        """
+        Next question of an adaptive assessment.
+
+        The unanswered question that best separates the gifts still in
+        contention; null once the assignment is stable, when the
+        assessment can be submitted.
+        """
+        assessment = self._incomplete_assessment(request.user)
+        if assessment is None:
+            return Response(
+                {'error': 'No incomplete assessment found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if not assessment.adaptive:
+            return Response(
+                {'error': 'Assessment is not adaptive'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            progress = assessment.results_data.get('progress', [])
-            return Response(progress)
-        except Assessment.DoesNotExist:
-            return Response([])
+        catalog = catalog_for(assessment)
+        progress = load_progress(assessment, catalog)
+        outlook = forecast(progress, catalog)
+        position = None if outlook.stable else outlook.next_position()
+        return Response({
+            'question': None if position is None else catalog.questions[position],
+            'version': progress.version,
+            **outlook.summary(),
+        })
+
+    @action(detail=False, methods=['get'], url_path='provisional-profile')
+    def provisional_profile(self, request):
+        """Live gift profile from the answers saved so far"""
+        assessment = self._incomplete_assessment(request.user)
+        if assessment is None:
+            return Response(
+                {'error': 'No incomplete assessment found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(progress_results(load_progress(assessment)))
 
     @action(detail=False, methods=['get'], url_path='latest-results')
+    @replica_reads
     def latest_results(self, request):
         """Get user's latest assessment results"""
         print("Debug: Accessing latest_results endpoint")
@@ -239,7 +311,7 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                 'primary_gift': primary_gift,
                 'secondary_gifts': secondary_gifts,
                 'last_assessment': latest_assessment.created_at.isoformat(),
-                'descriptions': descriptions or latest_assessment.results_data.get('descriptions', {}),
+                'descriptions': descriptions or (latest_assessment.results or {}).get('descriptions', {}),
                 'recommended_roles': roles
             })
         except (Assessment.DoesNotExist, GiftProfile.DoesNotExist) as e:
@@ -249,40 +321,6 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-    @action(detail=True, methods=['post'])
-    async def submit_assessment(self, request, pk=None):
-        # Check if user has reached the assessment limit
-        if Assessment.has_reached_limit(request.user):
-            return Response(
-                {'error': "You have reached the maximum limit of 3 assessments"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-            
-        assessment = self.get_object()
-        client = FastAPIClient()
-        
-        try:
-            results = await client.calculate_gifts(request.data)
-            # Store results including recommended roles
-            assessment.results_data = results
-            assessment.save()
-            
-            # Create gift profile
-            gift_profile = GiftProfile.objects.create(
-                user=request.user,
-                assessment=assessment,
-                primary_gift=results['primary_gift'],
-                secondary_gifts=results['secondary_gifts'],
-                scores=results['scores']
-            )
-            
-            # Grant book access based on identified gifts
-            BookAccessService.grant_gift_based_access(request.user, gift_profile)
-            
-            return Response(results)
-        finally:
-            asyncio.run(client.close())
-
     @action(detail=True, methods=['post'])
     def submit_response(self, request, pk=None):
         assessment = self.get_object()
@@ -305,111 +343,64 @@ class AssessmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Add counselor context to responses if applicable
-            if hasattr(request.user, 'counselor_profile'):
-                assessment.counselor_notes = request.data.get('counselor_notes', '')
-                assessment.session_date = timezone.now()
-                assessment.is_counselor_session = True
-                assessment.counselor = request.user.counselor_profile
-            
+            counselor = getattr(request.user, 'counselor_profile', None)
+            counselor_notes = request.data.get('counselor_notes', '')
+
             # Format answers for FastAPI
-            formatted_data = {
-                'user_id': assessment.user.id,
-                'answers': [
-                    {
-                        'question_id': answer['question_id'],
-                        'answer': int(answer['answer']),
-                        'gift_correlation': {
-                            k.upper(): float(v)
-                            for k, v in answer['gift_correlation'].items()
-                        }
-                    }
-                    for answer in answers
-                ]
-            }
-            
+            catalog = catalog_for(assessment)
+            formatted_data = format_scoring_payload(assessment.user.id, answers, catalog)
+
             # Calculate results using FastAPI client
             client = FastAPIClient()
             try:
-                print(f"Debug - Submitting assessment responses to FastAPI for user {assessment.user.id}")
                 # Use synchronous request
                 results = client.calculate_gifts_sync(formatted_data)
-                
-                print(f"Debug - Results from FastAPI: {results}")
-                print(f"Debug - Creating gift profile with primary: {results['primary_gift']}, secondary: {results['secondary_gifts']}")
-                
-                # Update assessment with results
-                assessment.results_data = results
-                assessment.completion_status = True
-                assessment.save()
-                
-                # Create gift profile
-                gift_profile = GiftProfile.objects.create(
-                    user=assessment.user,
-                    assessment=assessment,
-                    primary_gift=results['primary_gift'],
-                    secondary_gifts=results['secondary_gifts'],
-                    scores=results['scores']
-                )
-                
-                # Grant book access based on identified gifts
-                print(f"Debug - About to grant book access for user {assessment.user.id}")
-                print(f"Debug - Gift Profile ID: {gift_profile.id}")
-                BookAccessService.grant_gift_based_access(assessment.user, gift_profile)
-                print("Debug - Book access granted")
-                
-                return Response({
-                    'message': 'Assessment completed successfully',
-                    'assessment_id': assessment.id,
-                    'results': assessment.results_data
-                }, status=status.HTTP_200_OK)
-                
+                message = 'Assessment completed successfully'
+
             except ValueError as e:
-                print(f"Debug - FastAPI calculation error: {str(e)}")
+                logger.warning(f"FastAPI calculation failed, using local calculation: {str(e)}")
                 # Fallback to local calculation if FastAPI fails
                 calculator = GiftCalculator()
-                scores = calculator.calculate_scores(answers)
+                if all(answer['question_id'] in catalog.compiled for answer in formatted_data['answers']):
+                    scores = catalog.compiled.scores(
+                        (answer['question_id'], answer['answer']) for answer in formatted_data['answers']
+                    )
+                else:
+                    scores = calculator.calculate_scores(formatted_data['answers'])
                 primary_gift, secondary_gifts = calculator.identify_gifts(scores)
-                descriptions = calculator.get_gift_descriptions(primary_gift, secondary_gifts)
-                
-                # Update assessment with results
-                assessment.results_data = {
+                results = {
                     'scores': scores,
                     'primary_gift': primary_gift,
                     'secondary_gifts': secondary_gifts,
-                    'descriptions': descriptions,
+                    'descriptions': calculator.get_gift_descriptions(primary_gift, secondary_gifts),
                     'answers': answers
                 }
-                assessment.completion_status = True
-                assessment.save()
-                
-                # Create gift profile
-                gift_profile = GiftProfile.objects.create(
-                    user=assessment.user,
-                    assessment=assessment,
-                    primary_gift=primary_gift,
-                    secondary_gifts=secondary_gifts,
-                    scores=scores
-                )
-                
-                # Grant book access based on identified gifts
-                BookAccessService.grant_gift_based_access(assessment.user, gift_profile)
-                
-                return Response({
-                    'message': 'Assessment completed successfully (fallback calculation)',
-                    'assessment_id': assessment.id,
-                    'results': assessment.results_data
-                }, status=status.HTTP_200_OK)
-                
+                message = 'Assessment completed successfully (fallback calculation)'
+
             except Exception as e:
-                print(f"Debug - Unexpected error in FastAPI calculation: {str(e)}")
+                logger.error(f"Unexpected error in FastAPI calculation: {str(e)}")
                 return Response(
                     {'error': f"Calculation failed: {str(e)}"}, 
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
-            
+
+            # Book access is granted by a background task after commit
+            save_submission(
+                assessment.user, results,
+                assessment=assessment,
+                counselor=counselor,
+                counselor_notes=counselor_notes,
+                answers=answers,
+            )
+
+            return Response({
+                'message': message,
+                'assessment_id': assessment.id,
+                'results': results
+            }, status=status.HTTP_200_OK)
+
         except Exception as e:
-            print(f"Debug - Exception in submit_response: {str(e)}")
+            logger.error(f"Exception in submit_response: {str(e)}")
             return Response(
                 {'error': str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
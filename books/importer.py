@@ -0,0 +1,189 @@
+"""
+Incremental import of the career book JSON files.
+
+Files are parsed and validated by ``books.parsing`` (possibly in worker
+processes). Each changed book is then diffed against the database by
+stable keys (categories by slug, careers by their position in the tree and
+title) into a plan, and all plans are applied in one transaction with bulk
+inserts/updates and targeted deletes, in an order that keeps every
+constraint satisfied. Careers that did not change keep their ids, so
+bookmarks and career choices pointing at them survive a reload.
+"""
+
+from collections import Counter
+from django.db import transaction
+from .models import Book, CareerCategory, Career
+
+BOOK_FIELDS = ('title', 'subtitle', 'slug', 'publication_info', 'copyright_info', 'version', 'content_hash')
+CATEGORY_FIELDS = ('title', 'description', 'order')
+CAREER_FIELDS = ('title', 'description', 'possibility_rating', 'order')
+
+# Added to category orders while they are rearranged, so the
+# (book, order) unique constraint holds after every statement
+ORDER_SHIFT = 1_000_000
+
+
+def existing_trees(books):
+    """
+    Stored categories {slug: category} and careers {key: career} per book id.
+
+    Two queries however many books are given.
+    """
+    trees = {book.id: ({}, {}) for book in books}
+    slugs = {}
+    for category in CareerCategory.objects.filter(book__in=books):
+        trees[category.book_id][0][category.slug] = category
+        slugs[category.id] = (category.book_id, category.slug)
+
+    rows = sorted(
+        Career.objects.filter(category__book__in=books),
+        key=lambda career: (career.order, career.id)
+    )
+    groups = {}
+    for career in rows:
+        groups.setdefault((career.category_id, career.parent_id), []).append(career)
+
+    keys = {}
+    # Parents before their specializations
+    for (category_id, parent_id), siblings in sorted(groups.items(), key=lambda g: g[0][1] is not None):
+        book_id, slug = slugs[category_id]
+        parent_key = keys.get(parent_id) if parent_id else None
+        seen = Counter()
+        for career in siblings:
+            key = (slug, parent_key, career.title, seen[career.title])
+            seen[career.title] += 1
+            keys[career.id] = key
+            trees[book_id][1][key] = career
+    return trees
+
+
+def _changed(instance, fields, names):
+    if all(getattr(instance, name) == fields[name] for name in names):
+        return False
+    for name in names:
+        setattr(instance, name, fields[name])
+    return True
+
+
+def _stats():
+    return {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+
+class BookPlan:
+    """The writes that bring one stored book in line with a parsed file"""
+
+    def __init__(self, parsed, book, have_categories, have_careers):
+        self.parsed = parsed
+        self.book = book
+        self.created = book.pk is None
+        self.stats = {'categories': _stats(), 'careers': _stats()}
+        want_categories, want_careers = parsed['categories'], parsed['careers']
+
+        self.delete_careers = [c.id for key, c in have_careers.items() if key not in want_careers]
+        self.delete_categories = [c.id for slug, c in have_categories.items() if slug not in want_categories]
+
+        categories = {}
+        self.create_categories, self.update_categories, self.move_categories = [], [], []
+        for slug, fields in want_categories.items():
+            category = have_categories.get(slug)
+            if category is None:
+                category = CareerCategory(book=book, slug=slug, **fields)
+                self.create_categories.append(category)
+            else:
+                old_order = category.order
+                if _changed(category, fields, CATEGORY_FIELDS):
+                    self.update_categories.append(category)
+                    if category.order != old_order:
+                        self.move_categories.append(category)
+            categories[slug] = category
+
+        careers = {}
+        self.create_careers, self.create_specializations, self.update_careers = [], [], []
+        for key, (fields, parent_key, slug) in want_careers.items():
+            career = have_careers.get(key)
+            if career is None:
+                # Parents precede their specializations in want_careers
+                career = Career(category=categories[slug], parent=careers.get(parent_key), **fields)
+                (self.create_specializations if parent_key else self.create_careers).append(career)
+            elif _changed(career, fields, CAREER_FIELDS):
+                self.update_careers.append(career)
+            careers[key] = career
+
+        for label, want, create, update, delete in (
+            ('categories', want_categories, self.create_categories, self.update_categories, self.delete_categories),
+            ('careers', want_careers, self.create_careers + self.create_specializations,
+             self.update_careers, self.delete_careers),
+        ):
+            self.stats[label].update(
+                created=len(create),
+                updated=len(update),
+                deleted=len(delete),
+                unchanged=len(want) - len(create) - len(update),
+            )
+
+
+def plan_books(parsed_books, replace=False):
+    """
+    Diff parsed book files against the database without writing anything.
+
+    With `replace` the stored books are ignored, as they are about to be
+    deleted, and every book is planned as new.
+    """
+    gifts = [parsed['associated_gift'] for parsed in parsed_books]
+    stored = {} if replace else {
+        book.associated_gift: book for book in Book.objects.filter(associated_gift__in=gifts)
+    }
+    trees = existing_trees(list(stored.values()))
+
+    plans = []
+    for parsed in parsed_books:
+        fields = dict(parsed['book'], content_hash=parsed['content_hash'])
+        book = stored.get(parsed['associated_gift'])
+        if book is None:
+            book = Book(associated_gift=parsed['associated_gift'], **fields)
+            tree = ({}, {})
+        else:
+            _changed(book, fields, BOOK_FIELDS)
+            tree = trees[book.id]
+        plans.append(BookPlan(parsed, book, *tree))
+    return plans
+
+
+def apply_plans(plans):
+    """
+    Write every plan in one transaction, in dependency order.
+
+    Deletes go first so they free category orders; reordered categories
+    are parked out of the way before their final orders are written;
+    books, categories and parent careers are inserted before the rows
+    that reference them.
+    """
+    def gather(attribute):
+        return [item for plan in plans for item in getattr(plan, attribute)]
+
+    with transaction.atomic():
+        Book.objects.bulk_create([plan.book for plan in plans if plan.created])
+        Book.objects.bulk_update([plan.book for plan in plans if not plan.created], BOOK_FIELDS)
+
+        if gather('delete_careers'):
+            Career.objects.filter(id__in=gather('delete_careers')).delete()
+        if gather('delete_categories'):
+            CareerCategory.objects.filter(id__in=gather('delete_categories')).delete()
+
+        moved = gather('move_categories')
+        if moved:
+            for category in moved:
+                category.order += ORDER_SHIFT
+            CareerCategory.objects.bulk_update(moved, ['order'])
+            for category in moved:
+                category.order -= ORDER_SHIFT
+        CareerCategory.objects.bulk_update(gather('update_categories'), CATEGORY_FIELDS)
+        CareerCategory.objects.bulk_create(gather('create_categories'))
+
+        Career.objects.bulk_update(gather('update_careers'), CAREER_FIELDS, batch_size=500)
+        # Paths are made of ids, so they are written once the rows exist
+        for created in (gather('create_careers'), gather('create_specializations')):
+            Career.objects.bulk_create(created, batch_size=500)
+            for career in created:
+                career.build_path(career.parent)
+            Career.objects.bulk_update(created, ['path', 'depth'], batch_size=500)
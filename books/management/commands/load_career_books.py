@@ -1,98 +1,125 @@
-import json
 import os
-from django.core.management.base import BaseCommand
-from django.utils.text import slugify
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
-from books.models import Book, CareerCategory, Career
+from books.importer import apply_plans, plan_books
+from books.models import Book
+from books.parsing import parse_book_file
+from books import recommendations, search
+from books.services import BookContentService
 
 class Command(BaseCommand):
-    help = 'Load career books from JSON files into the database'
+    help = 'Load career books from JSON files into the database, writing only what changed'
 
     def handle(self, *args, **options):
-        # Clear existing data if requested
-        if options['clear']:
-            self.stdout.write('Clearing existing books...')
-            Book.objects.all().delete()
+        started = time.monotonic()
+        dry_run = options['dry_run']
 
-        # Path to career books directory
-        books_dir = os.path.join('books', 'career_books')
-        
-        # Process each JSON file in the directory
-        for filename in os.listdir(books_dir):
-            if filename.endswith('.json'):
-                self.stdout.write(f'Processing {filename}...')
-                
-                # Read JSON file
-                file_path = os.path.join(books_dir, filename)
-                with open(file_path, 'r') as f:
-                    book_data = json.load(f)
-                
-                try:
-                    with transaction.atomic():
-                        # Create or update book
-                        book_info = book_data['book']
-                        book, created = Book.objects.update_or_create(
-                            associated_gift=book_info['associated_gift'],
-                            defaults={
-                                'title': book_info['title'],
-                                'subtitle': book_info['subtitle'],
-                                'slug': slugify(book_info['title']),
-                                'publication_info': book_info['publication_info'],
-                                'copyright_info': book_info['copyright_info'],
-                                'version': book_info['version']
-                            }
-                        )
-                        
-                        action = 'Created' if created else 'Updated'
-                        self.stdout.write(self.style.SUCCESS(
-                            f'{action} book: {book.title}'
-                        ))
+        books_dir = options['path']
+        paths = [
+            os.path.join(books_dir, filename)
+            for filename in sorted(os.listdir(books_dir))
+            if filename.endswith('.json')
+        ]
+        parsed_books = self.parse(paths, options['workers'])
 
-                        # Delete existing categories and careers for this book
-                        book.categories.all().delete()
+        loaded_hashes = set() if options['clear'] else set(
+            Book.objects.values_list('content_hash', flat=True)
+        )
 
-                        # Process categories
-                        for cat_data in book_info['categories']:
-                            category = CareerCategory.objects.create(
-                                book=book,
-                                order=cat_data['order'],
-                                title=cat_data['title'],
-                                description=cat_data['description'],
-                                slug=slugify(cat_data['title'])
-                            )
-                            
-                            # Process careers in category
-                            for career_data in cat_data['careers']:
-                                career = Career.objects.create(
-                                    category=category,
-                                    title=career_data['title'],
-                                    description=career_data.get('description', ''),
-                                    possibility_rating=career_data['possibility_rating'],
-                                    order=career_data['order']
-                                )
-                                
-                                # Process specializations if they exist
-                                if 'specializations' in career_data:
-                                    for spec_data in career_data['specializations']:
-                                        Career.objects.create(
-                                            category=category,
-                                            title=spec_data['title'],
-                                            parent=career,
-                                            possibility_rating=career.possibility_rating,
-                                            order=spec_data['order']
-                                        )
+        invalid, changed, gifts = [], [], {}
+        for parsed in parsed_books:
+            filename = os.path.basename(parsed['path'])
+            if parsed['errors']:
+                invalid.append(filename)
+                self.stdout.write(self.style.ERROR(f'Invalid {filename}:'))
+                for error in parsed['errors']:
+                    self.stdout.write(f'  {error}')
+            elif parsed['associated_gift'] in gifts:
+                invalid.append(filename)
+                self.stdout.write(self.style.ERROR(
+                    f"Invalid {filename}: {gifts[parsed['associated_gift']]} "
+                    f"is already the {parsed['associated_gift']} book"
+                ))
+            elif parsed['content_hash'] in loaded_hashes and not options['force']:
+                gifts[parsed['associated_gift']] = filename
+                self.stdout.write(f'Skipping {filename}: unchanged')
+            else:
+                gifts[parsed['associated_gift']] = filename
+                changed.append(parsed)
 
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'Error processing {filename}: {str(e)}')
-                    )
-                    continue
+        plans = plan_books(changed, replace=options['clear']) if changed else []
+        for plan in plans:
+            action = 'Create' if plan.created else 'Update'
+            self.stdout.write(f"{action} {os.path.basename(plan.parsed['path'])}: {plan.book.title}")
+            for label, counts in plan.stats.items():
+                self.stdout.write(
+                    f"  {label}: {counts['created']} created, {counts['updated']} updated, "
+                    f"{counts['deleted']} deleted, {counts['unchanged']} unchanged"
+                )
 
-        self.stdout.write(self.style.SUCCESS('Book loading completed!'))
+        elapsed = time.monotonic() - started
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f'DRY RUN: {len(plans)} book(s) to load, {len(invalid)} invalid ({elapsed:.2f}s)'
+            ))
+        elif invalid:
+            # Nothing is cleared or written unless every file is valid
+            self.stdout.write(self.style.WARNING('No books were loaded'))
+        elif plans or options['clear']:
+            # Clearing and loading commit together, so a failure keeps the old books
+            with transaction.atomic():
+                if options['clear']:
+                    self.stdout.write('Clearing existing books...')
+                    Book.objects.all().delete()
+                if plans:
+                    apply_plans(plans)
+            search.rebuild()
+            recommendations.invalidate()
+            BookContentService.invalidate()
+        if not dry_run and not invalid:
+            self.stdout.write(self.style.SUCCESS(
+                f'Book loading completed in {time.monotonic() - started:.2f}s!'
+            ))
+        if invalid:
+            raise CommandError(f"{len(invalid)} book file(s) failed validation: {', '.join(invalid)}")
+
+    def parse(self, paths, workers):
+        """Parse and validate the files, in worker processes when there are several"""
+        parse = partial(parse_book_file, gifts={gift for gift, _ in Book.GIFT_CHOICES})
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            return [parse(path) for path in paths]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse, paths))
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--clear',
             action='store_true',
             help='Clear existing books before loading',
-        ) 
\ No newline at end of file
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Diff every book, even files unchanged since the last load',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the files and report what would change without writing anything',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=0,
+            help='Processes used to parse and validate files (default: one per CPU)',
+        )
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'books', 'career_books'),
+            help='Directory of book JSON files (default: books/career_books)',
+        )
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+FTS_TABLE = 'books_career_fts'
+
+
+def fts5_supported(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+        except Exception:
+            return False
+    return True
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    # Without FTS5, books.search falls back to an in-memory index
+    if not fts5_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                title, description, category,
+                career_id UNINDEXED, book_id UNINDEXED, gift UNINDEXED, rating UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        """)
+        cursor.execute(f"""
+            INSERT INTO {FTS_TABLE} (career_id, book_id, gift, rating, title, description, category)
+            SELECT c.id, cat.book_id, b.associated_gift, c.possibility_rating,
+                   c.title, c.description, cat.title || ' ' || cat.description
+            FROM books_career c
+            JOIN books_careercategory cat ON cat.id = c.category_id
+            JOIN books_book b ON b.id = cat.book_id
+        """)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_book_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:02
+
+from django.db import migrations, models
+
+
+def fill_paths(apps, schema_editor):
+    Career = apps.get_model('books', 'Career')
+    parents = dict(Career.objects.values_list('id', 'parent_id'))
+    paths, depths = {}, {}
+
+    def path(career_id):
+        if career_id not in paths:
+            parent_id = parents.get(career_id)
+            if parent_id in parents:
+                prefix, depth = path(parent_id), depths[parent_id] + 1
+            else:
+                prefix, depth = '', 0
+            paths[career_id], depths[career_id] = f"{prefix}{career_id:010d}/", depth
+        return paths[career_id]
+
+    for career_id in parents:
+        path(career_id)
+    Career.objects.bulk_update(
+        [Career(id=career_id, path=paths[career_id], depth=depths[career_id]) for career_id in parents],
+        ['path', 'depth'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_career_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='career',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='career',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
@@ -34,6 +34,11 @@ class Book(models.Model):
     )
     copyright_info = models.TextField()
     version = models.CharField(max_length=50)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA-256 of the JSON file last loaded into this book"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -104,6 +109,12 @@ class Career(models.Model):
         related_name='specializations'
     )
     order = models.PositiveIntegerField(default=0)
+    # Materialized path of ids from the top-level career down, e.g.
+    # "0000000012/0000000345/"; a subtree is one indexed range (see books/tree.py)
+    path = models.CharField(max_length=255, blank=True, db_index=True)
+    depth = models.PositiveSmallIntegerField(default=0)
+
+    PATH_STEP = 10
 
     class Meta:
         ordering = ['category', 'order']
@@ -112,6 +123,12 @@ class Career(models.Model):
     def __str__(self):
         return f"{self.title} ({self.get_possibility_rating_display()})"
 
+    def build_path(self, parent=None):
+        """Set path and depth from the (saved) parent; the career must have an id"""
+        prefix = parent.path if parent is not None else ''
+        self.path = f"{prefix}{self.id:0{self.PATH_STEP}d}/"
+        self.depth = parent.depth + 1 if parent is not None else 0
+
 class UserBookProgress(models.Model):
     """Tracks user's progress through books"""
     user = models.ForeignKey(
@@ -0,0 +1,178 @@
+"""
+Parsing and validation of career book JSON files.
+
+Kept free of models and database access so files can be parsed in worker
+processes (see ``load_career_books --workers``); the result is a plain,
+picklable career tree that ``books.importer`` diffs against the database.
+"""
+
+import hashlib
+import json
+from collections import Counter
+from django.utils.text import slugify
+
+POSSIBILITY_RATINGS = ('HP', 'VP', 'P')
+
+# Field limits of Book, CareerCategory and Career
+TITLE_MAX_LENGTH = 255
+SLUG_MAX_LENGTH = 50
+
+
+def book_fields(book_info):
+    return {
+        'title': book_info['title'],
+        'subtitle': book_info['subtitle'],
+        'slug': slugify(book_info['title']),
+        'publication_info': book_info['publication_info'],
+        'copyright_info': book_info['copyright_info'],
+        'version': book_info['version'],
+    }
+
+
+def _keyed(siblings, make_key):
+    """Pair items with keys that stay unique when sibling titles repeat"""
+    seen = Counter()
+    for item in siblings:
+        key = make_key(item, seen[item['title']])
+        seen[item['title']] += 1
+        yield key, item
+
+
+def desired_tree(book_info):
+    """
+    Categories and careers a book file describes, keyed like importer.existing_trees().
+
+    Returns ({slug: fields}, {career key: (fields, parent key, category slug)}).
+    Careers come before their specializations.
+    """
+    categories, careers = {}, {}
+    for cat_data in book_info['categories']:
+        slug = slugify(cat_data['title'])
+        categories[slug] = {
+            'title': cat_data['title'],
+            'description': cat_data['description'],
+            'order': cat_data['order'],
+        }
+        top = sorted(cat_data['careers'], key=lambda c: c['order'])
+        for key, career_data in _keyed(top, lambda c, n: (slug, None, c['title'], n)):
+            careers[key] = ({
+                'title': career_data['title'],
+                'description': career_data.get('description', ''),
+                'possibility_rating': career_data['possibility_rating'],
+                'order': career_data['order'],
+            }, None, slug)
+            specializations = sorted(career_data.get('specializations', []), key=lambda s: s['order'])
+            for spec_key, spec_data in _keyed(specializations, lambda s, n: (slug, key, s['title'], n)):
+                careers[spec_key] = ({
+                    'title': spec_data['title'],
+                    'description': '',
+                    'possibility_rating': career_data['possibility_rating'],
+                    'order': spec_data['order'],
+                }, key, slug)
+    return categories, careers
+
+
+class _Checker:
+    def __init__(self):
+        self.errors = []
+
+    def require(self, data, field, kind, where, optional=False):
+        value = data.get(field) if isinstance(data, dict) else None
+        if value is None:
+            if not optional:
+                self.errors.append(f"{where}: missing '{field}'")
+            return None
+        if not isinstance(value, kind) or isinstance(value, bool):
+            self.errors.append(f"{where}: '{field}' must be {kind.__name__}")
+            return None
+        return value
+
+    def title(self, data, where):
+        title = self.require(data, 'title', str, where)
+        if title is not None and not (0 < len(title.strip()) <= TITLE_MAX_LENGTH):
+            self.errors.append(f"{where}: title must be 1-{TITLE_MAX_LENGTH} characters")
+        return title
+
+    def order(self, data, where, seen):
+        order = self.require(data, 'order', int, where)
+        if order is not None:
+            if order < 0:
+                self.errors.append(f"{where}: order must not be negative")
+            elif order in seen:
+                self.errors.append(f"{where}: order {order} is used twice")
+            seen.add(order)
+
+
+def validate_book(data, gifts):
+    """Return a list of problems with a parsed book file; empty when it can be loaded"""
+    check = _Checker()
+    book = check.require(data, 'book', dict, 'file')
+    if book is None:
+        return check.errors
+
+    check.title(book, 'book')
+    for field in ('subtitle', 'copyright_info', 'version'):
+        check.require(book, field, str, 'book')
+    check.require(book, 'publication_info', dict, 'book')
+    gift = check.require(book, 'associated_gift', str, 'book')
+    if gift is not None and gift not in gifts:
+        check.errors.append(f"book: unknown associated_gift '{gift}'")
+
+    category_orders, slugs = set(), set()
+    for i, category in enumerate(check.require(book, 'categories', list, 'book') or []):
+        where = f"category {i + 1}"
+        title = check.title(category, where)
+        check.require(category, 'description', str, where)
+        check.order(category, where, category_orders)
+        if title:
+            slug = slugify(title)
+            if not slug or len(slug) > SLUG_MAX_LENGTH:
+                check.errors.append(f"{where}: title must give a slug of 1-{SLUG_MAX_LENGTH} characters")
+            elif slug in slugs:
+                check.errors.append(f"{where}: another category has the slug '{slug}'")
+            slugs.add(slug)
+
+        career_orders = set()
+        for j, career in enumerate(check.require(category, 'careers', list, where) or []):
+            career_where = f"{where} ({title}), career {j + 1}"
+            check.title(career, career_where)
+            check.order(career, career_where, career_orders)
+            check.require(career, 'description', str, career_where, optional=True)
+            rating = check.require(career, 'possibility_rating', str, career_where)
+            if rating is not None and rating not in POSSIBILITY_RATINGS:
+                check.errors.append(f"{career_where}: unknown possibility_rating '{rating}'")
+
+            spec_orders = set()
+            specializations = check.require(career, 'specializations', list, career_where, optional=True)
+            for k, spec in enumerate(specializations or []):
+                spec_where = f"{career_where}, specialization {k + 1}"
+                check.title(spec, spec_where)
+                check.order(spec, spec_where, spec_orders)
+    return check.errors
+
+
+def parse_book_file(path, gifts):
+    """
+    Read, hash, validate and parse one book file.
+
+    Returns a dict with the content hash and either `errors` or the book
+    fields and career tree. Never raises for bad input, so one broken file
+    does not stop a parallel import.
+    """
+    result = {'path': path, 'content_hash': None, 'errors': []}
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        result['content_hash'] = hashlib.sha256(raw).hexdigest()
+        data = json.loads(raw)
+    except (OSError, ValueError) as e:
+        result['errors'] = [f"cannot read file: {e}"]
+        return result
+
+    result['errors'] = validate_book(data, gifts)
+    if not result['errors']:
+        book_info = data['book']
+        result['associated_gift'] = book_info['associated_gift']
+        result['book'] = book_fields(book_info)
+        result['categories'], result['careers'] = desired_tree(book_info)
+    return result
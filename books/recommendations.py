@@ -0,0 +1,211 @@
+"""
+Career recommendations ranked against a user's full gift profile.
+
+Each top-level career title is one row of a career x gift affinity matrix:
+the same career appears in several gift books, and its weight for a gift
+is how strongly that gift's book rates it (``RATING_WEIGHTS``). A profile
+ranks every row with one pass of dot products against its seven scores, so
+careers that fit several of the user's strong gifts rise above those that
+fit only the primary one. ``peer_careers`` suggests careers from what the
+users with the closest profiles chose instead.
+
+Each process builds the matrix once and keeps it until ``invalidate()``
+bumps the shared version stamp (the loader does after writing careers).
+Rankings are memoised per gift profile on the matrix; profiles never
+change once saved and a new assessment creates a new profile, so a new
+assessment is always ranked afresh and a reload drops every ranking.
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+from operator import mul
+from assessments import similarity
+from core.cache import CacheNamespace
+from .models import Book, Career, CareerBookmark, CareerChoice
+
+GIFTS = tuple(gift for gift, _ in Book.GIFT_CHOICES)
+
+# Affinity of a career to the gift of the book that lists it
+RATING_WEIGHTS = {'HP': 1.0, 'VP': 0.75, 'P': 0.5}
+
+MAX_RESULTS = 50
+
+# How much a peer's interest in a career counts, by how they showed it
+PEER_SIGNALS = {'career_choice_1': 2.0, 'career_choice_2': 1.0, 'bookmark': 1.0}
+# Profiles whose rankings each process keeps
+RANKING_CACHE_SIZE = 4096
+
+matrix_versions = CacheNamespace('career-recommendations', timeout=None, beta=0)
+
+_lock = threading.Lock()
+_current = None
+
+
+def career_key(title):
+    return ' '.join(title.casefold().split())
+
+
+class AffinityMatrix:
+    """An immutable career x gift matrix with a per-profile ranking cache"""
+
+    def __init__(self, careers, stamp):
+        """`careers` are (id, title, possibility_rating, book id, gift) of top-level careers"""
+        self.stamp = stamp
+        positions = {}
+        self.titles, self.rows, self.sources = [], [], []
+        for career_id, title, rating, book_id, gift in sorted(careers):
+            key = career_key(title)
+            if key not in positions:
+                positions[key] = len(self.titles)
+                self.titles.append(title)
+                self.rows.append([0.0] * len(GIFTS))
+                self.sources.append({})
+            position = positions[key]
+            weight = RATING_WEIGHTS.get(rating, 0.0)
+            column = GIFTS.index(gift)
+            # A title listed twice in one book counts with its best rating
+            if weight > self.rows[position][column]:
+                self.rows[position][column] = weight
+                self.sources[position][gift] = (career_id, book_id, rating)
+        self.rows = [tuple(row) for row in self.rows]
+        self._rankings = OrderedDict()
+        self._rankings_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def rank(self, scores):
+        """Every row as (score, position), best first; scores are normalised to 0-1"""
+        weights = [max(float(scores.get(gift, 0.0)), 0.0) for gift in GIFTS]
+        total = sum(weights)
+        if not total:
+            return []
+        weights = [weight / total for weight in weights]
+        products = [sum(map(mul, row, weights)) for row in self.rows]
+        return sorted(
+            ((score, position) for position, score in enumerate(products) if score),
+            key=lambda hit: (-hit[0], hit[1])
+        )
+
+    def ranking(self, profile_id, scores):
+        """rank(scores), memoised for the profile"""
+        with self._rankings_lock:
+            ranking = self._rankings.get(profile_id)
+            if ranking is not None:
+                self._rankings.move_to_end(profile_id)
+                return ranking
+        ranking = self.rank(scores)
+        with self._rankings_lock:
+            self._rankings[profile_id] = ranking
+            if len(self._rankings) > RANKING_CACHE_SIZE:
+                self._rankings.popitem(last=False)
+        return ranking
+
+    def explain(self, position, scores):
+        """The gift books behind a row's score, largest contribution first"""
+        total = sum(max(float(scores.get(gift, 0.0)), 0.0) for gift in GIFTS) or 1.0
+        matches = []
+        for gift, (career_id, book_id, rating) in self.sources[position].items():
+            contribution = max(float(scores.get(gift, 0.0)), 0.0) / total * RATING_WEIGHTS[rating]
+            matches.append({
+                'gift': gift,
+                'career_id': career_id,
+                'book_id': book_id,
+                'possibility_rating': rating,
+                'contribution': round(contribution, 4),
+            })
+        matches.sort(key=lambda match: (-match['contribution'], GIFTS.index(match['gift'])))
+        return matches
+
+
+def _load(stamp):
+    careers = Career.objects.filter(parent__isnull=True).values_list(
+        'id', 'title', 'possibility_rating', 'category__book_id', 'category__book__associated_gift'
+    )
+    return AffinityMatrix(careers, stamp)
+
+
+def get_matrix():
+    """The current matrix, rebuilt if careers were reloaded since it was built"""
+    global _current
+    stamp = matrix_versions.generation()
+    matrix = _current
+    if matrix is not None and matrix.stamp == stamp:
+        return matrix
+    with _lock:
+        if _current is None or _current.stamp != stamp:
+            _current = _load(stamp)
+        return _current
+
+
+def invalidate():
+    """Mark the matrix and every cached ranking stale in all processes"""
+    matrix_versions.invalidate()
+
+
+def recommend(profile_id, scores, limit=10):
+    """
+    The `limit` careers that best fit a gift profile's scores.
+
+    Returns dicts with the career title, its 0-1 score and the matches
+    (gift, career and rating in that gift's book) that explain it.
+    """
+    matrix = get_matrix()
+    limit = max(1, min(limit, MAX_RESULTS))
+    return [{
+        'title': matrix.titles[position],
+        'score': round(score, 4),
+        'matches': matrix.explain(position, scores),
+    } for score, position in matrix.ranking(profile_id, scores)[:limit]]
+
+
+def peer_careers(user_id, book_ids, peers=20, limit=10):
+    """
+    Careers the users with the gift profiles nearest to `user_id`'s chose or bookmarked.
+
+    Each peer's interest counts more the closer their profile is; careers
+    the user already chose or bookmarked, and careers outside `book_ids`
+    (the books the user can access), are left out. Returns
+    [(career, score, number of peers)], best first.
+    """
+    index = similarity.get_index()
+    target = index.vector_of(user_id)
+    if target is None:
+        return []
+    closeness = {
+        peer_id: 1 / (1 + distance)
+        for distance, peer_id, _, _ in index.nearest(target, peers, exclude={user_id})
+    }
+
+    signals = [
+        (choice['user_id'], choice[field], PEER_SIGNALS[field])
+        for choice in CareerChoice.objects.filter(user_id__in=[user_id, *closeness]).values(
+            'user_id', 'career_choice_1', 'career_choice_2'
+        )
+        for field in ('career_choice_1', 'career_choice_2') if choice[field]
+    ]
+    signals.extend(
+        (bookmark_user, career_id, PEER_SIGNALS['bookmark'])
+        for bookmark_user, career_id in CareerBookmark.objects.filter(
+            user_id__in=[user_id, *closeness]
+        ).values_list('user_id', 'career_id')
+    )
+
+    own = {career_id for signal_user, career_id, _ in signals if signal_user == user_id}
+    scores, voters = defaultdict(float), defaultdict(set)
+    for signal_user, career_id, weight in signals:
+        if signal_user != user_id and career_id not in own:
+            scores[career_id] += weight * closeness[signal_user]
+            voters[career_id].add(signal_user)
+
+    accessible = set(
+        Career.objects.filter(id__in=list(scores), category__book_id__in=book_ids).values_list('id', flat=True)
+    )
+    best = sorted(
+        (item for item in scores.items() if item[0] in accessible), key=lambda item: (-item[1], item[0])
+    )[:max(1, min(limit, MAX_RESULTS))]
+    careers = Career.objects.select_related('category__book').in_bulk([career_id for career_id, _ in best])
+    return [
+        (careers[career_id], score, len(voters[career_id]))
+        for career_id, score in best if career_id in careers
+    ]
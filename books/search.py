@@ -0,0 +1,185 @@
+"""
+Full-text search over careers across books.
+
+Careers are indexed by their title, description and category text. On
+SQLite with FTS5 the index is the ``books_career_fts`` virtual table
+(created by migration 0003) and queries are ranked with bm25. Elsewhere
+each process builds an in-memory inverted index instead, reloaded when
+``rebuild()`` bumps the shared version stamp and ranked by tf-idf. Both
+match the same careers: every query word as a prefix, all words required,
+with the same field weights.
+
+The loader calls ``rebuild()`` after writing careers; nothing else
+changes them.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from django.db import connection, transaction
+from core.cache import CacheNamespace
+from .models import Career
+
+FTS_TABLE = 'books_career_fts'
+
+# Relative importance of matches in each field (bm25 column weights)
+TITLE_WEIGHT = 4.0
+DESCRIPTION_WEIGHT = 1.0
+CATEGORY_WEIGHT = 1.5
+
+MAX_RESULTS = 100
+
+_SOURCE_SQL = """
+    SELECT c.id, cat.book_id, b.associated_gift, c.possibility_rating,
+           c.title, c.description, cat.title || ' ' || cat.description
+    FROM books_career c
+    JOIN books_careercategory cat ON cat.id = c.category_id
+    JOIN books_book b ON b.id = cat.book_id
+"""
+
+index_versions = CacheNamespace('career-search', timeout=None, beta=0)
+
+_lock = threading.Lock()
+_memory_index = None
+_fts_available = None
+
+
+def uses_fts():
+    """Whether this database has the FTS5 index (checked once per process)"""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = (
+            connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names(include_views=True)
+        )
+    return _fts_available
+
+
+def tokenize(text):
+    """Lower-cased words without diacritics, matching the FTS5 unicode61 tokenizer"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'\w+', text)
+
+
+def rebuild():
+    """Reindex every career and mark in-memory indexes stale in all processes"""
+    if uses_fts():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} "
+                "(career_id, book_id, gift, rating, title, description, category) " + _SOURCE_SQL
+            )
+    index_versions.invalidate()
+
+
+class InvertedIndex:
+    """In-memory term -> {career id: weight} postings with prefix lookups"""
+
+    def __init__(self, rows, stamp):
+        self.stamp = stamp
+        self.docs = {}
+        self.postings = defaultdict(lambda: defaultdict(float))
+        for career_id, book_id, gift, rating, title, description, category in rows:
+            self.docs[career_id] = (book_id, gift, rating)
+            for text, weight in (
+                (title, TITLE_WEIGHT), (description, DESCRIPTION_WEIGHT), (category, CATEGORY_WEIGHT)
+            ):
+                for term in tokenize(text or ''):
+                    self.postings[term][career_id] += weight
+        self.terms = sorted(self.postings)
+
+    def _prefix_scores(self, prefix):
+        scores = {}
+        position = bisect_left(self.terms, prefix)
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            postings = self.postings[self.terms[position]]
+            idf = math.log(1 + len(self.docs) / len(postings))
+            for career_id, weight in postings.items():
+                scores[career_id] = max(scores.get(career_id, 0.0), weight * idf)
+            position += 1
+        return scores
+
+    def search(self, terms, book_ids=None, ratings=None, gifts=None, limit=20):
+        scores = None
+        for term in terms:
+            matched = self._prefix_scores(term)
+            scores = matched if scores is None else {
+                career_id: score + matched[career_id]
+                for career_id, score in scores.items() if career_id in matched
+            }
+            if not scores:
+                return []
+
+        def allowed(career_id):
+            book_id, gift, rating = self.docs[career_id]
+            return (
+                (book_ids is None or book_id in book_ids)
+                and (not ratings or rating in ratings)
+                and (not gifts or gift in gifts)
+            )
+
+        return heapq.nlargest(
+            limit,
+            ((score, career_id) for career_id, score in scores.items() if allowed(career_id)),
+            key=lambda hit: (hit[0], -hit[1])
+        )
+
+
+def memory_index():
+    """This process's inverted index, rebuilt when the version stamp moved"""
+    global _memory_index
+    stamp = index_versions.generation()
+    index = _memory_index
+    if index is not None and index.stamp == stamp:
+        return index
+    with _lock:
+        if _memory_index is None or _memory_index.stamp != stamp:
+            with connection.cursor() as cursor:
+                cursor.execute(_SOURCE_SQL)
+                _memory_index = InvertedIndex(cursor.fetchall(), stamp)
+        return _memory_index
+
+
+def _fts_search(terms, book_ids, ratings, gifts, limit):
+    where, params = [f"{FTS_TABLE} MATCH %s"], [' '.join(f'"{term}"*' for term in terms)]
+    for column, values in (('book_id', book_ids), ('rating', ratings), ('gift', gifts)):
+        if values:
+            where.append(f"{column} IN ({', '.join(['%s'] * len(values))})")
+            params.extend(values)
+    sql = (
+        f"SELECT -bm25({FTS_TABLE}, %s, %s, %s) AS score, career_id FROM {FTS_TABLE} "
+        f"WHERE {' AND '.join(where)} ORDER BY score DESC, career_id LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [TITLE_WEIGHT, DESCRIPTION_WEIGHT, CATEGORY_WEIGHT] + params + [limit])
+        return cursor.fetchall()
+
+
+def search_careers(query, book_ids=None, ratings=None, gifts=None, limit=20):
+    """
+    Careers matching every word of `query` as a prefix, best first.
+
+    Optionally restricted to the books in `book_ids` and to the given
+    possibility ratings and gifts. Returns [(career, score)].
+    """
+    terms = tokenize(query)
+    if not terms:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+    if book_ids is not None:
+        book_ids = set(book_ids)
+        if not book_ids:
+            return []
+    if uses_fts():
+        hits = _fts_search(terms, book_ids, ratings, gifts, limit)
+    else:
+        hits = memory_index().search(terms, book_ids, ratings, gifts, limit)
+
+    careers = Career.objects.select_related('category__book').in_bulk([career_id for _, career_id in hits])
+    return [(careers[career_id], score) for score, career_id in hits if career_id in careers]
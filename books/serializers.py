@@ -23,13 +23,32 @@ class CareerSerializer(serializers.ModelSerializer):
         ]
     
     def get_specializations(self, obj):
-        if obj.parent is None:  # Only get specializations for parent careers
+        if obj.parent_id is None:  # Only get specializations for parent careers
+            # Linked by books.tree.assemble when the whole tree was loaded at once
+            specializations = getattr(obj, 'tree_children', None)
+            if specializations is None:
+                specializations = obj.specializations.all().order_by('order')
             return [{
                 'title': spec.title,
                 'order': spec.order
-            } for spec in obj.specializations.all().order_by('order')]
+            } for spec in specializations]
         return None
 
+class CareerTreeSerializer(serializers.ModelSerializer):
+    """Career with nested specializations; expects trees built by books.tree"""
+    category_name = serializers.CharField(source='category.title', read_only=True)
+    children = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Career
+        fields = [
+            'id', 'title', 'description', 'possibility_rating',
+            'category', 'category_name', 'order', 'depth', 'children'
+        ]
+
+    def get_children(self, obj):
+        return CareerTreeSerializer(obj.tree_children, many=True).data
+
 class CategorySerializer(serializers.ModelSerializer):
     """Category with nested careers serializer"""
     careers = CareerSerializer(many=True, read_only=True)
@@ -41,6 +60,24 @@ class CategorySerializer(serializers.ModelSerializer):
             'slug', 'careers'
         ]
 
+class CareerSearchResultSerializer(serializers.ModelSerializer):
+    """Career search hit with its category and book; expects select_related('category__book')"""
+    category_name = serializers.CharField(source='category.title', read_only=True)
+    book_id = serializers.IntegerField(source='category.book_id', read_only=True)
+    book_title = serializers.CharField(source='category.book.title', read_only=True)
+    associated_gift = serializers.CharField(source='category.book.associated_gift', read_only=True)
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Career
+        fields = [
+            'id', 'title', 'description', 'possibility_rating', 'parent',
+            'category', 'category_name', 'book_id', 'book_title', 'associated_gift', 'score'
+        ]
+
+    def get_score(self, obj):
+        return round(self.context['scores'][obj.id], 4)
+
 class BookDetailSerializer(BookSerializer):
     """Detailed book information with categories"""
     categories = CategorySerializer(many=True, read_only=True)
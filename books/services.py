@@ -1,7 +1,12 @@
 from django.utils import timezone
 from django.db import models
 from datetime import timedelta
+from core.cache import CacheNamespace
 from .models import Book, BookAccess
+from .tree import assemble
+
+# Serialized book content only changes when load_career_books runs
+book_content_cache = CacheNamespace('book-content', timeout=24 * 3600)
 
 class BookAccessService:
     @staticmethod
@@ -70,4 +75,24 @@ class BookAccessService:
         ).filter(
             models.Q(user_access__expires_at__isnull=True) |
             models.Q(user_access__expires_at__gt=timezone.now())
-        ).distinct() 
\ No newline at end of file
+        ).distinct()
+
+
+class BookContentService:
+    @staticmethod
+    def get_table_of_contents(book):
+        """Serialized categories and careers for a book, shared across workers"""
+        from .serializers import CategorySerializer
+
+        def build():
+            categories = list(book.categories.all().prefetch_related('careers').order_by('order'))
+            # Link specializations from the prefetched rows instead of a query per career
+            assemble(career for category in categories for career in category.careers.all())
+            return CategorySerializer(categories, many=True).data
+
+        return book_content_cache.get_or_set(f'toc:{book.id}', build)
+
+    @staticmethod
+    def invalidate():
+        """Drop all cached book content, e.g. after reloading the books"""
+        book_content_cache.invalidate()
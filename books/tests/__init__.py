@@ -0,0 +1,19 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+
+BOOKS_DIR = os.path.join(settings.BASE_DIR, 'books', 'career_books')
+
+
+def load_books(*gifts):
+    """Load the shipped career books of `gifts` (e.g. 'SERVICE') with load_career_books"""
+    books_dir = tempfile.mkdtemp()
+    try:
+        for gift in gifts:
+            shutil.copy(os.path.join(BOOKS_DIR, f'{gift}.json'), books_dir)
+        call_command('load_career_books', path=books_dir, workers=1, stdout=StringIO())
+    finally:
+        shutil.rmtree(books_dir)
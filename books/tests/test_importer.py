@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from books.models import Book, BookAccess, Career, CareerBookmark, CareerCategory
+from books.tests import BOOKS_DIR
+
+User = get_user_model()
+
+
+class LoadCareerBooksTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        shutil.copy(os.path.join(BOOKS_DIR, 'SERVICE.json'), self.dir)
+        self.path = os.path.join(self.dir, 'SERVICE.json')
+
+    def load(self, **options):
+        out = StringIO()
+        options.setdefault('workers', 1)
+        call_command('load_career_books', path=self.dir, stdout=out, **options)
+        return out.getvalue()
+
+    def edit(self, change):
+        with open(self.path) as f:
+            data = json.load(f)
+        change(data['book'])
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def test_unchanged_file_is_skipped(self):
+        self.load()
+        careers = Career.objects.count()
+        self.assertGreater(careers, 0)
+
+        with self.assertNumQueries(1):
+            output = self.load()
+        self.assertIn('Skipping SERVICE.json: unchanged', output)
+        self.assertEqual(Career.objects.count(), careers)
+
+    def test_reload_keeps_unchanged_careers_and_their_bookmarks(self):
+        self.load()
+        user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        kept = Career.objects.filter(parent__isnull=True).order_by('id').first()
+        bookmark = CareerBookmark.objects.create(user=user, career=kept)
+        careers = Career.objects.count()
+
+        def change(book):
+            first, second = book['categories'][:2]
+            # Swap two categories, edit one career, drop another, add a category
+            first['order'], second['order'] = second['order'], first['order']
+            second['careers'][0]['possibility_rating'] = 'P'
+            dropped = second['careers'].pop()
+            self.dropped = (dropped['title'], 1 + len(dropped.get('specializations', [])))
+            book['categories'].append({
+                'title': 'Space Exploration', 'description': 'New', 'order': 99,
+                'careers': [{'title': 'Astronaut', 'possibility_rating': 'HP', 'order': 1}]
+            })
+        self.edit(change)
+
+        output = self.load()
+        self.assertIn('categories: 1 created, 2 updated, 0 deleted', output)
+        self.assertTrue(CareerBookmark.objects.filter(pk=bookmark.pk, career_id=kept.id).exists())
+        self.assertEqual(Career.objects.count(), careers - self.dropped[1] + 1)
+        self.assertFalse(Career.objects.filter(title=self.dropped[0], parent__isnull=True).exists())
+        self.assertTrue(CareerCategory.objects.filter(slug='space-exploration').exists())
+
+    def test_forced_reload_writes_nothing_for_an_unchanged_book(self):
+        self.load()
+        output = self.load(force=True)
+        self.assertIn('careers: 0 created, 0 updated, 0 deleted', output)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_dry_run_reports_changes_without_writing(self):
+        output = self.load(dry_run=True)
+        self.assertIn('Create SERVICE.json', output)
+        self.assertIn('DRY RUN: 1 book(s) to load, 0 invalid', output)
+        self.assertFalse(Book.objects.exists())
+
+    def test_invalid_files_are_reported_and_nothing_loads(self):
+        shutil.copy(os.path.join(BOOKS_DIR, 'GIVING.json'), self.dir)
+        self.edit(lambda book: book['categories'][0]['careers'][0].update(possibility_rating='XX'))
+
+        with self.assertRaisesMessage(CommandError, 'SERVICE.json'):
+            self.load(workers=2)
+        self.assertFalse(Book.objects.exists())
+
+    def test_clear_keeps_the_books_when_a_file_is_invalid(self):
+        self.load()
+        user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        BookAccess.objects.create(user=user, book=Book.objects.get(), access_reason='PRIMARY')
+        self.edit(lambda book: book['categories'][0]['careers'][0].update(possibility_rating='XX'))
+
+        with self.assertRaises(CommandError):
+            self.load(clear=True)
+        self.assertTrue(BookAccess.objects.filter(user=user, book__associated_gift='SERVICE').exists())
+
+    def test_clear_is_rolled_back_with_a_failed_load(self):
+        self.load()
+        with mock.patch(
+            'books.management.commands.load_career_books.apply_plans', side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            self.load(clear=True)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_clear_reloads_every_book(self):
+        self.load()
+        output = self.load(clear=True)
+        self.assertIn('Create SERVICE.json', output)
+        self.assertEqual(Book.objects.count(), 1)
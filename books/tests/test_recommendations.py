@@ -0,0 +1,116 @@
+import os
+import tempfile
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from assessments import similarity
+from assessments.models import Assessment, GiftProfile
+from books import recommendations
+from books.models import Book, BookAccess, Career, CareerBookmark, CareerChoice
+from books.tests import load_books
+
+User = get_user_model()
+
+SCORES = {
+    'PERCEPTION': 5.0, 'SERVICE': 80.0, 'TEACHING': 60.0, 'EXHORTATION': 5.0,
+    'GIVING': 5.0, 'ADMINISTRATION': 5.0, 'COMPASSION': 5.0,
+}
+
+
+class CareerRecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_books('SERVICE', 'TEACHING')
+        cls.user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        BookAccess.objects.create(
+            user=cls.user, book=Book.objects.get(associated_gift='SERVICE'), access_reason='PRIMARY'
+        )
+
+    def setUp(self):
+        recommendations.invalidate()
+        similarity.index_versions.invalidate()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_profile(self, scores, user=None):
+        user = user or self.user
+        assessment = Assessment.objects.create(user=user, completion_status=True, results_data={})
+        with self.captureOnCommitCallbacks(execute=True):
+            return GiftProfile.objects.create(
+                user=user, assessment=assessment, primary_gift='SERVICE',
+                secondary_gifts=['TEACHING'], scores=scores
+            )
+
+    def get(self, **params):
+        return self.client.get(reverse('book-recommendations'), params)
+
+    def test_careers_in_both_strong_gifts_rank_first(self):
+        self.add_profile(SCORES)
+        results = self.get(limit=5).json()['results']
+        self.assertEqual(len(results), 5)
+        top = results[0]
+        self.assertEqual(
+            {(m['gift'], m['possibility_rating']) for m in top['matches']},
+            {('SERVICE', 'HP'), ('TEACHING', 'HP')}
+        )
+        self.assertAlmostEqual(top['score'], (80 + 60) / 165, places=3)
+        self.assertEqual([m['gift'] for m in top['matches']], ['SERVICE', 'TEACHING'])
+        self.assertEqual([m['accessible'] for m in top['matches']], [True, False])
+        scores = [result['score'] for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_rankings_are_cached_per_profile(self):
+        profile = self.add_profile(SCORES)
+        matrix = recommendations.get_matrix()
+        first = matrix.ranking(profile.id, profile.scores)
+        self.assertIs(matrix.ranking(profile.id, profile.scores), first)
+
+        # A new assessment is a new profile and is ranked from its own scores
+        teaching = self.add_profile(dict(SCORES, SERVICE=5.0))
+        response = self.get(limit=1).json()
+        self.assertEqual(response['profile_id'], teaching.id)
+        self.assertEqual(response['results'][0]['matches'][0]['gift'], 'TEACHING')
+
+    def test_reloading_books_rebuilds_the_matrix(self):
+        matrix = recommendations.get_matrix()
+        self.assertIs(recommendations.get_matrix(), matrix)
+        empty_dir = tempfile.mkdtemp()
+        try:
+            call_command('load_career_books', clear=True, workers=1, path=empty_dir, stdout=StringIO())
+        finally:
+            os.rmdir(empty_dir)
+        self.assertEqual(len(recommendations.get_matrix()), 0)
+
+    def test_requires_a_gift_profile(self):
+        self.assertEqual(self.get().status_code, 404)
+
+    def test_peer_careers_come_from_the_closest_profiles(self):
+        self.add_profile(SCORES)
+        peer = User.objects.create_user(username='peer', email='peer@example.com', password='pw')
+        self.add_profile(SCORES, user=peer)
+        book = Book.objects.get(associated_gift='SERVICE')
+        chosen, bookmarked, mine = Career.objects.filter(category__book=book, parent=None)[:3]
+        CareerChoice.objects.create(user=peer, book=book, career_choice_1=chosen, career_choice_2=mine)
+        CareerBookmark.objects.create(user=peer, career=bookmarked)
+        CareerBookmark.objects.create(user=self.user, career=mine)
+
+        response = self.client.get(reverse('book-peer-careers'))
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([r['id'] for r in results], [chosen.id, bookmarked.id])
+        self.assertEqual(results[0]['peers'], 1)
+        self.assertAlmostEqual(results[0]['score'], 2.0)
+
+    def test_peer_careers_skip_books_the_user_cannot_access(self):
+        self.add_profile(SCORES)
+        peer = User.objects.create_user(username='peer', email='peer@example.com', password='pw')
+        self.add_profile(SCORES, user=peer)
+        locked = Career.objects.filter(category__book__associated_gift='TEACHING').first()
+        CareerBookmark.objects.create(user=peer, career=locked)
+
+        response = self.client.get(reverse('book-peer-careers'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from books import search
+from books.models import Book, BookAccess
+from books.tests import load_books
+
+User = get_user_model()
+
+
+class CareerSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_books('SERVICE', 'TEACHING')
+        cls.user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        BookAccess.objects.create(
+            user=cls.user, book=Book.objects.get(associated_gift='SERVICE'), access_reason='PRIMARY'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **params):
+        response = self.client.get(reverse('book-search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_prefix_search_ranks_title_matches_first(self):
+        results = self.get(q='agricul')
+        self.assertTrue(results)
+        self.assertIn('Agricultur', results[0]['title'])
+        self.assertEqual({r['associated_gift'] for r in results}, {'SERVICE'})
+
+    def test_all_words_must_match(self):
+        titles = [r['title'] for r in self.get(q='agricultural crop')]
+        self.assertEqual(titles[0], 'Agricultural Crop Farm Manager')
+        self.assertNotIn('Farmer', titles)
+
+    def test_rating_filter(self):
+        results = self.get(q='a', rating='VP')
+        self.assertTrue(results)
+        self.assertEqual({r['possibility_rating'] for r in results}, {'VP'})
+
+    def test_books_without_access_are_not_searched(self):
+        self.assertEqual(self.get(q='agricul', gift='TEACHING'), [])
+
+    def test_missing_query_is_rejected(self):
+        self.assertEqual(self.client.get(reverse('book-search')).status_code, 400)
+
+    def test_in_memory_index_matches_fts(self):
+        book_ids = [Book.objects.get(associated_gift='SERVICE').id]
+        for query in ('agricul', 'build', 'teach'):
+            fts = [career.id for career, _ in search.search_careers(query, book_ids, limit=100)]
+            with patch.object(search, 'uses_fts', return_value=False):
+                search.rebuild()
+                memory = [career.id for career, _ in search.search_careers(query, book_ids, limit=100)]
+            self.assertLess(len(fts), 100)
+            self.assertEqual(set(memory), set(fts), query)
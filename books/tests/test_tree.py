@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from books.models import Book, BookAccess, Career
+from books.services import book_content_cache
+from books.tests import load_books
+from books.tree import subtree
+
+User = get_user_model()
+
+
+class CareerTreeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_books('SERVICE')
+        cls.book = Book.objects.get(associated_gift='SERVICE')
+        cls.user = User.objects.create_user(username='reader', email='reader@example.com', password='pw')
+        BookAccess.objects.create(user=cls.user, book=cls.book, access_reason='PRIMARY')
+        cls.parent = Career.objects.filter(specializations__isnull=False).distinct().first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        book_content_cache.invalidate()
+
+    def test_loader_maintains_paths(self):
+        for career in Career.objects.select_related('parent'):
+            if career.parent is None:
+                self.assertEqual((career.path, career.depth), (f'{career.id:010d}/', 0))
+            else:
+                self.assertEqual(career.path, f'{career.parent.path}{career.id:010d}/')
+                self.assertEqual(career.depth, career.parent.depth + 1)
+
+    def test_subtree_is_one_query(self):
+        with self.assertNumQueries(1):
+            root = subtree(self.parent)
+            titles = [child.title for child in root.tree_children]
+        self.assertEqual(
+            titles, list(self.parent.specializations.order_by('order', 'id').values_list('title', flat=True))
+        )
+
+    def test_book_tree_endpoint(self):
+        response = self.client.get(reverse('book-career-tree', args=[self.book.id]))
+        self.assertEqual(response.status_code, 200)
+        roots = response.json()
+        self.assertEqual(len(roots), Career.objects.filter(parent__isnull=True).count())
+        nested = sum(len(root['children']) for root in roots)
+        self.assertEqual(nested, Career.objects.filter(parent__isnull=False).count())
+
+        response = self.client.get(reverse('book-career-tree', args=[self.book.id]), {'root': self.parent.id})
+        self.assertEqual(response.json()['id'], self.parent.id)
+
+    def test_table_of_contents_does_not_query_per_career(self):
+        # Book, categories, careers
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('book-table-of-contents', args=[self.book.id]))
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,50 @@
+"""
+Career hierarchy assembled from materialized paths.
+
+Each career stores the ids on its way down from its top-level career
+(``Career.path``) and its ``depth``, maintained by the book loader. A
+subtree is therefore a single range scan on the path index, and a whole
+book is one query on its categories' careers; ``assemble`` then links
+the rows into a tree in one pass, without querying per parent.
+"""
+
+from .models import Career
+
+
+def subtree_range(path):
+    """(low, high) bounds of the paths under `path`, itself included"""
+    # Paths end with '/', and '0' is the next character after it
+    return path, path[:-1] + '0'
+
+
+def assemble(careers):
+    """
+    Link careers to their children as `tree_children` and return the roots.
+
+    Works on rows in any order; children keep the order they were given in.
+    Careers whose parent is not among the rows are treated as roots.
+    """
+    careers = list(careers)
+    by_id = {career.id: career for career in careers}
+    roots = []
+    for career in careers:
+        career.tree_children = []
+    for career in careers:
+        parent = by_id.get(career.parent_id)
+        (parent.tree_children if parent is not None else roots).append(career)
+    return roots
+
+
+def book_tree(book):
+    """Top-level careers of a book with their specializations, in one query"""
+    return assemble(
+        Career.objects.filter(category__book=book).select_related('category').order_by('category__order', 'order', 'id')
+    )
+
+
+def subtree(career):
+    """`career` with all of its descendants attached, in one query"""
+    low, high = subtree_range(career.path)
+    nodes = Career.objects.filter(path__gte=low, path__lt=high).select_related('category').order_by('order', 'id')
+    roots = assemble(nodes)
+    return next((node for node in roots if node.id == career.id), None)
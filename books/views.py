@@ -8,12 +8,19 @@ from .serializers import (
     BookDetailSerializer,
     CategorySerializer,
     CareerSerializer,
+    CareerSearchResultSerializer,
+    CareerTreeSerializer,
     ReadingProgressSerializer,
     ReadingHistorySerializer,
     CareerChoiceSerializer,
     CareerResearchNoteSerializer
 )
-from .services import BookAccessService
+from .services import BookAccessService, BookContentService
+from .search import MAX_RESULTS, search_careers
+from . import recommendations
+from .tree import assemble, book_tree, subtree
+from assessments.models import GiftProfile
+from core.replica import replica_reads
 from datetime import timedelta
 from django.utils import timezone
 import pytz
@@ -58,19 +65,119 @@ class BookViewSet(viewsets.ReadOnlyModelViewSet):
         
         return Response(books_data)
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Search careers in the user's books by title, description and category.
+
+        Every word of `q` matches as a prefix. Optional filters: `rating`
+        (HP, VP, P) and `gift`, each repeatable or comma-separated; `limit`
+        caps the number of results.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter q is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), MAX_RESULTS)
+        except ValueError:
+            return Response(
+                {'error': 'limit must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def values(name):
+            return {
+                value.strip().upper()
+                for param in request.query_params.getlist(name)
+                for value in param.split(',') if value.strip()
+            }
+
+        hits = search_careers(
+            query,
+            book_ids=self.get_queryset().values_list('id', flat=True),
+            ratings=values('rating'),
+            gifts=values('gift'),
+            limit=limit,
+        )
+        scores = {career.id: score for career, score in hits}
+        careers = [career for career, _ in hits]
+        return Response(CareerSearchResultSerializer(careers, many=True, context={'scores': scores}).data)
+
+    @action(detail=False, methods=['get'])
+    def recommendations(self, request):
+        """
+        Careers ranked against the user's latest gift profile, with the gift
+        books that explain each one; `limit` caps the number of careers.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        profile = GiftProfile.objects.filter(user=request.user).order_by('-timestamp', '-id').only(
+            'id', 'score_vector', 'primary_gift'
+        ).first()
+        if profile is None:
+            return Response(
+                {'error': 'Complete an assessment to get career recommendations'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        results = recommendations.recommend(profile.id, profile.scores, limit)
+        accessible = set(self.get_queryset().values_list('id', flat=True))
+        for result in results:
+            for match in result['matches']:
+                match['accessible'] = match['book_id'] in accessible
+        return Response({
+            'profile_id': profile.id,
+            'primary_gift': profile.primary_gift,
+            'results': results,
+        })
+
+    @action(detail=False, methods=['get'])
+    def peer_careers(self, request):
+        """
+        Careers in the user's books chosen or bookmarked by the users whose
+        gift profiles are closest to the user's; `limit` caps the number of
+        careers.
+        """
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Only careers from books the user can read, as in search
+        suggestions = recommendations.peer_careers(
+            request.user.id, self.get_queryset().values_list('id', flat=True), limit=limit
+        )
+        scores = {career.id: score for career, score, _ in suggestions}
+        data = CareerSearchResultSerializer(
+            [career for career, _, _ in suggestions], many=True, context={'scores': scores}
+        ).data
+        for item, (_, _, peers) in zip(data, suggestions):
+            item['peers'] = peers
+        return Response(data)
+
     @action(detail=True, methods=['get'])
     def table_of_contents(self, request, pk=None):
         """Get book's table of contents with categories and careers"""
         try:
             book = self.get_object()
-            categories = book.categories.all().prefetch_related('careers').order_by('order')
+            contents = BookContentService.get_table_of_contents(book)
             
-            if not categories.exists():
+            if not contents:
                 return Response({
                     'error': 'No content available for this book yet'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            return Response(CategorySerializer(categories, many=True).data)
+            return Response(contents)
         except Exception as e:
             return Response({
                 'error': str(e)
@@ -147,11 +254,27 @@ class BookViewSet(viewsets.ReadOnlyModelViewSet):
     def careers(self, request, pk=None):
         """Get all careers listed in the book"""
         book = self.get_object()
-        careers = Career.objects.filter(
+        careers = list(Career.objects.filter(
             category__book=book
-        ).select_related('category')
+        ).select_related('category'))
+        assemble(careers)
         return Response(CareerSerializer(careers, many=True).data)
 
+    @action(detail=True, methods=['get'])
+    def career_tree(self, request, pk=None):
+        """Careers of the book as a tree; `root` narrows it to one career's subtree"""
+        book = self.get_object()
+        root = request.query_params.get('root')
+        if root is None:
+            return Response(CareerTreeSerializer(book_tree(book), many=True).data)
+        if not root.isdigit():
+            return Response(
+                {'error': 'root must be a career id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        career = get_object_or_404(Career, pk=root, category__book=book)
+        return Response(CareerTreeSerializer(subtree(career)).data)
+
     @action(detail=True, methods=['post'])
     def bookmark_career(self, request, pk=None):
         """Bookmark a career for later reference"""
@@ -184,6 +307,7 @@ class BookViewSet(viewsets.ReadOnlyModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @action(detail=True, methods=['get'])
+    @replica_reads
     def reading_history(self, request, pk=None):
         """Get user's reading history for this book"""
         try:
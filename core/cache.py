@@ -0,0 +1,204 @@
+"""
+Namespaced cache helpers shared by the app services.
+
+Wraps a Django cache alias (Redis, the SQLite file cache or LocMem) with:
+
+- namespaces whose keys carry a generation number, so a whole namespace
+  is invalidated across every worker by bumping one counter;
+- ``get_or_set`` with stampede protection: a single worker recomputes a
+  missing value while the others wait for it, and hot values are refreshed
+  slightly before they expire (probabilistic early expiration);
+- per-process hit/miss/recompute counters for monitoring.
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheMetrics:
+    """Thread-safe per-process counters keyed by namespace"""
+
+    EVENTS = ('hits', 'misses', 'early_refreshes', 'recomputes', 'lock_waits', 'invalidations')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: dict.fromkeys(self.EVENTS, 0))
+
+    def record(self, namespace, event):
+        with self._lock:
+            self._counts[namespace][event] += 1
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for namespace, counts in self._counts.items():
+                lookups = counts['hits'] + counts['misses']
+                result[namespace] = dict(
+                    counts,
+                    hit_ratio=round(counts['hits'] / lookups, 4) if lookups else None
+                )
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = CacheMetrics()
+
+
+class CacheNamespace:
+    """
+    A group of related cache keys that can be invalidated together.
+
+    Args:
+        name: prefix for every key in the namespace
+        timeout: default time-to-live in seconds
+        alias: Django cache alias to use
+        beta: early-expiration aggressiveness; 0 disables early refresh
+        lock_timeout: how long a recompute may hold the single-flight lock
+    """
+
+    def __init__(self, name, timeout=300, alias='default', beta=1.0, lock_timeout=30):
+        self.name = name
+        self.timeout = timeout
+        self.alias = alias
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def _generation_key(self):
+        return f'ns:{self.name}:generation'
+
+    def generation(self):
+        generation = self.cache.get(self._generation_key)
+        if generation is None:
+            self.cache.add(self._generation_key, 1, None)
+            generation = self.cache.get(self._generation_key, 1)
+        return generation
+
+    def make_key(self, key):
+        return f'{self.name}:{self.generation()}:{key}'
+
+    def get(self, key, default=None):
+        envelope = self.cache.get(self.make_key(key), _MISSING)
+        if envelope is _MISSING:
+            metrics.record(self.name, 'misses')
+            return default
+        metrics.record(self.name, 'hits')
+        return envelope[0]
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        self._store(self.make_key(key), value, 0.0, timeout)
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
+
+    def invalidate(self):
+        """Drop every key in the namespace by moving to a new generation"""
+        try:
+            self.cache.incr(self._generation_key)
+        except ValueError:
+            self.cache.add(self._generation_key, 2, None)
+        metrics.record(self.name, 'invalidations')
+
+    def incr(self, key, delta=1, timeout=None):
+        """
+        Increment a shared counter, creating it with a time-to-live on first use.
+
+        The counter window starts at the first increment, which is what fixed
+        window rate limits need.
+        """
+        full_key = self.make_key(key)
+        timeout = self.timeout if timeout is None else timeout
+        self.cache.add(full_key, 0, timeout)
+        try:
+            return self.cache.incr(full_key, delta)
+        except ValueError:
+            # Expired between add() and incr(); start a fresh window
+            self.cache.set(full_key, delta, timeout)
+            return delta
+
+    def count(self, key):
+        """Current value of a counter created by incr(), 0 if unset"""
+        return self.cache.get(self.make_key(key), 0)
+
+    def get_or_set(self, key, compute, timeout=None):
+        """
+        Return the cached value for `key`, calling `compute()` to fill it.
+
+        Only one worker recomputes a missing key at a time; the others poll
+        for its result for up to `lock_timeout` seconds before computing it
+        themselves. A value close to expiry is refreshed early by a single
+        worker while everyone else keeps serving the current copy.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        full_key = self.make_key(key)
+        envelope = self.cache.get(full_key, _MISSING)
+
+        if envelope is not _MISSING:
+            value, delta, expires_at = envelope
+            if not self._should_refresh(delta, expires_at):
+                metrics.record(self.name, 'hits')
+                return value
+            # Refresh early only if nobody else is already doing it
+            if not self._acquire(full_key):
+                metrics.record(self.name, 'hits')
+                return value
+            metrics.record(self.name, 'early_refreshes')
+            return self._recompute(full_key, compute, timeout)
+
+        metrics.record(self.name, 'misses')
+        if self._acquire(full_key):
+            return self._recompute(full_key, compute, timeout)
+
+        metrics.record(self.name, 'lock_waits')
+        deadline = time.monotonic() + self.lock_timeout
+        wait = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(wait)
+            envelope = self.cache.get(full_key, _MISSING)
+            if envelope is not _MISSING:
+                return envelope[0]
+            wait = min(wait * 2, 0.5)
+        logger.warning(f"Cache lock for {full_key} timed out; computing without it")
+        return self._recompute(full_key, compute, timeout, locked=False)
+
+    def _should_refresh(self, delta, expires_at):
+        if not self.beta or expires_at is None:
+            return False
+        # XFetch: refresh with rising probability as expiry approaches,
+        # scaled by how long the value took to compute
+        return time.time() - delta * self.beta * math.log(random.random() or 1e-12) >= expires_at
+
+    def _acquire(self, full_key):
+        return self.cache.add(f'{full_key}:lock', 1, self.lock_timeout)
+
+    def _recompute(self, full_key, compute, timeout, locked=True):
+        try:
+            started = time.monotonic()
+            value = compute()
+            self._store(full_key, value, time.monotonic() - started, timeout)
+            metrics.record(self.name, 'recomputes')
+            return value
+        finally:
+            if locked:
+                self.cache.delete(f'{full_key}:lock')
+
+    def _store(self, full_key, value, delta, timeout):
+        expires_at = None if timeout is None else time.time() + timeout
+        self.cache.set(full_key, (value, delta, expires_at), timeout)
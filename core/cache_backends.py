@@ -0,0 +1,187 @@
+"""
+SQLite-backed Django cache backend.
+
+Every gunicorn and uvicorn worker on the host opens the same database file,
+so cached values (tokens, content trees, counters) are shared between
+processes without running a separate cache server. Redis remains the
+preferred backend when it is available; see ``CACHES`` in settings.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+CULL_CHECK_INTERVAL = 100
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache backend storing pickled values in a standalone SQLite file.
+
+    LOCATION is the path of the database file. The file is opened in WAL
+    mode so readers never block the single writer, and each thread (and
+    each forked worker) keeps its own connection.
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        options = params.get('OPTIONS', {})
+        self._busy_timeout = int(options.get('BUSY_TIMEOUT', 5000))
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not be shared with a parent process after fork
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self._path,
+                timeout=self._busy_timeout / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={self._busy_timeout}')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires)'
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _expiry(self, timeout):
+        # BaseCache returns an absolute timestamp, or None for no expiry
+        return self.get_backend_timeout(timeout)
+
+    def _live(self, expires):
+        return expires is None or expires > time.time()
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None or not self._live(row[1]):
+            return default
+        return pickle.loads(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(k, version=version): k for k in keys}
+        if not key_map:
+            return {}
+        placeholders = ','.join('?' * len(key_map))
+        rows = self._connection().execute(
+            f'SELECT key, value, expires FROM cache_entries WHERE key IN ({placeholders})',
+            list(key_map),
+        ).fetchall()
+        return {
+            key_map[key]: pickle.loads(value)
+            for key, value, expires in rows
+            if self._live(expires)
+        }
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+            (key, pickle.dumps(value, self.pickle_protocol), self._expiry(timeout)),
+        )
+        self._maybe_cull(conn)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """Atomically store `value` only if `key` is absent or expired"""
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        cursor = conn.execute(
+            'INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache_entries.expires IS NOT NULL AND cache_entries.expires <= ?',
+            (key, pickle.dumps(value, self.pickle_protocol), self._expiry(timeout), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache_entries SET expires = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expiry(timeout), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        """Atomic read-modify-write so counters are exact across workers"""
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or not self._live(row[1]):
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            conn.execute(
+                'UPDATE cache_entries SET value = ? WHERE key = ?',
+                (pickle.dumps(value, self.pickle_protocol), key),
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'DELETE FROM cache_entries WHERE key = ?', (key,)
+        )
+        return cursor.rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT expires FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return row is not None and self._live(row[0])
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')
+
+    def _maybe_cull(self, conn):
+        """Drop expired rows, then a fraction of the oldest when over MAX_ENTRIES"""
+        # Counting rows is a table scan, so only check every CULL_CHECK_INTERVAL writes
+        self._local.writes = getattr(self._local, 'writes', 0) + 1
+        if self._local.writes % CULL_CHECK_INTERVAL:
+            return
+        count = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        conn.execute('DELETE FROM cache_entries WHERE expires <= ?', (time.time(),))
+        if self._cull_frequency == 0:
+            conn.execute('DELETE FROM cache_entries')
+            return
+        count = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count > self._max_entries:
+            conn.execute(
+                'DELETE FROM cache_entries WHERE key IN ('
+                'SELECT key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?)',
+                (count // self._cull_frequency,),
+            )
+
+    def close(self, **kwargs):
+        # Connections are reused for the lifetime of the worker thread
+        pass
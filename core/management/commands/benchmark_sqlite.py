@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from pathfinders_project.database import SQLITE_PRAGMAS, sqlite_pragma_statements
+
+
+def _open(path, tuned):
+    if tuned:
+        conn = sqlite3.connect(path, timeout=SQLITE_PRAGMAS['busy_timeout'] / 1000, isolation_level=None)
+        for statement in sqlite_pragma_statements(SQLITE_PRAGMAS):
+            conn.execute(statement)
+    else:
+        # Python's sqlite3 defaults, as used by the untuned Django backend
+        conn = sqlite3.connect(path, isolation_level=None)
+    return conn
+
+
+def _worker(path, tuned, seconds, write_ratio, seed, results):
+    random.seed(seed)
+    conn = _open(path, tuned)
+    begin = 'BEGIN IMMEDIATE' if tuned else 'BEGIN'
+    reads = writes = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if random.random() < write_ratio:
+                # Roughly one assessment submission: a row plus its profile
+                conn.execute(begin)
+                cursor = conn.execute(
+                    'INSERT INTO bench_assessment (user_id, results) VALUES (?, ?)',
+                    (random.randint(1, 1000), 'x' * 2000)
+                )
+                conn.execute(
+                    'INSERT INTO bench_profile (assessment_id, score) VALUES (?, ?)',
+                    (cursor.lastrowid, random.random())
+                )
+                conn.execute('COMMIT')
+                writes += 1
+            else:
+                # A dashboard-style read
+                user_id = random.randint(1, 1000)
+                conn.execute(
+                    'SELECT COUNT(*), AVG(p.score) FROM bench_assessment a '
+                    'JOIN bench_profile p ON p.assessment_id = a.id WHERE a.user_id = ?',
+                    (user_id,)
+                ).fetchone()
+                reads += 1
+        except sqlite3.OperationalError:
+            errors += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+    conn.close()
+    results.put((reads, writes, errors))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark default vs tuned SQLite settings under concurrent mixed read/write load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent processes (default: 4)')
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run (default: 5)')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Fraction of operations that write (default: 0.2)')
+        parser.add_argument('--rows', type=int, default=20000, help='Rows preloaded before each run (default: 20000)')
+
+    def handle(self, *args, **options):
+        for tuned in (False, True):
+            label = 'tuned' if tuned else 'default'
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, 'bench.sqlite3')
+                self._prepare(path, tuned, options['rows'])
+                reads, writes, errors = self._run(path, tuned, options)
+            total = reads + writes
+            self.stdout.write(
+                f"{label:>8}: {total / options['seconds']:>9.0f} ops/s "
+                f"({reads} reads, {writes} writes, {errors} lock errors) "
+                f"with {options['workers']} workers"
+            )
+
+    def _prepare(self, path, tuned, rows):
+        conn = _open(path, tuned)
+        conn.execute('CREATE TABLE bench_assessment (id INTEGER PRIMARY KEY, user_id INTEGER, results TEXT)')
+        conn.execute('CREATE INDEX bench_assessment_user ON bench_assessment (user_id)')
+        conn.execute('CREATE TABLE bench_profile (id INTEGER PRIMARY KEY, assessment_id INTEGER, score REAL)')
+        conn.execute('CREATE INDEX bench_profile_assessment ON bench_profile (assessment_id)')
+        conn.execute('BEGIN')
+        for i in range(1, rows + 1):
+            conn.execute(
+                'INSERT INTO bench_assessment (id, user_id, results) VALUES (?, ?, ?)',
+                (i, random.randint(1, 1000), 'x' * 2000)
+            )
+            conn.execute('INSERT INTO bench_profile (assessment_id, score) VALUES (?, ?)', (i, random.random()))
+        conn.execute('COMMIT')
+        conn.close()
+
+    def _run(self, path, tuned, options):
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(path, tuned, options['seconds'], options['write_ratio'], seed, results)
+            )
+            for seed in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        return tuple(sum(column) for column in zip(*totals))
@@ -0,0 +1,63 @@
+import multiprocessing
+import signal
+from django.core.management.base import BaseCommand
+from django.db import connections
+from core import tasks
+
+
+class _Stop:
+    requested = False
+
+
+def _worker(poll_interval, burst):
+    stop = _Stop()
+
+    def request_stop(signum, frame):
+        stop.requested = True
+
+    # Finish the current task, then exit
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    processed = tasks.work(poll_interval, burst, should_stop=lambda: stop.requested)
+    connections.close_all()
+    return processed
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks (book access grants, notifications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes (default: 1)')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls when idle (default: 1)')
+        parser.add_argument('--burst', action='store_true', help='Exit once no task is due')
+        parser.add_argument('--purge', type=int, metavar='DAYS', help='Delete finished tasks older than DAYS and exit')
+
+    def handle(self, *args, **options):
+        if options['purge'] is not None:
+            deleted = tasks.purge(options['purge'])
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} finished tasks'))
+            return
+
+        if options['processes'] <= 1:
+            processed = _worker(options['poll_interval'], options['burst'])
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} tasks'))
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(options['poll_interval'], options['burst']))
+            for _ in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+
+        def forward(signum, frame):
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS(f"{options['processes']} workers stopped"))
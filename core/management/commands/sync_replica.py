@@ -0,0 +1,34 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from pathfinders_project.database import REPLICA_ALIAS, replicate_sqlite
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the read replica file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and re-sync every N seconds (default: sync once)'
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError('No replica configured; set DATABASE_REPLICA_NAME')
+
+        source = connections['default'].settings_dict['NAME']
+        target = connections[REPLICA_ALIAS].settings_dict['NAME']
+
+        while True:
+            started = time.monotonic()
+            replicate_sqlite(source, target)
+            self.stdout.write(self.style.SUCCESS(
+                f'Replicated {source} -> {target} in {time.monotonic() - started:.2f}s'
+            ))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_payment_message_payment_mtn_transaction_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', 'payment_type', '-created_at', '-id'], name='payment_user_type_created'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_type', '-created_at', '-id'], name='payment_type_created'),
+        ),
+    ]
@@ -28,6 +28,13 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of donation history (DonationListView)
+            models.Index(fields=['user', 'payment_type', '-created_at', '-id'], name='payment_user_type_created'),
+            models.Index(fields=['payment_type', '-created_at', '-id'], name='payment_type_created'),
+        ]
+
     def __str__(self):
         if self.payment_type == 'donation':
             return f"Donation of {self.amount} {self.currency} from {self.user}"
@@ -81,3 +88,38 @@ class Payment(models.Model):
             return False
         cutoff_time = timezone.now() - timezone.timedelta(hours=hours_old)
         return self.created_at < cutoff_time
+
+
+class Task(models.Model):
+    """A unit of deferred work run by `manage.py run_tasks` (see core/tasks.py)"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Claiming the next due task
+            models.Index(fields=['status', 'run_after'], name='task_status_run_after'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
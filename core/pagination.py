@@ -0,0 +1,66 @@
+import base64
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor we did not issue"""
+
+
+def encode_cursor(created_at, pk):
+    """Encode a (created_at, id) keyset position as an opaque URL-safe token"""
+    raw = f"{created_at.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor back into (created_at, id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded).decode('utf-8').rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token}") from e
+
+
+def keyset_queryset(queryset, cursor=None):
+    """
+    Order a queryset newest-first on (created_at, id) and seek past `cursor`.
+
+    Rows strictly after the cursor position are returned, so pages stay
+    stable while new rows are inserted and each page is a single indexed
+    range scan regardless of how deep the client has paged.
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) |
+            Q(created_at=created_at, id__lt=pk)
+        )
+    return queryset
+
+
+def keyset_page(queryset, cursor=None, limit=50):
+    """
+    Fetch one page of a values() queryset.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page. One
+    extra row is read to detect whether another page exists.
+    """
+    rows = list(keyset_queryset(queryset, cursor)[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last['created_at'], last['id'])
+
+
+def ndjson_lines(rows, transform=None):
+    """Yield one JSON document per row, newline-delimited"""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        if transform:
+            row = transform(row)
+        yield encoder.encode(row) + '\n'
@@ -0,0 +1,123 @@
+"""
+Read replica routing for reporting endpoints.
+
+Views decorated with ``replica_reads`` run their ORM reads against the
+``replica`` database alias when one is configured. A user who has just
+written something is pinned to the primary for ``REPLICA_STICKY_SECONDS``
+so they always read their own writes, however far the replica lags.
+Everything else, and every write, goes to ``default``.
+"""
+
+import contextvars
+import functools
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from core.cache import CacheNamespace
+from pathfinders_project.database import REPLICA_ALIAS
+
+_replica_allowed = contextvars.ContextVar('replica_allowed', default=False)
+_wrote = contextvars.ContextVar('wrote', default=False)
+
+sticky_users = CacheNamespace(
+    'db-sticky',
+    timeout=getattr(settings, 'REPLICA_STICKY_SECONDS', 30),
+    beta=0,
+)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def _sticky_key(user):
+    return f'user:{user.pk}'
+
+
+def replica_reads(view_method):
+    """Allow a view method's reads to be served from the replica"""
+
+    @functools.wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        user = getattr(request, 'user', None)
+        allowed = replica_configured() and not (
+            user is not None and user.is_authenticated
+            and sticky_users.get(_sticky_key(user))
+        )
+        token = _replica_allowed.set(allowed)
+        try:
+            return view_method(view, request, *args, **kwargs)
+        finally:
+            _replica_allowed.reset(token)
+
+    return wrapper
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin users to the primary for a short while after they write.
+
+    Async-capable so async views under ASGI are not funnelled through the
+    single thread Django uses to run sync middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            user = getattr(request, 'user', None)
+            if _wrote.get() and replica_configured() and user is not None and user.is_authenticated:
+                sticky_users.set(_sticky_key(user), True)
+            return response
+        finally:
+            _wrote.reset(token)
+
+    async def __acall__(self, request):
+        token = _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+            if _wrote.get() and replica_configured() and hasattr(request, 'auser'):
+                user = await request.auser()
+                if user.is_authenticated:
+                    await sync_to_async(sticky_users.set)(_sticky_key(user), True)
+            return response
+        finally:
+            _wrote.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads of opted-in views to the replica; writes always to primary.
+
+    Returns None when it has no opinion so later routers (and Django's
+    default of following the instance's database) still apply.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_allowed.get() or _wrote.get():
+            return None
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Later reads in this request must see the write
+        _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
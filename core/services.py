@@ -1,8 +1,10 @@
+import asyncio
 import requests
 import uuid
 import base64
 import hashlib
 import time
+import weakref
 import httpx
 from django.conf import settings
 from decimal import Decimal
@@ -10,9 +12,42 @@ from typing import Dict, Any
 import os
 import logging
 import time
+from core.cache import CacheNamespace
 
 logger = logging.getLogger(__name__)
 
+# MTN access tokens expire after 3600s; refresh a few minutes early
+mtn_token_cache = CacheNamespace('mtn-token', timeout=3300)
+
+
+class MTNTokenUnavailable(Exception):
+    """Raised inside the token cache fill so failures are not cached"""
+
+
+# One pooled AsyncClient per event loop: connections to FastAPI are reused
+# across requests instead of a TCP handshake per submission. httpx clients
+# cannot be shared between loops, hence the per-loop mapping.
+_async_clients = weakref.WeakKeyDictionary()
+ASYNC_CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def get_async_client():
+    """Pooled httpx.AsyncClient for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=ASYNC_CLIENT_LIMITS)
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Close the running loop's pooled client, e.g. on ASGI lifespan shutdown"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 class FastAPIClient:
     """
     Client for communicating with the FastAPI service for gift calculations
@@ -76,36 +111,36 @@ class FastAPIClient:
         raise ValueError(f"FastAPI calculation failed: {last_error}")
 
     async def calculate_gifts(self, data):
-        """Asynchronous request to FastAPI calculate-gifts endpoint"""
+        """Asynchronous request to FastAPI calculate-gifts endpoint on the pooled client"""
         logger.info(f"Attempting async connection to FastAPI at {self.base_url}/calculate-gifts/")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                logger.debug(f"Async request data: user_id={data.get('user_id')}, answers count={len(data.get('answers', []))}")
-                
-                response = await client.post(
-                    f"{self.base_url}/calculate-gifts/",
-                    json=data,
-                    timeout=self.timeout,
-                    headers={
-                        'X-API-Key': os.getenv('API_KEY', ''),  # Add API key for security
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Log success
-                logger.info(f"Successfully calculated gifts async: primary={result.get('primary_gift')}")
-                return result
-                
-            except httpx.HTTPError as e:
-                error_msg = f"FastAPI async HTTP error: {str(e)}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            except Exception as e:
-                error_msg = f"FastAPI async unexpected error: {str(e)}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+
+        client = get_async_client()
+        try:
+            logger.debug(f"Async request data: user_id={data.get('user_id')}, answers count={len(data.get('answers', []))}")
+
+            response = await client.post(
+                f"{self.base_url}/calculate-gifts/",
+                json=data,
+                timeout=self.timeout,
+                headers={
+                    'X-API-Key': os.getenv('API_KEY', ''),  # Add API key for security
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            # Log success
+            logger.info(f"Successfully calculated gifts async: primary={result.get('primary_gift')}")
+            return result
+
+        except httpx.HTTPError as e:
+            error_msg = f"FastAPI async HTTP error: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        except Exception as e:
+            error_msg = f"FastAPI async unexpected error: {str(e)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
 
     async def save_progress(self, user_id: int, progress_data: Dict[str, Any]) -> Dict[str, Any]:
         """Save assessment progress"""
@@ -136,7 +171,7 @@ class FastAPIClient:
 
     async def close(self):
         """Close the client connection"""
-        # This method is kept for backward compatibility
+        # The pooled client outlives requests; kept for backward compatibility
         pass
 
 
@@ -272,6 +307,24 @@ class MTNMobileMoneyService:
         return True
     
     def _get_access_token(self):
+        """
+        Get an access token shared by every worker through the cache.
+
+        Tokens are valid for an hour; only one worker requests a new token
+        when the cached one expires, so API users are not created per request.
+        """
+        def fetch():
+            token = self._request_access_token()
+            if not token:
+                raise MTNTokenUnavailable()
+            return token
+
+        try:
+            return mtn_token_cache.get_or_set('access_token', fetch)
+        except MTNTokenUnavailable:
+            return None
+
+    def _request_access_token(self):
         """
         Get access token using OAuth 2.0 with API credentials
         """
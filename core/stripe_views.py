@@ -21,6 +21,9 @@ from rest_framework.response import Response
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from core.models import Payment
+from core.pagination import InvalidCursor, keyset_page, keyset_queryset, ndjson_lines
+from django.http import StreamingHttpResponse
+from core.replica import replica_reads
 import stripe
 from decimal import Decimal
 from django.utils import timezone
@@ -605,36 +608,76 @@ class MTNWebhookView(views.APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+DONATION_FIELDS = (
+    'id', 'amount', 'currency', 'payment_method', 'paid', 'message',
+    'created_at', 'updated_at', 'stripe_payment_intent', 'mtn_transaction_id',
+)
+DONATION_PAGE_SIZE = 100
+DONATION_MAX_PAGE_SIZE = 500
+NDJSON_CHUNK_SIZE = 2000
+
+
+def _donation_row(row):
+    """Convert a values() row into the donation response shape"""
+    row['amount'] = float(row['amount'])
+    row['created_at'] = row['created_at'].isoformat()
+    row['updated_at'] = row['updated_at'].isoformat()
+    return row
+
+
 class DonationListView(views.APIView):
+    """
+    List donations newest-first using (created_at, id) keyset pagination.
+
+    Query parameters:
+        cursor: opaque token returned as `next_cursor` by the previous page
+        limit: page size (default 100, max 500)
+        stream=ndjson: stream every donation after `cursor` as
+            newline-delimited JSON instead of returning a single page
+    """
     permission_classes = [permissions.IsAuthenticated]
-    
+    fields = DONATION_FIELDS
+
+    def get_queryset(self, request):
+        return Payment.objects.filter(
+            user=request.user,
+            payment_type='donation'
+        )
+
+    @replica_reads
     def get(self, request):
         """Get user's donation history"""
+        cursor = request.query_params.get('cursor')
         try:
-            donations = Payment.objects.filter(
-                user=request.user,
-                payment_type='donation'
-            ).order_by('-created_at')
-            
-            donation_data = []
-            for donation in donations:
-                donation_data.append({
-                    'id': donation.id,
-                    'amount': float(donation.amount),
-                    'currency': donation.currency,
-                    'payment_method': donation.payment_method,
-                    'paid': donation.paid,
-                    'message': donation.message,
-                    'created_at': donation.created_at.isoformat(),
-                    'updated_at': donation.updated_at.isoformat(),
-                    'stripe_payment_intent': donation.stripe_payment_intent,
-                    'mtn_transaction_id': donation.mtn_transaction_id,
-                })
-            
+            limit = int(request.query_params.get('limit', DONATION_PAGE_SIZE))
+        except ValueError:
             return Response({
-                'donations': donation_data
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, DONATION_MAX_PAGE_SIZE))
+
+        try:
+            queryset = self.get_queryset(request).values(*self.fields)
+
+            if request.query_params.get('stream') == 'ndjson':
+                rows = keyset_queryset(queryset, cursor)
+                # Resolve the database now; the stream is consumed after get() returns
+                rows = rows.using(rows.db).iterator(chunk_size=NDJSON_CHUNK_SIZE)
+                return StreamingHttpResponse(
+                    ndjson_lines(rows, _donation_row),
+                    content_type='application/x-ndjson'
+                )
+
+            rows, next_page = keyset_page(queryset, cursor, limit)
+            return Response({
+                'donations': [_donation_row(row) for row in rows],
+                'next_cursor': next_page
             })
-            
+
+        except InvalidCursor as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error fetching donations: {str(e)}")
             return Response({
@@ -642,6 +685,29 @@ class DonationListView(views.APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class AdminDonationListView(DonationListView):
+    """Donations across all users for staff; same pagination and streaming"""
+    permission_classes = [permissions.IsAdminUser]
+    fields = DONATION_FIELDS + ('user_id',)
+
+    def get(self, request):
+        user_id = request.query_params.get('user_id')
+        if user_id and not user_id.isdigit():
+            return Response({
+                'error': 'user_id must be a user id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return super().get(request)
+
+    def get_queryset(self, request):
+        queryset = Payment.objects.filter(payment_type='donation')
+        user_id = request.query_params.get('user_id')
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if request.query_params.get('paid') in ('true', 'false'):
+            queryset = queryset.filter(paid=request.query_params['paid'] == 'true')
+        return queryset
+
+
 class CancelDonationView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
     
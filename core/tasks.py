@@ -0,0 +1,166 @@
+"""
+Database-backed task queue for work that can run after the response.
+
+Tasks are rows of ``core.Task``, so no broker is needed. Enqueue a task in
+the same transaction as the data it acts on: it exists exactly when that
+data was committed. Workers (``manage.py run_tasks``) claim due tasks with a
+conditional UPDATE, so any number of processes can share the table, and
+retry failures with exponential backoff. An idempotency key makes enqueueing
+the same work twice a no-op.
+
+Handlers live in each app's ``tasks.py``, which is imported on startup::
+
+    @task('assessments.grant_book_access')
+    def grant_book_access(gift_profile_id):
+        ...
+
+With TASKS_ALWAYS_EAGER, tasks run in-process right after their transaction
+commits instead, which suits development and tests.
+"""
+
+import logging
+import time
+import traceback
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+
+
+def task(name, max_attempts=5):
+    """Register a function as the handler for task `name`"""
+    def decorator(func):
+        _registry[name] = func
+        func.task_name = name
+        func.max_attempts = max_attempts
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, idempotency_key=None, delay=0):
+    """
+    Queue task `name` with JSON-serialisable keyword arguments `payload`.
+
+    Returns the task; when `idempotency_key` was already used, the existing
+    task is returned and nothing new is queued.
+    """
+    handler = _registry.get(name)
+    if handler is None:
+        raise LookupError(f"Unknown task: {name}")
+
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'max_attempts': handler.max_attempts,
+        'run_after': timezone.now() + timedelta(seconds=delay),
+    }
+    if idempotency_key:
+        queued, created = Task.objects.get_or_create(idempotency_key=idempotency_key, defaults=fields)
+    else:
+        queued, created = Task.objects.create(**fields), True
+
+    if created and getattr(settings, 'TASKS_ALWAYS_EAGER', False) and not delay:
+        transaction.on_commit(lambda: run_task(queued.pk))
+    return queued
+
+
+def _due(now):
+    # Pending and due, or running with an expired lease (its worker died)
+    return Q(status=Task.PENDING, run_after__lte=now) | Q(status=Task.RUNNING, locked_until__lt=now)
+
+
+def claim(pk=None):
+    """
+    Claim a due task for this worker, or the task `pk` if it is due.
+
+    The status check and update happen in one statement, so two workers
+    never claim the same task.
+    """
+    now = timezone.now()
+    lease = timezone.now() + timedelta(seconds=getattr(settings, 'TASKS_LEASE_SECONDS', 300))
+    candidates = Task.objects.filter(_due(now))
+    if pk is not None:
+        candidates = candidates.filter(pk=pk)
+    for candidate in candidates.order_by('run_after', 'id').values_list('pk', flat=True)[:10]:
+        claimed = Task.objects.filter(_due(now), pk=candidate).update(
+            status=Task.RUNNING,
+            locked_until=lease,
+            attempts=F('attempts') + 1,
+            # QuerySet.update() skips auto_now; purge() relies on updated_at
+            updated_at=now,
+        )
+        if claimed:
+            return Task.objects.using('default').get(pk=candidate)
+    return None
+
+
+def execute(claimed):
+    """Run a claimed task, recording success or scheduling a retry. Returns True on success."""
+    handler = _registry.get(claimed.name)
+    try:
+        if handler is None:
+            raise LookupError(f"Unknown task: {claimed.name}")
+        handler(**claimed.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if claimed.attempts >= claimed.max_attempts:
+            logger.error(f"Task {claimed.pk} {claimed.name} failed permanently: {error}")
+            status, run_after = Task.FAILED, claimed.run_after
+        else:
+            backoff = min(RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1), RETRY_MAX_SECONDS)
+            logger.warning(f"Task {claimed.pk} {claimed.name} failed, retrying in {backoff}s: {error}")
+            status, run_after = Task.PENDING, timezone.now() + timedelta(seconds=backoff)
+        Task.objects.filter(pk=claimed.pk).update(
+            status=status, run_after=run_after, locked_until=None, last_error=error,
+            updated_at=timezone.now()
+        )
+        return False
+
+    Task.objects.filter(pk=claimed.pk).update(
+        status=Task.DONE, locked_until=None, last_error='', updated_at=timezone.now()
+    )
+    return True
+
+
+def run_task(pk):
+    """Claim and run one specific task now, if nobody else has"""
+    claimed = claim(pk)
+    if claimed is None:
+        return False
+    return execute(claimed)
+
+
+def work(poll_interval=1.0, burst=False, should_stop=lambda: False):
+    """
+    Process tasks until `should_stop()` is true.
+
+    With `burst`, return as soon as no task is due. Returns the number of
+    tasks processed.
+    """
+    processed = 0
+    while not should_stop():
+        claimed = claim()
+        if claimed is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        execute(claimed)
+        processed += 1
+    return processed
+
+
+def purge(days=7):
+    """Delete tasks finished more than `days` ago; failed tasks are kept for inspection"""
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Task.objects.filter(status=Task.DONE, updated_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+import threading
+import time
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from core.cache import CacheNamespace, metrics
+
+class SQLiteCacheTestCase(SimpleTestCase):
+    """Runs against a throwaway SQLite cache file standing in for Redis"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.override = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'core.cache_backends.SQLiteCache',
+                'LOCATION': f'{self.tmpdir}/cache.sqlite3',
+            }
+        })
+        self.override.enable()
+        self.cache = caches['default']
+        metrics.reset()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.tmpdir)
+
+class SQLiteCacheBackendTests(SQLiteCacheTestCase):
+    def test_set_get_expiry(self):
+        self.cache.set('a', {'x': 1}, 60)
+        self.cache.set('b', 2, 0.05)
+        self.assertEqual(self.cache.get('a'), {'x': 1})
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get_many(['a', 'b']), {'a': {'x': 1}})
+
+    def test_add_only_when_absent_or_expired(self):
+        self.assertTrue(self.cache.add('lock', 1, 0.05))
+        self.assertFalse(self.cache.add('lock', 2, 60))
+        time.sleep(0.1)
+        self.assertTrue(self.cache.add('lock', 3, 60))
+        self.assertEqual(self.cache.get('lock'), 3)
+
+    def test_incr_is_atomic_across_threads(self):
+        self.cache.set('counter', 0, 60)
+
+        def bump():
+            for _ in range(50):
+                self.cache.incr('counter')
+
+        threads = [threading.Thread(target=bump) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.cache.get('counter'), 200)
+
+class CacheNamespaceTests(SQLiteCacheTestCase):
+    def test_invalidate_drops_whole_namespace(self):
+        books = CacheNamespace('books')
+        other = CacheNamespace('other')
+        books.set('toc:1', [1, 2])
+        other.set('toc:1', 'kept')
+        books.invalidate()
+        self.assertIsNone(books.get('toc:1'))
+        self.assertEqual(other.get('toc:1'), 'kept')
+
+    def test_get_or_set_single_flight(self):
+        ns = CacheNamespace('slow', beta=0)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(ns.get_or_set('k', compute)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+        stats = metrics.snapshot()['slow']
+        self.assertEqual(stats['recomputes'], 1)
+        self.assertEqual(stats['lock_waits'], 4)
+
+    def test_early_refresh_near_expiry(self):
+        ns = CacheNamespace('early', timeout=60, beta=1.0)
+        full_key = ns.make_key('k')
+        # A value that took 10s to compute and expires in 1s is refreshed early
+        self.cache.set(full_key, ('old', 10.0, time.time() + 1), 60)
+        self.assertEqual(ns.get_or_set('k', lambda: 'new'), 'new')
+        self.assertEqual(metrics.snapshot()['early']['early_refreshes'], 1)
+
+    def test_counters(self):
+        ns = CacheNamespace('rate', timeout=60)
+        self.assertEqual(ns.incr('user:1'), 1)
+        self.assertEqual(ns.incr('user:1', 2), 3)
+        self.assertEqual(ns.count('user:1'), 3)
+        self.assertEqual(ns.count('user:2'), 0)
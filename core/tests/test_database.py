@@ -0,0 +1,45 @@
+from unittest import mock
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from pathfinders_project.database import READ_ALIAS, ReadConnectionRouter, build_databases
+
+class BuildDatabasesTests(SimpleTestCase):
+    def test_tuned_sqlite_settings(self):
+        databases = build_databases('db.sqlite3')
+        default = databases['default']
+        self.assertEqual(default['PRAGMAS']['journal_mode'], 'WAL')
+        self.assertGreater(default['CONN_MAX_AGE'], 0)
+        self.assertNotIn(READ_ALIAS, databases)
+
+    def test_untuned_settings_are_plain(self):
+        default = build_databases('db.sqlite3', tuned=False)['default']
+        self.assertNotIn('PRAGMAS', default)
+        self.assertNotIn('CONN_MAX_AGE', default)
+
+    def test_read_connection_is_query_only_mirror(self):
+        reader = build_databases('db.sqlite3', read_connection=True)[READ_ALIAS]
+        self.assertEqual(reader['PRAGMAS']['query_only'], 'ON')
+        self.assertEqual(reader['TEST'], {'MIRROR': 'default'})
+
+class PragmaTests(TransactionTestCase):
+    def test_pragmas_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+class ReadConnectionRouterTests(TransactionTestCase):
+    def setUp(self):
+        self.router = ReadConnectionRouter()
+
+    def test_no_read_alias_configured(self):
+        self.assertIsNone(self.router.db_for_read(None))
+
+    def test_reads_stay_on_default_inside_transactions(self):
+        settings = {'default': {}, READ_ALIAS: {}}
+        with mock.patch('django.db.connections.settings', settings):
+            self.assertEqual(self.router.db_for_read(None), READ_ALIAS)
+            with transaction.atomic():
+                self.assertEqual(self.router.db_for_read(None), 'default')
+        self.assertEqual(self.router.db_for_write(None), 'default')
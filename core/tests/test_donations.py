@@ -0,0 +1,83 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models import Payment
+
+User = get_user_model()
+
+class DonationListViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='donor', email='donor@example.com', password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        now = timezone.now()
+        for i in range(5):
+            payment = Payment.objects.create(
+                user=self.user, amount=Decimal('10.50') + i, payment_type='donation'
+            )
+            # Two donations share a timestamp to exercise the id tie-breaker
+            Payment.objects.filter(pk=payment.pk).update(created_at=now - timedelta(minutes=i // 2))
+        Payment.objects.create(user=self.other, amount=Decimal('5.00'), payment_type='donation')
+        self.url = reverse('donation-list')
+        self.client.force_authenticate(user=self.user)
+
+    def test_pages_cover_all_donations_once(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(d['id'] for d in response.data['donations'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(
+            Payment.objects.filter(user=self.user)
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_row_shape_matches_previous_response(self):
+        response = self.client.get(self.url)
+        donation = response.data['donations'][0]
+        self.assertIsInstance(donation['amount'], float)
+        self.assertIsInstance(donation['created_at'], str)
+        self.assertNotIn('user_id', donation)
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ndjson_stream(self):
+        response = self.client.get(self.url, {'stream': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['amount'], 11.5)
+
+    def test_admin_listing_requires_staff(self):
+        url = reverse('admin-donation-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(url, {'stream': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual({row['user_id'] for row in rows}, {self.user.id, self.other.id})
+        response = self.client.get(url, {'user_id': self.other.id})
+        self.assertEqual([row['user_id'] for row in response.json()['donations']], [self.other.id])
+        self.assertEqual(self.client.get(url, {'user_id': 'me'}).status_code, status.HTTP_400_BAD_REQUEST)
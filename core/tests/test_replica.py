@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from core.models import Payment
+from pathfinders_project.database import REPLICA_ALIAS, replicate_sqlite
+
+User = get_user_model()
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ReplicaRoutingTests(TransactionTestCase):
+    """Primary and replica are two SQLite files; the replica is refreshed explicitly"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.replica_path = os.path.join(self.tmpdir, 'replica.sqlite3')
+        connections.settings[REPLICA_ALIAS] = dict(
+            connections['default'].settings_dict,
+            NAME=self.replica_path,
+            PRAGMAS={'query_only': 'ON'},
+        )
+        # The alias is added after the test runner set up databases; connect
+        # explicitly so the runner's guard against unlisted aliases lets it through
+        connections[REPLICA_ALIAS].connect()
+
+        self.user = User.objects.create_user(
+            username='donor', email='donor@example.com', password='testpass123'
+        )
+        for amount in ('1.00', '2.00'):
+            Payment.objects.create(user=self.user, amount=Decimal(amount), payment_type='donation')
+        self.sync()
+        self.client.force_login(self.user)
+        self.url = reverse('donation-list')
+
+    def tearDown(self):
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        shutil.rmtree(self.tmpdir)
+
+    def sync(self):
+        replicate_sqlite(connections['default'].settings_dict['NAME'], self.replica_path)
+
+    def donation_count(self):
+        return len(self.client.get(self.url).json()['donations'])
+
+    def test_reporting_reads_use_replica(self):
+        Payment.objects.create(user=self.user, amount=Decimal('3.00'), payment_type='donation')
+        # Not yet replicated
+        self.assertEqual(self.donation_count(), 2)
+        self.sync()
+        self.assertEqual(self.donation_count(), 3)
+
+    def test_user_reads_own_writes_after_writing(self):
+        Payment.objects.create(user=self.user, amount=Decimal('3.00'), payment_type='donation')
+        pending = Payment.objects.create(user=self.user, amount=Decimal('4.00'), payment_type='donation')
+
+        response = self.client.post(reverse('cancel-donation', args=[pending.id]))
+        self.assertEqual(response.status_code, 200)
+
+        # Replica still has 2 rows, primary has 3; the writer is pinned to primary
+        self.assertEqual(self.donation_count(), 3)
+
+    def test_other_users_keep_reading_replica(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123'
+        )
+        Payment.objects.create(user=other, amount=Decimal('5.00'), payment_type='donation')
+        self.client.force_login(other)
+        self.assertEqual(self.donation_count(), 0)
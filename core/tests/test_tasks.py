@@ -0,0 +1,85 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core import tasks
+from core.models import Task
+
+calls = []
+
+
+@tasks.task('tests.record', max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@tasks.task('tests.fail', max_attempts=2)
+def fail():
+    raise RuntimeError('boom')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_queued_task(self):
+        queued = tasks.enqueue('tests.record', {'value': 1})
+        self.assertEqual(calls, [])
+
+        self.assertEqual(tasks.work(burst=True), 1)
+        self.assertEqual(calls, [1])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.DONE, 1))
+
+    def test_idempotency_key_deduplicates(self):
+        first = tasks.enqueue('tests.record', {'value': 1}, idempotency_key='once')
+        second = tasks.enqueue('tests.record', {'value': 2}, idempotency_key='once')
+        self.assertEqual(first.pk, second.pk)
+        tasks.work(burst=True)
+        self.assertEqual(calls, [1])
+
+    def test_failure_is_retried_with_backoff_then_failed(self):
+        queued = tasks.enqueue('tests.fail')
+        tasks.work(burst=True)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.PENDING)
+        self.assertGreater(queued.run_after, timezone.now())
+        self.assertIn('boom', queued.last_error)
+
+        # Not due yet
+        self.assertEqual(tasks.work(burst=True), 0)
+        Task.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        tasks.work(burst=True)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.FAILED, 2))
+
+    def test_expired_lease_is_reclaimed(self):
+        queued = tasks.enqueue('tests.record', {'value': 1})
+        self.assertIsNotNone(tasks.claim())
+        # Claimed and still leased: nobody else gets it
+        self.assertIsNone(tasks.claim())
+
+        Task.objects.filter(pk=queued.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        tasks.work(burst=True)
+        self.assertEqual(calls, [1])
+
+    def test_purge_keeps_tasks_finished_recently(self):
+        old = tasks.enqueue('tests.record', {'value': 1})
+        long_ago = timezone.now() - timedelta(days=30)
+        Task.objects.filter(pk=old.pk).update(created_at=long_ago, updated_at=long_ago)
+        tasks.work(burst=True)
+        self.assertEqual(tasks.purge(days=7), 0)
+
+        Task.objects.filter(pk=old.pk).update(updated_at=long_ago)
+        self.assertEqual(tasks.purge(days=7), 1)
+
+    def test_unknown_task_rejected(self):
+        with self.assertRaises(LookupError):
+            tasks.enqueue('tests.missing')
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tasks.enqueue('tests.record', {'value': 1})
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [1])
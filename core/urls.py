@@ -5,12 +5,13 @@ from core.stripe_views import (
     MTNMobileMoneyDonationView, 
     MTNWebhookView,
     DonationListView,
+    AdminDonationListView,
     CancelDonationView,
     CheckMTNPaymentStatusView,
     CreateAnonymousDonationCheckoutSessionView,
     CreateAnonymousMTNDonationView
 )
-from core.views import validate_payment
+from core.views import validate_payment, cache_stats
 
 urlpatterns = [
     # Donation endpoints (authenticated)
@@ -24,6 +25,7 @@ urlpatterns = [
     
     # Donation management endpoints
     path('donations/', DonationListView.as_view(), name='donation-list'),
+    path('donations/all/', AdminDonationListView.as_view(), name='admin-donation-list'),
     path('donations/<int:donation_id>/cancel/', CancelDonationView.as_view(), name='cancel-donation'),
     path('donations/mtn/<str:reference_id>/status/', CheckMTNPaymentStatusView.as_view(), name='check-mtn-payment-status'),
     
@@ -31,6 +33,9 @@ urlpatterns = [
     path('stripe-webhook/', StripeWebhookView.as_view(), name='stripe-webhook'),
     path('mtn-webhook/', MTNWebhookView.as_view(), name='mtn-webhook'),
     
+    # Monitoring (staff only)
+    path('cache-stats/', cache_stats, name='cache-stats'),
+    
     # Legacy endpoints (keep for backwards compatibility during transition)
     path('validate-payment/', validate_payment, name='validate-payment'),
 ]
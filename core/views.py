@@ -3,7 +3,9 @@ from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status, permissions, views
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.conf import settings
+from core.cache import metrics as cache_metrics
 from .models import Payment
 from django.contrib.auth import get_user_model
 
@@ -63,3 +65,12 @@ def validate_payment(request):
             'is_valid': False,
             'message': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Hit/miss counters for the cache namespaces used by this worker"""
+    return Response({
+        'backend': settings.CACHES['default']['BACKEND'],
+        'namespaces': cache_metrics.snapshot()
+    })
@@ -15,7 +15,9 @@ from .serializers import (
     CounselorRegistrationSerializer,
     CounselorLoginSerializer
 )
+from assessments import similarity
 from assessments.models import Assessment, GiftProfile
+from core.replica import replica_reads
 # Remove importing serializers from assessments to break circular dependency
 # from assessments.serializers import AssessmentSerializer, GiftProfileSerializer
 import string
@@ -184,7 +186,9 @@ class CounselorViewSet(viewsets.ModelViewSet):
             user = relation.user
             
             # Get assessments
-            assessments = Assessment.objects.filter(user=user).order_by('-created_at')
+            assessments = Assessment.objects.filter(user=user).prefetch_related(
+                'giftprofile_set'
+            ).order_by('-created_at')
             
             # Count completed assessments
             completed_count = assessments.filter(completion_status=True).count()
@@ -205,7 +209,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
                     'counselor_notes': assessment.counselor_notes,
                     'is_counselor_session': assessment.is_counselor_session,
                     'session_date': assessment.session_date,
-                    'results_data': assessment.results_data if assessment.completion_status else None
+                    'results_data': assessment.results if assessment.completion_status else None
                 })
             
             return Response({
@@ -222,7 +226,72 @@ class CounselorViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=True, methods=['get'], url_path='similar-students')
+    def similar_students(self, request, pk=None):
+        """
+        Users whose latest gift profile is closest to this student's.
+
+        Searches the counselor's students by default; `scope=all` searches
+        every user but only identifies the counselor's own students. `k`
+        caps the number of results.
+        """
+        if not hasattr(request.user, 'counselor_profile'):
+            return Response(
+                {"error": "Only counselors can compare students"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        scope = request.query_params.get('scope', 'students')
+        if scope not in ('students', 'all'):
+            return Response(
+                {'error': 'scope must be students or all'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            k = int(request.query_params.get('k', 10))
+        except ValueError:
+            return Response(
+                {'error': 'k must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        students = {
+            relation.user_id: relation.user
+            for relation in CounselorUserRelation.objects.filter(
+                counselor=request.user.counselor_profile
+            ).select_related('user')
+        }
+        if not str(pk).isdigit() or int(pk) not in students:
+            return Response(
+                {'error': 'User relation not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        index = similarity.get_index()
+        target = index.vector_of(int(pk))
+        if target is None:
+            return Response(
+                {'error': 'This user has not completed an assessment yet'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        neighbours = index.nearest(
+            target, k,
+            user_ids=students if scope == 'students' else None,
+            exclude={int(pk)}
+        )
+
+        data = []
+        for distance, user_id, profile_id, primary_gift in neighbours:
+            student = students.get(user_id)
+            data.append({
+                'user_id': student.id if student else None,
+                'full_name': f"{student.first_name} {student.last_name}" if student else None,
+                'primary_gift': primary_gift,
+                'distance': round(distance, 4),
+            })
+        return Response(data)
+
     @action(detail=False, methods=['get'])
+    @replica_reads
     def dashboard(self, request):
         """Get all dashboard data for counselor"""
         if not hasattr(request.user, 'counselor_profile'):
@@ -240,7 +309,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
         ).prefetch_related(
             Prefetch(
                 'user__assessment_set',
-                queryset=Assessment.objects.order_by('-created_at'),
+                queryset=Assessment.objects.prefetch_related('giftprofile_set').order_by('-created_at'),
                 to_attr='latest_assessments'
             ),
             Prefetch(
@@ -280,7 +349,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
                         'completion_status': assessment.completion_status,
                         'created_at': assessment.created_at,
                         'counselor_notes': assessment.counselor_notes,
-                        'results': assessment.results_data if assessment.completion_status else None
+                        'results': assessment.results if assessment.completion_status else None
                     })
 
             # Add latest gift profile
@@ -318,6 +387,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=True, methods=['get'])
+    @replica_reads
     def user_details(self, request, pk=None):
         """Get detailed information about a specific user"""
         try:
@@ -329,7 +399,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
             # Get all assessments for this user
             assessments = Assessment.objects.filter(
                 user=relation.user
-            ).order_by('-created_at')
+            ).prefetch_related('giftprofile_set').order_by('-created_at')
             
             # Get latest gift profile
             gift_profile = GiftProfile.objects.filter(
@@ -351,7 +421,7 @@ class CounselorViewSet(viewsets.ModelViewSet):
                         'completion_status': a.completion_status, 
                         'created_at': a.created_at,
                         'counselor_notes': a.counselor_notes,
-                        'results_data': a.results_data if a.completion_status else None
+                        'results_data': a.results if a.completion_status else None
                     } for a in assessments
                 ],
                 'gift_profile': {
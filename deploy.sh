@@ -171,6 +171,7 @@ STRIPE_WEBHOOK_SECRET=\${STRIPE_WEBHOOK_SECRET:-whsec_your_webhook_secret}
 # FastAPI Configuration
 FASTAPI_HOST=127.0.0.1
 FASTAPI_PORT=8001
+FASTAPI_WORKERS=4
 EOF
     
     print_warning "Environment file created. Please review and update with your actual production values!"
@@ -563,17 +564,44 @@ stdout_logfile=/var/log/pathfinders-django.log
 environment=ENVIRONMENT="production",DJANGO_SETTINGS_MODULE="pathfinders_project.settings",DEBUG="False"
 EOF
 
+# Django ASGI configuration (async assessment submission)
+sudo tee /etc/supervisor/conf.d/pathfinders-django-asgi.conf > /dev/null << EOF
+[program:pathfinders-django-asgi]
+command=$VENV_DIR/bin/uvicorn pathfinders_project.asgi:application --host 127.0.0.1 --port 8002 --workers 2
+directory=$DJANGO_DIR
+user=$USER
+autostart=true
+autorestart=true
+redirect_stderr=true
+stdout_logfile=/var/log/pathfinders-django-asgi.log
+environment=ENVIRONMENT="production",DJANGO_SETTINGS_MODULE="pathfinders_project.settings",DEBUG="False"
+EOF
+
+# Background task workers (book access grants, notifications)
+sudo tee /etc/supervisor/conf.d/pathfinders-tasks.conf > /dev/null << EOF
+[program:pathfinders-tasks]
+command=$VENV_DIR/bin/python manage.py run_tasks --processes 2
+directory=$DJANGO_DIR
+user=$USER
+autostart=true
+autorestart=true
+stopwaitsecs=60
+redirect_stderr=true
+stdout_logfile=/var/log/pathfinders-tasks.log
+environment=ENVIRONMENT="production",DJANGO_SETTINGS_MODULE="pathfinders_project.settings",DEBUG="False"
+EOF
+
 # FastAPI configuration
 sudo tee /etc/supervisor/conf.d/pathfinders-fastapi.conf > /dev/null << EOF
 [program:pathfinders-fastapi]
-command=$VENV_DIR/bin/uvicorn fastapi_app.main:app --host 127.0.0.1 --port 8001 --workers 1
+command=$VENV_DIR/bin/gunicorn -c fastapi_app/gunicorn_conf.py fastapi_app.main:app
 directory=$BACKEND_DIR
 user=$USER
 autostart=true
 autorestart=true
 redirect_stderr=true
 stdout_logfile=/var/log/pathfinders-fastapi.log
-environment=ENVIRONMENT="production",DJANGO_API_URL="https://pathfindersgifts.com"
+environment=ENVIRONMENT="production",DJANGO_API_URL="https://pathfindersgifts.com",FASTAPI_WORKERS="4"
 EOF
 
 # Next.js frontend configuration
@@ -831,6 +859,8 @@ print_status "- sudo supervisorctl status"
 print_status "- sudo supervisorctl restart pathfinders-frontend"
 print_status "- sudo supervisorctl restart pathfinders-django"
 print_status "- sudo supervisorctl restart pathfinders-fastapi"
+print_status "- sudo supervisorctl restart pathfinders-django-asgi"
+print_status "- sudo supervisorctl restart pathfinders-tasks"
 print_status "- sudo systemctl reload nginx"
 print_status ""
 print_status "Database backup:"
@@ -0,0 +1,92 @@
+"""
+Startup benchmark for the scoring service.
+
+Starts the service with plain ``uvicorn --workers N`` and with the preloaded
+gunicorn mode (gunicorn_conf.py), and reports for each how long it took
+until every worker answered ``/ready/``, and the workers' combined
+proportional memory (PSS, Linux only):
+
+    python -m fastapi_app.benchmark_startup --workers 4 --runs 3
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def commands(workers, port):
+    bind = f'127.0.0.1:{port}'
+    return {
+        'uvicorn': [
+            sys.executable, '-m', 'uvicorn', 'fastapi_app.main:app',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning',
+        ],
+        'gunicorn --preload': [
+            sys.executable, '-m', 'gunicorn', '-c', 'fastapi_app/gunicorn_conf.py',
+            '--workers', str(workers), '--bind', bind, '--log-level', 'warning', 'fastapi_app.main:app',
+        ],
+    }
+
+
+def pss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as smaps:
+            for line in smaps:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def measure(command, workers, port, deadline=60):
+    """Seconds until `workers` distinct processes report ready, and their total PSS in KB"""
+    started = time.monotonic()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    ready = set()
+    try:
+        while len(ready) < workers:
+            if time.monotonic() - started > deadline:
+                raise RuntimeError(f'Only {len(ready)} of {workers} workers ready after {deadline}s')
+            try:
+                # A new connection per request, so requests spread over workers
+                response = httpx.get(f'http://127.0.0.1:{port}/ready/', timeout=1)
+                if response.status_code == 200:
+                    ready.add(response.json()['pid'])
+            except httpx.TransportError:
+                time.sleep(0.01)
+        elapsed = time.monotonic() - started
+        sizes = [pss_kb(pid) for pid in ready]
+        return elapsed, None if None in sizes else sum(sizes)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--port', type=int, default=8091)
+    options = parser.parse_args()
+
+    for mode, command in commands(options.workers, options.port).items():
+        timings, memory = [], []
+        for _ in range(options.runs):
+            elapsed, pss = measure(command, options.workers, options.port)
+            timings.append(elapsed)
+            if pss is not None:
+                memory.append(pss)
+        line = f'{mode:<20} ready in {statistics.median(timings):.2f}s (median of {options.runs})'
+        if memory:
+            line += f', workers PSS {statistics.median(memory) / 1024:.1f} MB'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
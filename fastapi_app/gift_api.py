@@ -1,8 +1,7 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict
-from assessments.gift_calculator import GiftCalculator
-from users.ministry_roles import MINISTRY_ROLE_MAPPINGS
+from scoring import MINISTRY_ROLE_MAPPINGS, GiftCalculator
 
 
 # Create FastAPI app instance
@@ -0,0 +1,27 @@
+"""
+Production serving mode for the scoring service:
+
+    gunicorn -c fastapi_app/gunicorn_conf.py fastapi_app.main:app
+
+The app is imported once in the master (``preload_app``), so the scoring
+tables built by ``main.preload`` are shared copy-on-write by every worker
+instead of being rebuilt per worker. Each worker warms up in the app's
+lifespan before accepting requests; ``/ready/`` reports it.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"{os.getenv('FASTAPI_HOST', '127.0.0.1')}:{os.getenv('FASTAPI_PORT', '8001')}"
+workers = int(os.getenv('FASTAPI_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's reach, so
+    # collections in the workers don't write to (and copy) shared pages
+    gc.freeze()
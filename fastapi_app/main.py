@@ -1,23 +1,70 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi_app.models import (
+    Answer,
     AssessmentRequest, 
     GiftResult, 
     ProgressData, 
     GiftDescription,
     GiftDescriptions
 )
-from assessments.gift_calculator import GiftCalculator
+from scoring import GIFT_NAMES, GIFT_ORDER, GiftCalculator, VersionCache
+from contextlib import asynccontextmanager
 import httpx
 from typing import List
 import os
 import logging
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Pathfinders Gift Assessment API")
+# Set once this worker has scored a sample assessment
+readiness = {'ready': False, 'warm_up_seconds': None}
+
+
+def preload():
+    """
+    Build the read-only scoring tables.
+
+    Runs at import, so with ``gunicorn --preload`` (see gunicorn_conf.py)
+    it happens once in the master and the workers share the pages.
+    """
+    calculator = GiftCalculator()
+    # Response descriptions by gift name, as identify_gifts returns them
+    descriptions = {
+        GIFT_NAMES[gift]: GiftDescription(
+            gift=details['name'], description=details['description'], details=details['details']
+        )
+        for gift, details in calculator.MOTIVATIONAL_GIFTS.items()
+    }
+    return calculator, descriptions
+
+
+def warm_up():
+    """Score a sample assessment end to end so the first real request pays no first-call costs"""
+    started = time.monotonic()
+    sample = [
+        Answer(question_id=position, answer=1 + position % 5, gift_correlation={gift: 1.0})
+        for position, gift in enumerate(GIFT_ORDER)
+    ]
+    score_assessment(AssessmentRequest(answers=sample, questionnaire_version='warm-up'))
+    # The sample version must not take a slot from real ones
+    compiled_versions.discard('warm-up')
+    readiness['ready'] = True
+    readiness['warm_up_seconds'] = round(time.monotonic() - started, 3)
+    logger.info(f"Worker {os.getpid()} warmed up in {readiness['warm_up_seconds']}s")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    warm_up()
+    yield
+
+
+app = FastAPI(title="Pathfinders Gift Assessment API", lifespan=lifespan)
 
 # CORS configuration for development and production
 app.add_middleware(
@@ -42,7 +89,11 @@ DJANGO_API_URL = os.getenv('DJANGO_API_URL', 'http://localhost:8000')
 if os.getenv('ENVIRONMENT') == 'production':
     DJANGO_API_URL = 'https://pathfindersgifts.com'
 
-calculator = GiftCalculator()
+calculator, descriptions_by_name = preload()
+
+# Compiled questionnaire versions; old and new ones are scored side by side
+# while assessments pinned to the old one are still being finished
+compiled_versions = VersionCache(size=8)
 
 # Payment validation removed - assessments are now free
 # async def validate_payment(user_id: int, payment_id: str | None = None) -> PaymentValidationResponse:
@@ -84,6 +135,57 @@ async def health_check_no_slash():
     """Health check endpoint without trailing slash"""
     return {"status": "healthy", "service": "fastapi", "version": "1.0"}
 
+@app.get("/ready/")
+async def readiness_check():
+    """Readiness endpoint: 503 until this worker has warmed up"""
+    if not readiness['ready']:
+        return JSONResponse(status_code=503, content={"status": "starting", "pid": os.getpid()})
+    return {"status": "ready", "pid": os.getpid(), "warm_up_seconds": readiness['warm_up_seconds']}
+
+def score_assessment(assessment: AssessmentRequest) -> GiftResult:
+    """Score an assessment with the preloaded tables"""
+    if assessment.questionnaire_version:
+        compiled = compiled_versions.compiled(
+            assessment.questionnaire_version,
+            {a.question_id: a.gift_correlation for a in assessment.answers}
+        )
+        scores = compiled.scores((a.question_id, a.answer) for a in assessment.answers)
+    else:
+        scores = calculator.calculate_scores([
+            {
+                'question_id': a.question_id,
+                'answer': a.answer,
+                'gift_correlation': {
+                    k.upper(): v  # Ensure gift keys are uppercase
+                    for k, v in a.gift_correlation.items()
+                }
+            }
+            for a in assessment.answers
+        ])
+
+    primary_gift, secondary_gifts = calculator.identify_gifts(
+        scores,
+        threshold_factor=0.80  # Match threshold
+    )
+
+    # Get role recommendations from ministry roles mapping
+    roles = {
+        'primary_roles': [],
+        'secondary_roles': [],
+        'ministry_areas': []
+    }
+
+    return GiftResult(
+        scores=scores,
+        primary_gift=primary_gift,
+        secondary_gifts=secondary_gifts,
+        descriptions=GiftDescriptions(
+            primary=descriptions_by_name[primary_gift],
+            secondary=[descriptions_by_name[gift] for gift in secondary_gifts]
+        ),
+        recommended_roles=roles
+    )
+
 @app.post("/calculate-gifts/")
 async def calculate_gifts(assessment: AssessmentRequest):
     """
@@ -94,67 +196,17 @@ async def calculate_gifts(assessment: AssessmentRequest):
 
         # Assessments are now free - no payment validation required
         logger.info("Processing assessment (no payment validation required)")
-        
-        # Convert answers to the format expected by calculator
-        formatted_answers = [
-            {
-                'question_id': a.question_id,
-                'answer': a.answer,
-                'gift_correlation': {
-                    k.upper(): v  # Ensure gift keys are uppercase
-                    for k, v in a.gift_correlation.items()
-                }
-            }
-            for a in assessment.answers
-        ]
 
-        # Calculate results
-        logger.info("Calculating gift scores")
-        scores = calculator.calculate_scores(formatted_answers)
-        
+        result = score_assessment(assessment)
+
         # Log scores with high precision for debugging
         logger.info("Gift scores with high precision:")
-        for gift, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
+        for gift, score in sorted(result.scores.items(), key=lambda x: x[1], reverse=True):
             logger.info(f"  {gift}: {score:.4f}")
-        
-        logger.info("Identifying primary and secondary gifts")
-        primary_gift, secondary_gifts = calculator.identify_gifts(
-            scores,
-            threshold_factor=0.80  # Match threshold
-        )
-        
-        logger.info(f"Primary gift: {primary_gift}, Secondary gifts: {secondary_gifts}")
-        descriptions = calculator.get_gift_descriptions(primary_gift, secondary_gifts)
-
-        # Get role recommendations from ministry roles mapping
-        roles = {
-            'primary_roles': [],
-            'secondary_roles': [],
-            'ministry_areas': []
-        }
+        logger.info(f"Primary gift: {result.primary_gift}, Secondary gifts: {result.secondary_gifts}")
 
         logger.info("Returning assessment results")
-        return GiftResult(
-            scores=scores,
-            primary_gift=primary_gift,
-            secondary_gifts=secondary_gifts,
-            descriptions=GiftDescriptions(
-                primary=GiftDescription(
-                    gift=descriptions['primary']['gift'],
-                    description=descriptions['primary']['description'],
-                    details=descriptions['primary']['details']
-                ),
-                secondary=[
-                    GiftDescription(
-                        gift=desc['gift'],
-                        description=desc['description'],
-                        details=desc['details']
-                    )
-                    for desc in descriptions['secondary']
-                ]
-            ),
-            recommended_roles=roles
-        )
+        return result
 
     except HTTPException:
         raise
@@ -10,6 +10,9 @@ class Answer(BaseModel):
 class AssessmentRequest(BaseModel):
     user_id: int | None = None
     answers: List[Answer]
+    # Fingerprint of the questionnaire version the correlations come from;
+    # only sent when every answer is a question of that version
+    questionnaire_version: str | None = None
     is_counselor_session: bool = False
     counselor_notes: Optional[str] = None
     session_date: Optional[datetime] = None
@@ -35,12 +35,18 @@ export const assessmentApi = {
     }
   },
 
-  saveProgress: async (answers: Answer[]): Promise<void> => {
-    await api.post('/api/assessments/save-progress/', { current_answers: answers });
+  // Send only changed answers (answer null clears one) with the last version seen;
+  // a 409 response carries the current progress to merge with.
+  saveProgress: async (
+    changes: { question_id: number; answer: number | null }[],
+    version?: number
+  ): Promise<{ version: number; answered: number }> => {
+    const response = await api.post('/api/assessments/save_progress/', { changes, version });
+    return response.data;
   },
 
-  getProgress: async (): Promise<Answer[]> => {
-    const response = await api.get('/api/assessments/get-progress/');
+  getProgress: async (): Promise<{ version: number; answered: number; answers: Answer[] }> => {
+    const response = await api.get('/api/assessments/get_progress/');
     return response.data;
   },
 
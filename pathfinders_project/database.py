@@ -0,0 +1,150 @@
+"""
+Database configuration for running SQLite under several worker processes.
+
+Gunicorn workers, the ASGI app and payment webhooks all write to the same
+SQLite file. With the default rollback journal, a writer blocks every reader
+and concurrent writers fail fast with "database is locked". The tuned mode
+built here:
+
+- switches the file to WAL so reads never wait for the writer;
+- uses synchronous=NORMAL (durable across application crashes, which is
+  the WAL-recommended trade-off);
+- waits up to busy_timeout for the write lock instead of erroring;
+- enlarges the page cache and memory-maps the file for faster reads;
+- keeps connections open between requests (CONN_MAX_AGE);
+- starts transactions with BEGIN IMMEDIATE so a read-then-write transaction
+  cannot deadlock on lock upgrade (Django 5.1+).
+
+An optional ``readonly`` alias opens a second, query-only connection to the
+same file; ``ReadConnectionRouter`` sends reads there so long reports do not
+occupy the connection that handles writes.
+
+A ``replica`` alias can also point at a separately replicated copy of the
+database (kept fresh with ``replicate_sqlite``); reporting endpoints opt in
+to it through ``core.replica``.
+"""
+
+import sqlite3
+import django
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,  # milliseconds
+    'cache_size': -64000,  # negative means KiB, i.e. 64 MB per connection
+    'mmap_size': 268435456,  # 256 MB
+    'temp_store': 'MEMORY',
+}
+
+READ_ALIAS = 'readonly'
+REPLICA_ALIAS = 'replica'
+
+
+def sqlite_database(name, tuned=True, conn_max_age=600):
+    """Settings dict for a SQLite database, optionally with production tuning"""
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+    }
+    if not tuned:
+        return database
+
+    options = {
+        # Seconds the sqlite3 module waits for a lock; mirrors busy_timeout
+        'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+    }
+    if django.VERSION >= (5, 1):
+        options['transaction_mode'] = 'IMMEDIATE'
+
+    database.update({
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
+        'PRAGMAS': dict(SQLITE_PRAGMAS),
+    })
+    return database
+
+
+def build_databases(name, tuned=True, read_connection=False, conn_max_age=600, replica_name=None):
+    """
+    DATABASES setting for the project.
+
+    With `read_connection`, a second alias points at the same file through a
+    query-only connection. With `replica_name`, a `replica` alias opens the
+    replicated copy query-only. Both mirror `default` in tests so test
+    transactions stay visible to them.
+    """
+    databases = {'default': sqlite_database(name, tuned, conn_max_age)}
+    if read_connection:
+        databases[READ_ALIAS] = _query_only(sqlite_database(name, tuned, conn_max_age))
+    if replica_name:
+        databases[REPLICA_ALIAS] = _query_only(sqlite_database(replica_name, tuned, conn_max_age))
+    return databases
+
+
+def _query_only(database):
+    # journal_mode is a property of the file, set by the writer
+    pragmas = {k: v for k, v in database.get('PRAGMAS', {}).items() if k != 'journal_mode'}
+    database['PRAGMAS'] = dict(pragmas, query_only='ON')
+    database['TEST'] = {'MIRROR': 'default'}
+    return database
+
+
+def replicate_sqlite(source, target):
+    """
+    Copy the SQLite database at `source` into `target` with the online backup API.
+
+    Safe while the source is being written and while readers hold the target
+    open: the whole copy is applied to the target in one step.
+    """
+    src = sqlite3.connect(str(source))
+    dst = sqlite3.connect(str(target), timeout=SQLITE_PRAGMAS['busy_timeout'] / 1000)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def sqlite_pragma_statements(pragmas):
+    return [f'PRAGMA {key}={value}' for key, value in pragmas.items()]
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created handler applying the PRAGMAS of the database alias"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for statement in sqlite_pragma_statements(pragmas):
+            cursor.execute(statement)
+
+
+class ReadConnectionRouter:
+    """
+    Send ORM reads to the query-only connection when it is configured.
+
+    Reads inside an open transaction on `default` stay on `default` so they
+    see that transaction's own uncommitted writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        from django.db import connections
+
+        if READ_ALIAS not in connections.settings:
+            return None
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return READ_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are the same database file
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
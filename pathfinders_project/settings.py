@@ -12,7 +12,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
+from .database import build_databases
 
 load_dotenv()
 
@@ -51,6 +53,7 @@ INSTALLED_APPS = [
     'assessments.apps.AssessmentsConfig',
     'books.apps.BooksConfig',
     'counselors.apps.CounselorsConfig',
+    'analytics.apps.AnalyticsConfig',
     
     # Third party apps
     'rest_framework',
@@ -65,6 +68,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.replica.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -90,13 +94,27 @@ TEMPLATES = [
     },
 ]
 
-# Database settings - Use SQLite for both development and production
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Database settings - Use SQLite for both development and production.
+# SQLITE_TUNING enables WAL, busy timeouts and persistent connections (see
+# pathfinders_project/database.py); SQLITE_READ_CONNECTION adds a separate
+# query-only connection for reads.
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True') == 'True'
+SQLITE_READ_CONNECTION = os.getenv('SQLITE_READ_CONNECTION', 'False') == 'True'
+# Replicated copy of db.sqlite3 used by reporting endpoints (see core/replica.py)
+DATABASE_REPLICA_NAME = os.getenv('DATABASE_REPLICA_NAME')
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '30'))
+
+DATABASES = build_databases(
+    BASE_DIR / 'db.sqlite3',
+    tuned=SQLITE_TUNING,
+    read_connection=SQLITE_READ_CONNECTION,
+    conn_max_age=int(os.getenv('CONN_MAX_AGE', '600')),
+    replica_name=DATABASE_REPLICA_NAME,
+)
+DATABASE_ROUTERS = [
+    'core.replica.PrimaryReplicaRouter',
+    'pathfinders_project.database.ReadConnectionRouter',
+]
 
 AUTH_USER_MODEL = 'users.User'
 
@@ -198,8 +216,25 @@ TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 DATABASES['default']['TEST'] = {
     'NAME': 'test_pathfinders_db',
 }
+# `manage.py test` or pytest
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+if TESTING:
+    # The throwaway test database needs no WAL, which would leave -wal and
+    # -shm files next to it
+    DATABASES['default'].get('PRAGMAS', {}).pop('journal_mode', None)
 
 FASTAPI_URL = os.getenv('FASTAPI_URL', 'http://127.0.0.1:8001')
+# Threads the ASGI submission views use for ORM work (assessments/async_views.py);
+# bounds the database connections one async worker holds
+ASYNC_ORM_WORKERS = int(os.getenv('ASYNC_ORM_WORKERS', '4'))
+
+# Background tasks (core/tasks.py), run by `manage.py run_tasks`. Eager mode
+# runs them in-process after commit, so development needs no worker.
+TASKS_ALWAYS_EAGER = os.getenv('TASKS_ALWAYS_EAGER', str(not IS_PRODUCTION)) == 'True'
+TASKS_LEASE_SECONDS = int(os.getenv('TASKS_LEASE_SECONDS', '300'))
+ASSESSMENT_COMPLETION_EMAILS = os.getenv('ASSESSMENT_COMPLETION_EMAILS', 'False') == 'True'
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'no-reply@pathfindersgifts.com')
 
 # Frontend URL for redirects
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'https://pathfindersgifts.com' if IS_PRODUCTION else 'http://localhost:3000')
@@ -222,13 +257,47 @@ REST_FRAMEWORK = {
     ],
 }
 
-# Cache configuration - Use local memory cache for both development and production
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Cache configuration - shared by all gunicorn and uvicorn workers.
+# Redis is used when REDIS_URL is set; otherwise a SQLite file on local disk.
+# CACHE_BACKEND=locmem restores the old per-process cache. Tests always use
+# locmem, so they share no cached state with each other or a dev server.
+REDIS_URL = os.getenv('REDIS_URL')
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis' if REDIS_URL else 'sqlite')
+if TESTING:
+    CACHE_BACKEND = 'locmem'
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL or 'redis://127.0.0.1:6379/1',
+            'KEY_PREFIX': 'pathfinders',
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache_backends.SQLiteCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache.sqlite3')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 50000,
+            },
+        }
     }
-}
 
 # AWS S3 settings - Only use in production
 if IS_PRODUCTION:
@@ -19,6 +19,7 @@ from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from users.views import UserViewSet, ProfileViewSet, LoginView, LogoutView, CsrfTokenView
 from assessments.views import QuestionViewSet, AssessmentViewSet
+from assessments import async_views
 from books.views import BookViewSet, CareerChoiceViewSet, CareerResearchNoteViewSet
 from core.views import serve_frontend, health_check
 from counselors.views import CounselorViewSet
@@ -46,6 +47,10 @@ urlpatterns = [
             path('register/', UserViewSet.as_view({'post': 'register'}), name='user-register'),
             path('csrf/', CsrfTokenView.as_view(), name='csrf-token'),
         ])),
+        # Async submission; must precede the router's assessments/<pk>/ route
+        path('assessments/submit-async/', async_views.submit_async, name='assessment-submit-async'),
+        path('assessments/<int:pk>/submit_assessment/', async_views.submit_assessment,
+             name='assessment-submit-assessment'),
         # Protected endpoints (require authentication)
         path('', include(router.urls)),
         path('auth/', include([
@@ -62,6 +67,7 @@ urlpatterns = [
             }), name='profile-detail'),
         ])),
         path('counselors/', include('counselors.urls')),
+        path('analytics/', include('analytics.urls')),
         path('', include('assessments.urls')),
         path('core/', include('core.urls')),
     ])),
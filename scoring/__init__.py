@@ -0,0 +1,26 @@
+"""
+Gift scoring without Django.
+
+The calculator, gift metadata and ministry role mappings shared by the
+Django apps and the FastAPI scoring service. Nothing here may import
+Django or a Django app, so the scoring service and its workers start
+without settings (see tests/test_imports.py).
+"""
+
+from .calculator import (
+    DESCRIPTIONS_VERSION,
+    GIFT_NAMES,
+    GIFT_ORDER,
+    MAX_ANSWER,
+    CompiledQuestionnaire,
+    GiftCalculator,
+    IncrementalScorer,
+    LRUCache,
+    VersionCache,
+    normalize_scores,
+    pack_answers,
+    pack_scores,
+    unpack_answers,
+    unpack_scores,
+)
+from .roles import MINISTRY_ROLE_MAPPINGS
@@ -1,7 +1,12 @@
-#assessments/gift_calculator.py
+#scoring/calculator.py
 
+from collections import OrderedDict
 from typing import Dict, List, Tuple
-import json
+import logging
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
 
 class GiftCalculator:
     # Define motivational gifts and their descriptions from Romans 12:6-8
@@ -156,65 +161,17 @@ class GiftCalculator:
 
     def calculate_scores(self, answers: List[Dict]) -> Dict[str, float]:
         """Calculate motivational gift scores based on assessment answers"""
-        # Initialize scores
-        raw_scores = {gift: 0.0 for gift in self.MOTIVATIONAL_GIFTS.keys()}
-        max_possible_scores = {gift: 0.0 for gift in self.MOTIVATIONAL_GIFTS.keys()}
-        
-        # Calculate raw scores and maximum possible scores
+        scorer = IncrementalScorer()
         for answer in answers:
-            score = answer['answer']  # Score is 1-5
-            correlations = answer['gift_correlation']
-            
-            for gift, correlation in correlations.items():
-                if gift in raw_scores:
-                    raw_scores[gift] += score * correlation
-                    # Track maximum possible score for each gift
-                    max_possible_scores[gift] += 5 * correlation  # 5 is max answer value
-
-        # Normalize scores relative to their individual maximum possible scores
-        normalized_scores = {}
-        for gift in raw_scores:
-            if max_possible_scores[gift] > 0:
-                normalized_scores[gift] = raw_scores[gift] / max_possible_scores[gift]
-            else:
-                normalized_scores[gift] = 0.0
-
-        # Convert to percentages that sum to 1 (100%) with higher precision
-        total = sum(normalized_scores.values())
-        if total > 0:
-            final_scores = {}
-            running_total = 0
-            
-            # Sort gifts by score for consistent rounding
-            sorted_gifts = sorted(normalized_scores.items(), key=lambda x: x[1], reverse=True)
-            
-            # Process all but the last gift
-            for gift, score in sorted_gifts[:-1]:
-                percentage = score / total
-                # Increase precision to 4 decimal places
-                rounded_score = round(percentage, 4)
-                final_scores[gift] = rounded_score
-                running_total += rounded_score
-            
-            # Last gift gets the remaining percentage to ensure sum is exactly 1
-            last_gift = sorted_gifts[-1][0]
-            final_scores[last_gift] = round(1 - running_total, 4)
-            
-            # Sort back to original order
-            final_scores = dict(sorted(final_scores.items()))
-        else:
-            # Fallback to equal distribution if all scores are 0
-            equal_share = round(1.0 / len(normalized_scores), 4)
-            final_scores = {gift: equal_share for gift in normalized_scores}
-
-        return final_scores
+            scorer.add(answer['answer'], answer['gift_correlation'])
+        return scorer.scores()
 
     def identify_gifts(self, scores: Dict[str, float], threshold_factor: float = 0.80) -> Tuple[str, List[str]]:
         """Identify primary and secondary gifts based on scores"""
-        # Debug print to show the precise scores
-        print("Debug - Gift scores with high precision:")
-        for gift, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {gift}: {score:.4f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Gift scores with high precision:")
+            for gift, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
+                logger.debug(f"  {gift}: {score:.4f}")
             
         # Sort gifts by score
         sorted_gifts = sorted(
@@ -227,7 +184,7 @@ class GiftCalculator:
         primary_gift = sorted_gifts[0][0]
         highest_score = sorted_gifts[0][1]
         
-        print(f"Debug - Primary gift selected: {primary_gift} with score {highest_score:.4f}")
+        logger.debug(f"Primary gift selected: {primary_gift} with score {highest_score:.4f}")
 
         # Calculate threshold for secondary gifts
         threshold = highest_score * threshold_factor
@@ -278,4 +235,249 @@ class GiftCalculator:
                 }
                 for key in secondary_keys
             ]
-        }
\ No newline at end of file
+        }
+
+
+# Fixed gift order of packed score vectors; append new gifts, never reorder
+GIFT_ORDER = tuple(GiftCalculator.MOTIVATIONAL_GIFTS)
+
+# Gift names as identify_gifts returns them, without the parenthetical part
+GIFT_NAMES = {
+    gift: details['name'].split('(')[0].strip()
+    for gift, details in GiftCalculator.MOTIVATIONAL_GIFTS.items()
+}
+
+# Bump when MOTIVATIONAL_GIFTS texts change, so stored profiles record which
+# descriptions their users were shown
+DESCRIPTIONS_VERSION = 1
+
+_SCORE_VECTOR = struct.Struct(f'<{len(GIFT_ORDER)}f')
+
+# Scores are calculated to 4 decimal places, which float32 holds exactly
+# once rounded back
+SCORE_PRECISION = 4
+
+
+def pack_scores(scores: Dict[str, float]) -> bytes:
+    """Pack a gift -> score mapping into a fixed-order float32 vector"""
+    return _SCORE_VECTOR.pack(*(float(scores.get(gift, 0.0)) for gift in GIFT_ORDER))
+
+
+def unpack_scores(blob: bytes) -> Dict[str, float]:
+    """Inverse of pack_scores"""
+    return {
+        gift: round(value, SCORE_PRECISION)
+        for gift, value in zip(GIFT_ORDER, _SCORE_VECTOR.unpack(bytes(blob)))
+    }
+
+# A stored answer: question id and the answer given, 1-5
+_ANSWER = struct.Struct('<IB')
+
+
+def pack_answers(answers: List[Dict]) -> bytes:
+    """Pack {question_id, answer} dicts into 5 bytes per answer"""
+    return b''.join(_ANSWER.pack(int(a['question_id']), int(a['answer'])) for a in answers)
+
+
+def unpack_answers(blob: bytes) -> List[Tuple[int, int]]:
+    """Inverse of pack_answers, as (question id, answer) pairs"""
+    return list(_ANSWER.iter_unpack(bytes(blob)))
+
+_GIFT_INDEX = {gift: i for i, gift in enumerate(GIFT_ORDER)}
+
+MAX_ANSWER = 5
+
+
+def normalize_scores(raw_scores: Dict[str, float], max_possible_scores: Dict[str, float]) -> Dict[str, float]:
+    """Turn raw and maximum possible scores into percentages that sum to 1"""
+    # Normalize scores relative to their individual maximum possible scores
+    normalized_scores = {}
+    for gift in raw_scores:
+        if max_possible_scores[gift] > 0:
+            normalized_scores[gift] = raw_scores[gift] / max_possible_scores[gift]
+        else:
+            normalized_scores[gift] = 0.0
+
+    # Convert to percentages that sum to 1 (100%) with higher precision
+    total = sum(normalized_scores.values())
+    if total > 0:
+        final_scores = {}
+        running_total = 0
+
+        # Sort gifts by score for consistent rounding
+        sorted_gifts = sorted(normalized_scores.items(), key=lambda x: x[1], reverse=True)
+
+        # Process all but the last gift
+        for gift, score in sorted_gifts[:-1]:
+            percentage = score / total
+            # Increase precision to 4 decimal places
+            rounded_score = round(percentage, 4)
+            final_scores[gift] = rounded_score
+            running_total += rounded_score
+
+        # Last gift gets the remaining percentage to ensure sum is exactly 1
+        last_gift = sorted_gifts[-1][0]
+        final_scores[last_gift] = round(1 - running_total, 4)
+
+        # Sort back to original order
+        final_scores = dict(sorted(final_scores.items()))
+    else:
+        # Fallback to equal distribution if all scores are 0
+        equal_share = round(1.0 / len(normalized_scores), 4)
+        final_scores = {gift: equal_share for gift in normalized_scores}
+
+    return final_scores
+
+
+class IncrementalScorer:
+    """
+    Running raw and maximum score vectors for a questionnaire in progress.
+
+    Adding, replacing or removing one answer costs O(number of gifts), and
+    scores() normalises exactly like GiftCalculator.calculate_scores, so a
+    finished questionnaire scores without replaying its answers.
+    """
+
+    def __init__(self, raw=None, maximum=None, answered=0):
+        self.raw = list(raw) if raw else [0.0] * len(GIFT_ORDER)
+        self.maximum = list(maximum) if maximum else [0.0] * len(GIFT_ORDER)
+        self.answered = answered
+
+    def _apply(self, answer, correlation, sign):
+        for gift, weight in correlation.items():
+            index = _GIFT_INDEX.get(gift.upper())
+            if index is not None:
+                self.raw[index] += sign * answer * weight
+                self.maximum[index] += sign * MAX_ANSWER * weight
+
+    def add(self, answer, correlation):
+        self._apply(answer, correlation, 1)
+        self.answered += 1
+
+    def remove(self, answer, correlation):
+        self._apply(answer, correlation, -1)
+        self.answered -= 1
+
+    def replace(self, old_answer, old_correlation, answer, correlation):
+        self._apply(old_answer, old_correlation, -1)
+        self._apply(answer, correlation, 1)
+
+    def scores(self) -> Dict[str, float]:
+        return normalize_scores(
+            dict(zip(GIFT_ORDER, self.raw)),
+            dict(zip(GIFT_ORDER, self.maximum))
+        )
+
+    def to_bytes(self) -> bytes:
+        return _SCORER_STATE.pack(*self.raw, *self.maximum, self.answered)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> 'IncrementalScorer':
+        if not blob:
+            return cls()
+        values = _SCORER_STATE.unpack(bytes(blob))
+        size = len(GIFT_ORDER)
+        return cls(values[:size], values[size:2 * size], values[-1])
+
+
+# Running vectors are kept as float64 so repeated add/remove does not drift
+_SCORER_STATE = struct.Struct(f'<{2 * len(GIFT_ORDER)}dI')
+
+
+class CompiledQuestionnaire:
+    """
+    The correlations of one questionnaire version as a matrix.
+
+    Each question id maps to its weights in GIFT_ORDER, so scoring a set of
+    answers needs no per-answer dictionary work. Versions never change, so
+    a compiled one can be cached by its version (see VersionCache).
+    """
+
+    def __init__(self, version, correlations: Dict[int, Dict[str, float]]):
+        self.version = version
+        self.correlations = dict(correlations)
+        self.weights = {}
+        for question_id, correlation in self.correlations.items():
+            upper = {gift.upper(): float(weight) for gift, weight in correlation.items()}
+            self.weights[question_id] = tuple(upper.get(gift, 0.0) for gift in GIFT_ORDER)
+
+    def __contains__(self, question_id):
+        return question_id in self.weights
+
+    def scorer(self, answers) -> IncrementalScorer:
+        """
+        Running vectors for (question id, answer) pairs.
+
+        Adds up exactly like IncrementalScorer.add in the same order;
+        answers to questions outside this version are skipped and not
+        counted as answered.
+        """
+        size = len(GIFT_ORDER)
+        raw, maximum = [0.0] * size, [0.0] * size
+        answered = 0
+        for question_id, answer in answers:
+            weights = self.weights.get(question_id)
+            if weights is None:
+                continue
+            answered += 1
+            for i, weight in enumerate(weights):
+                raw[i] += answer * weight
+                maximum[i] += MAX_ANSWER * weight
+        return IncrementalScorer(raw, maximum, answered)
+
+    def scores(self, answers) -> Dict[str, float]:
+        return self.scorer(answers).scores()
+
+
+class LRUCache:
+    """The `size` most recently used values by key, shared by threads"""
+
+    def __init__(self, size=8):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class VersionCache(LRUCache):
+    """The most recently used CompiledQuestionnaire versions, by version"""
+
+    def compiled(self, version, correlations: Dict[int, Dict[str, float]]) -> CompiledQuestionnaire:
+        """
+        `version` compiled, from `correlations` when it is not cached.
+
+        `correlations` must all be questions of `version`. A version's
+        correlations never change, so questions missing from the cached
+        copy are added to it; if a known question's weights differ, the
+        payload is not from this version and is compiled without touching
+        the cache.
+        """
+        compiled = self.get(version)
+        known = compiled.correlations if compiled else {}
+        if any(question_id in known and known[question_id] != correlation
+               for question_id, correlation in correlations.items()):
+            return CompiledQuestionnaire(version, correlations)
+        if compiled is None or any(question_id not in compiled for question_id in correlations):
+            compiled = CompiledQuestionnaire(version, {**known, **correlations})
+            self.put(version, compiled)
+        return compiled
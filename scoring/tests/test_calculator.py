@@ -0,0 +1,14 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from django.test import SimpleTestCase
+from scoring import GIFT_ORDER, GiftCalculator
+
+
+class GiftCalculatorTests(SimpleTestCase):
+    def test_identifying_gifts_writes_nothing_to_stdout(self):
+        scores = dict(zip(GIFT_ORDER, (0.1, 0.3, 0.27, 0.05, 0.25, 0.03, 0.0)))
+        out = StringIO()
+        with redirect_stdout(out), self.assertLogs('scoring.calculator', 'DEBUG'):
+            gifts = GiftCalculator().identify_gifts(scores)
+        self.assertEqual(gifts, ('Service', ['Teaching', 'Giving']))
+        self.assertEqual(out.getvalue(), '')
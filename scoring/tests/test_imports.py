@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# Cumulative import time allowed for the scoring package; it takes a few
+# milliseconds, so this only trips on a heavy new dependency
+IMPORT_BUDGET_US = 50_000
+
+# Top-level packages the scoring package and service must not pull in
+FORBIDDEN = ('django', 'rest_framework', 'assessments', 'users', 'core', 'books', 'analytics', 'counselors')
+
+
+def fresh_import(module):
+    """Import `module` in a new interpreter without Django settings; returns -X importtime rows"""
+    env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    rows = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                rows[name.strip()] = int(cumulative)
+    return rows
+
+
+class ImportTests(SimpleTestCase):
+    def assert_no_django(self, rows):
+        self.assertEqual(sorted(name for name in rows if name.split('.')[0] in FORBIDDEN), [])
+
+    def test_scoring_imports_quickly_without_django(self):
+        rows = fresh_import('scoring')
+        self.assert_no_django(rows)
+        self.assertLess(rows['scoring'], IMPORT_BUDGET_US)
+
+    def test_scoring_service_imports_without_django(self):
+        self.assert_no_django(fresh_import('fastapi_app.main'))
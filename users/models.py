@@ -1,6 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
-from .ministry_roles import MINISTRY_ROLE_MAPPINGS
+from scoring.roles import MINISTRY_ROLE_MAPPINGS
 
 class UserManager(BaseUserManager):
     def create_user(self, email, username, password=None, **extra_fields):
@@ -37,11 +37,16 @@ class User(AbstractUser):
     
     def get_gift_progress(self):
         """Get user's gift development progress over time"""
-        return self.giftprofile_set.order_by('timestamp').values(
-            'timestamp', 
-            'primary_gift',
-            'scores'
-        )
+        return [
+            {
+                'timestamp': profile.timestamp,
+                'primary_gift': profile.primary_gift,
+                'scores': profile.scores
+            }
+            for profile in self.giftprofile_set.order_by('timestamp').only(
+                'timestamp', 'primary_gift', 'score_vector'
+            )
+        ]
     
     def get_accessible_books(self):
         """Get books accessible to user based on their primary gift"""